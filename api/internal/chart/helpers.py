@@ -1,17 +1,29 @@
+import hashlib
+import json
+import logging
 from datetime import datetime
+from decimal import Decimal
 
 from cerberus import Validator
 from dateutil import parser
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import connection
 from django.db.models import Case, F, FloatField, Value, When
 from django.db.models.fields.json import KeyTextTransform
 from django.db.models.functions import Cast, Trunc
 from django.utils import timezone
 from django.utils.functional import cached_property
+from redis.exceptions import RedisError
 from rest_framework.exceptions import ValidationError
 
 from codecov_auth.models import Owner
 from core.models import Commit, Repository
+from services.redis_configuration import get_redis_connection
+
+log = logging.getLogger(__name__)
+
+# how long a computed organization chart is served to subsequent requests
+CHART_CACHE_TTL = 600
 
 
 class ChartParamValidator(Validator):
@@ -137,6 +149,8 @@ class ChartQueryRunner:
     """
     Houses the SQL query that retrieves data for analytics chart, and
     the associated parameter validation + transformation required for it.
+    The query reads the daily commit totals rollup (`CommitTotalsDaily`)
+    rather than the commits themselves.
     """
 
     def __init__(self, user, request_params):
@@ -156,7 +170,7 @@ class ChartQueryRunner:
     def start_date(self):
         """
         Lower bound on the date-range of commit data returned by query.
-        Returns date of first commit made in any repo of 'repoids' is
+        Returns date of first commit made in any repo of 'repo_ids' is
         used if not set.
         """
         if "start_date" in self.request_params:
@@ -197,9 +211,9 @@ class ChartQueryRunner:
         return ""
 
     @cached_property
-    def repoids(self):
+    def repo_ids(self):
         """
-        Returns a string of repoids of the repositories being queried.
+        Returns the repoids of the repositories being queried.
         """
         organization = Owner.objects.get(
             service=self.request_params["service"],
@@ -215,43 +229,35 @@ class ChartQueryRunner:
         if self.request_params.get("repositories", []):
             repos = repos.filter(name__in=self.request_params.get("repositories", []))
 
-        if repos:
-            # Get repoids into a format easily plugged into raw SQL
-            return (
-                "("
-                + ",".join(map(str, list(repos.values_list("repoid", flat=True))))
-                + ")"
-            )
+        return list(repos.values_list("repoid", flat=True))
 
     @cached_property
     def first_complete_commit_date(self):
         """
-        Date of first commit made to any repo in 'self.repoids'. Used as initial
+        Date of first commit made to any repo in 'self.repo_ids'. Used as initial
         date for date_spine query.
         """
         with connection.cursor() as cursor:
+            # one index lookup into the daily rollup per repo
             cursor.execute(
-                f"""
-                WITH relevant_repo_branches AS (
-                    SELECT
-                        r.repoid,
-                        r.branch
-                    FROM repos r
-                    WHERE r.repoid IN {self.repoids}
-                )
-
-                SELECT
-                    DATE_TRUNC('{self.grouping_unit}', c.timestamp AT TIME ZONE 'UTC') as truncated_date
-                FROM commits c
-                INNER JOIN relevant_repo_branches r ON c.repoid = r.repoid AND c.branch = r.branch
-                WHERE c.state = 'complete'
-                ORDER BY c.timestamp ASC LIMIT 1;
                 """
+                SELECT
+                    DATE_TRUNC(%s, MIN(first_day.day)::timestamp) AS truncated_date
+                FROM repos r
+                CROSS JOIN LATERAL (
+                    SELECT d.day
+                    FROM commits_totals_daily d
+                    WHERE d.repoid = r.repoid AND d.branch = r.branch
+                    ORDER BY d.day ASC LIMIT 1
+                ) first_day
+                WHERE r.repoid = ANY(%s::integer[]);
+                """,
+                [self.grouping_unit, self.repo_ids],
             )
-            date = self._dictfetchall(cursor)
+            (date,) = cursor.fetchone()
 
         if date:
-            return datetime.date(date[0]["truncated_date"])
+            return datetime.date(date)
 
     def _validate_parameters(self):
         params_schema = {
@@ -283,126 +289,156 @@ class ChartQueryRunner:
         if not v.validate(self.request_params):
             raise ValidationError(v.errors)
 
+    @property
+    def cache_key(self):
+        """
+        Identifies the chart of the queried repositories over the requested
+        window.  The repo ids are part of it so that users who can see different
+        repositories of the organization don't share cached charts.
+        """
+        start_date = None
+        if "start_date" in self.request_params:
+            start_date = self.start_date
+        digest = hashlib.md5(
+            json.dumps(
+                [
+                    self.request_params["service"],
+                    self.request_params["owner_username"],
+                    sorted(self.repo_ids),
+                    self.grouping_unit,
+                    start_date,
+                    self.end_date,
+                    self.ordering,
+                ],
+                default=str,
+            ).encode()
+        ).hexdigest()
+        return f"organization_chart/{digest}"
+
     def run_query(self):
-        # Edge cases -- no repos or no commits
-        if not self.repoids:
+        """
+        Returns the chart datapoints, reusing the ones computed by a previous
+        request for the same chart if they're recent enough.
+        """
+        # Edge case -- no repos
+        if not self.repo_ids:
             return []
+
+        redis = get_redis_connection()
+        key = self.cache_key
+        try:
+            cached = redis.get(key)
+        except RedisError:
+            log.warning("Unable to read cached chart", exc_info=True)
+            cached = None
+        if cached is not None:
+            return self._load_results(cached)
+
+        results = self._run_query()
+        try:
+            redis.set(
+                key,
+                json.dumps(results, cls=DjangoJSONEncoder),
+                ex=CHART_CACHE_TTL,
+            )
+        except RedisError:
+            log.warning("Unable to cache chart", exc_info=True)
+        return results
+
+    @staticmethod
+    def _load_results(data):
+        # dates are cached as ISO 8601 strings and the aggregated totals as
+        # decimal strings
+        return [
+            {
+                column: (
+                    parser.isoparse(value)
+                    if column == "date"
+                    else None
+                    if value is None
+                    else Decimal(value)
+                )
+                for column, value in row.items()
+            }
+            for row in json.loads(data)
+        ]
+
+    def _run_query(self):
+        # Edge case -- no commits
         if not self.first_complete_commit_date:
             return []
 
         with connection.cursor() as cursor:
+            # For each date of the spine and each repo, the totals of the repo's latest
+            # complete commit made before the end of that date's period are looked up
+            # in the daily rollup, so periods without commits carry the previous totals.
             cursor.execute(
                 f"""
                 WITH date_series AS (
                     SELECT
                         t::date AS "date"
                     FROM generate_series(
-                        timestamp '{self.first_complete_commit_date}',
-                        timestamp '{self.end_date}',
-                        '{self.interval}'
+                        GREATEST(
+                            %(first_date)s::timestamp,
+                            DATE_TRUNC(%(grouping_unit)s, %(start_date)s::timestamp)
+                        ),
+                        %(end_date)s::timestamp,
+                        %(interval)s::interval
                     ) t
                 ), graph_repos AS (
                     SELECT
                         r.repoid,
-                        r.name,
                         r.branch
                     FROM
                         repos r
-                    WHERE r.repoid IN {self.repoids}
-                ), spine AS (
+                    WHERE r.repoid = ANY(%(repoids)s::integer[])
+                ), repo_totals AS (
                     SELECT
                         ds.date,
-                        r.repoid
+                        latest.hits,
+                        latest.misses,
+                        latest.partials,
+                        latest.lines
                     FROM date_series ds
                     CROSS JOIN graph_repos r
-                ), t_ranked_commits AS (
-                    SELECT
-                        ROW_NUMBER() OVER (
-                            PARTITION BY c.repoid, DATE_TRUNC('{self.grouping_unit}', c.timestamp)
-                            ORDER BY timestamp DESC NULLS LAST
-                        ) AS commit_rank,
-                        DATE_TRUNC('{self.grouping_unit}', c.timestamp) AS "truncated_date",
-                        c.timestamp AS commit_timestamp,
-                        c.totals,
-                        r.repoid
-                    FROM
-                        commits c
-                    INNER JOIN graph_repos r ON r.repoid = c.repoid
-                        AND r.branch = c.branch
-                        AND c.state = 'complete'
-                ), commits_spine AS (
-                    SELECT
-                        s.date AS spine_date,
-                        trc.truncated_date AS truncated_commit_date,
-                        trc.commit_timestamp,
-                        trc.totals AS totals,
-                        s.repoid
-                    FROM spine s
-                    LEFT JOIN t_ranked_commits trc ON trc.truncated_date = s.date
-                      AND trc.repoid = s.repoid
-                      AND trc.commit_rank = 1
-                ), grouped AS (
-                    SELECT
-                        spine_date,
-                        truncated_commit_date,
-                        totals,
-                        repoid,
-                        SUM(CASE
-                            WHEN totals IS NOT NULL THEN 1 END
-                        ) OVER (
-                            PARTITION BY repoid
-                            ORDER BY spine_date
-                        ) AS grp_commit
-                    FROM commits_spine
-                ), corrected AS (
-                    SELECT
-                        spine_date,
-                        FIRST_VALUE(totals) OVER (
-                            PARTITION BY repoid, grp_commit
-                            ORDER BY spine_date
-                        ) AS corrected_totals
-                    FROM
-                        grouped
-                ), parsed_totals AS (
-                    SELECT
-                        spine_date,
-                        (CASE
-                            WHEN corrected_totals IS NOT NULL then (corrected_totals->>'h')::numeric
-                            WHEN corrected_totals IS NULL then 0 END
-                        ) as hits,
-                        (CASE
-                            WHEN corrected_totals IS NOT NULL then (corrected_totals->>'m')::numeric
-                            WHEN corrected_totals IS NULL then 0 END
-                        ) as misses,
-                        (CASE
-                            WHEN corrected_totals IS NOT NULL then (corrected_totals->>'p')::numeric
-                            WHEN corrected_totals IS NULL then 0 END
-                        ) as partials,
-                        (CASE
-                            WHEN corrected_totals IS NOT NULL then (corrected_totals->>'n')::numeric
-                            WHEN corrected_totals IS NULL then 0 END
-                        ) as lines
-                    FROM
-                        corrected
-                ), summed_totals AS (
-                    SELECT
-                        spine_date::timestamp at time zone 'UTC' AS date,
-                        SUM(hits) AS total_hits,
-                        SUM(misses) AS total_misses,
-                        SUM(partials) AS total_partials,
-                        SUM(lines) AS total_lines,
-                        ROUND((SUM(hits) + SUM(partials)) / SUM(lines) * 100, 2) AS coverage
-                    FROM
-                        parsed_totals
-                    GROUP BY spine_date
-                    ORDER BY spine_date {self.ordering}
+                    LEFT JOIN LATERAL (
+                        SELECT
+                            d.hits,
+                            d.misses,
+                            d.partials,
+                            d.lines
+                        FROM commits_totals_daily d
+                        WHERE d.repoid = r.repoid
+                            AND d.branch = r.branch
+                            AND d.day < ds.date + %(interval)s::interval
+                            AND d.lines IS NOT NULL
+                        ORDER BY d.day DESC LIMIT 1
+                    ) latest ON true
                 )
 
                 SELECT
-                    *
-                FROM summed_totals
-                WHERE date >= DATE_TRUNC('{self.grouping_unit}', timestamp '{self.start_date}');
-                """
+                    date::timestamp at time zone 'UTC' AS date,
+                    SUM(COALESCE(hits, 0)) AS total_hits,
+                    SUM(COALESCE(misses, 0)) AS total_misses,
+                    SUM(COALESCE(partials, 0)) AS total_partials,
+                    SUM(COALESCE(lines, 0)) AS total_lines,
+                    ROUND(
+                        (SUM(COALESCE(hits, 0)) + SUM(COALESCE(partials, 0)))
+                        / NULLIF(SUM(COALESCE(lines, 0)), 0) * 100,
+                        2
+                    ) AS coverage
+                FROM repo_totals
+                GROUP BY date
+                ORDER BY date {self.ordering};
+                """,
+                {
+                    "first_date": self.first_complete_commit_date,
+                    "start_date": self.start_date,
+                    "end_date": self.end_date,
+                    "grouping_unit": self.grouping_unit,
+                    "interval": self.interval,
+                    "repoids": self.repo_ids,
+                },
             )
 
             return self._dictfetchall(cursor)
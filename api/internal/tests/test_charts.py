@@ -1,3 +1,4 @@
+import json
 from datetime import date, datetime, time, timedelta
 from decimal import Decimal
 from math import isclose
@@ -11,6 +12,7 @@ from django.test import TestCase, override_settings
 from django.utils import timezone
 from factory.faker import faker
 from pytz import UTC
+from redis.exceptions import ConnectionError as RedisConnectionError
 from rest_framework.exceptions import ValidationError
 from rest_framework.reverse import reverse
 
@@ -673,6 +675,126 @@ class TestChartQueryRunnerQuery(TestCase):
             ).run_query()
 
 
+class TestChartQueryRunnerRollup(TestCase):
+    """
+    Tests for the ChartQueryRunner reading the daily commit totals rollup
+    and caching its results.
+    """
+
+    @pytest.fixture(autouse=True)
+    def inject_mock_redis(self, mock_redis):
+        self.redis = mock_redis
+
+    def setUp(self):
+        self.org = OwnerFactory()
+        self.repo1 = RepositoryFactory(author=self.org, active=True)
+        self.repo2 = RepositoryFactory(author=self.org, active=True)
+        self.user = OwnerFactory(permission=[self.repo1.repoid, self.repo2.repoid])
+        G(
+            model=Commit,
+            repository=self.repo1,
+            totals={"h": 80, "n": 100, "p": 0, "m": 20},
+            branch=self.repo1.branch,
+            state="complete",
+            timestamp=datetime(2022, 1, 3, 12, 0, 0),
+        )
+        G(
+            model=Commit,
+            repository=self.repo2,
+            totals={"h": 10, "n": 20, "p": 0, "m": 10},
+            branch=self.repo2.branch,
+            state="complete",
+            timestamp=datetime(2022, 1, 12, 12, 0, 0),
+        )
+        self.request_params = {
+            "owner_username": self.org.username,
+            "service": self.org.service,
+            "end_date": "2022-01-20",
+            "grouping_unit": "week",
+        }
+
+    def test_query_carries_totals_over_periods_without_commits(self):
+        results = ChartQueryRunner(
+            user=self.user, request_params=self.request_params
+        ).run_query()
+
+        assert [
+            (
+                result["date"],
+                result["total_hits"],
+                result["total_misses"],
+                result["total_lines"],
+                result["coverage"],
+            )
+            for result in results
+        ] == [
+            (datetime(2022, 1, 3, tzinfo=UTC), 80, 20, 100, Decimal("80.00")),
+            (datetime(2022, 1, 10, tzinfo=UTC), 90, 30, 120, Decimal("75.00")),
+            (datetime(2022, 1, 17, tzinfo=UTC), 90, 30, 120, Decimal("75.00")),
+        ]
+
+    def test_query_starts_at_start_date(self):
+        results = ChartQueryRunner(
+            user=self.user,
+            request_params={**self.request_params, "start_date": "2022-01-11"},
+        ).run_query()
+
+        assert [result["date"] for result in results] == [
+            datetime(2022, 1, 10, tzinfo=UTC),
+            datetime(2022, 1, 17, tzinfo=UTC),
+        ]
+        assert results[0]["total_hits"] == 90
+
+    def test_query_results_are_cached(self):
+        query_runner = ChartQueryRunner(
+            user=self.user, request_params=self.request_params
+        )
+        results = query_runner.run_query()
+        cached = json.loads(self.redis.get(query_runner.cache_key))
+        assert cached[0]["date"] == "2022-01-03T00:00:00Z"
+        assert cached[0]["coverage"] == "80.00"
+
+        # only the owner and its repositories are looked up
+        with self.assertNumQueries(2):
+            assert (
+                ChartQueryRunner(
+                    user=self.user, request_params=self.request_params
+                ).run_query()
+                == results
+            )
+
+        with self.subTest("not shared with other windows or repositories"):
+            assert (
+                ChartQueryRunner(
+                    user=self.user,
+                    request_params={**self.request_params, "grouping_unit": "month"},
+                ).cache_key
+                != ChartQueryRunner(
+                    user=self.user, request_params=self.request_params
+                ).cache_key
+            )
+            assert (
+                ChartQueryRunner(
+                    user=self.user,
+                    request_params={
+                        **self.request_params,
+                        "repositories": [self.repo1.name],
+                    },
+                ).cache_key
+                != ChartQueryRunner(
+                    user=self.user, request_params=self.request_params
+                ).cache_key
+            )
+
+    def test_query_when_redis_unavailable(self):
+        with patch.object(self.redis, "get", side_effect=RedisConnectionError()):
+            results = ChartQueryRunner(
+                user=self.user, request_params=self.request_params
+            ).run_query()
+
+        assert len(results) == 3
+
+
 class TestChartQueryRunnerHelperMethods(TestCase):
     """
     Tests for the non-querying-parts of the ChartQueryRunner, such
@@ -683,7 +805,7 @@ class TestChartQueryRunnerHelperMethods(TestCase):
         self.org = OwnerFactory()
         self.user = OwnerFactory()
 
-    def test_repoids(self):
+    def test_repo_ids(self):
         repo1, repo2 = (
             RepositoryFactory(author=self.org, active=True),
             RepositoryFactory(author=self.org, active=True),
@@ -700,7 +822,7 @@ class TestChartQueryRunnerHelperMethods(TestCase):
         )
 
         with self.subTest("returns repoids"):
-            assert qr.repoids == f"({repo2.repoid},{repo1.repoid})"
+            assert sorted(qr.repo_ids) == sorted([repo1.repoid, repo2.repoid])
 
         with self.subTest("filters by supplied repo names"):
             qr = ChartQueryRunner(
@@ -712,7 +834,7 @@ class TestChartQueryRunnerHelperMethods(TestCase):
                     "repositories": [repo1.name],
                 },
             )
-            assert qr.repoids == f"({repo1.repoid})"
+            assert qr.repo_ids == [repo1.repoid]
 
     def test_interval(self):
         with self.subTest("translates quarter into 3 months"):
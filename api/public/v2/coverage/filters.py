@@ -1,4 +1,5 @@
 import django_filters
+from django import forms
 
 INTERVAL_CHOICES = (
     ("1d", "1 day"),
@@ -7,6 +8,10 @@ INTERVAL_CHOICES = (
 )
 
 
+class IntegerFilter(django_filters.NumberFilter):
+    field_class = forms.IntegerField
+
+
 class MeasurementFilters(django_filters.FilterSet):
     interval = django_filters.ChoiceFilter(
         choices=INTERVAL_CHOICES, method="filter_interval", required=True
@@ -18,6 +23,11 @@ class MeasurementFilters(django_filters.FilterSet):
         label="end datetime (inclusive)", method="filter_end_date"
     )
     branch = django_filters.CharFilter(label="branch name", method="filter_branch")
+    max_points = IntegerFilter(
+        label="maximum number of measurements (the series is downsampled)",
+        method="filter_max_points",
+        min_value=2,
+    )
 
     # the filtering for these methods happens in the view since they
     # all need to be passed in to some of the timeseries helper functions
@@ -33,3 +43,6 @@ class MeasurementFilters(django_filters.FilterSet):
 
     def filter_branch(self, queryset, name, value):
         return queryset
+
+    def filter_max_points(self, queryset, name, value):
+        return queryset
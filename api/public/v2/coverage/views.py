@@ -10,6 +10,7 @@ from api.shared.permissions import RepositoryArtifactPermissions
 from reports.models import RepositoryFlag
 from timeseries.helpers import (
     aggregate_measurements,
+    downsample_measurements,
     repository_coverage_measurements_with_fallback,
 )
 from timeseries.models import (
@@ -67,6 +68,14 @@ class CoverageViewSet(
 
         return intervals[interval_name]
 
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        # validated by the filterset above
+        max_points = self.request.query_params.get("max_points")
+        if max_points:
+            return downsample_measurements(queryset, int(max_points))
+        return queryset
+
     @extend_schema(summary="Coverage trend")
     def list(self, request, *args, **kwargs):
         """
@@ -79,6 +88,9 @@ class CoverageViewSet(
         * `branch`
         * `start_date`
         * `end_date`
+
+        Long series can be reduced to at most `max_points` measurements, keeping
+        the ones that best preserve the shape of the series.
         """
         return super().list(request, *args, **kwargs)
 
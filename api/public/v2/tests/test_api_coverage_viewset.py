@@ -176,6 +176,45 @@ class CoverageViewSetTestCase(TestCase):
             "total_pages": 1,
         }
 
+    @patch("timeseries.models.Dataset.is_backfilled")
+    def test_repo_coverage_max_points(self, get_repo_permissions, is_backfilled):
+        get_repo_permissions.return_value = (True, True)
+        is_backfilled.return_value = True
+
+        DatasetFactory(
+            repository_id=self.repo.pk,
+            name=MeasurementName.COVERAGE.value,
+        )
+        for day, value in [(15, 80.0), (16, 81.0), (17, 95.0), (18, 82.0), (19, 83.0)]:
+            MeasurementFactory(
+                name=MeasurementName.COVERAGE.value,
+                timestamp=f"2022-08-{day}T00:12:00",
+                owner_id=self.org.pk,
+                repo_id=self.repo.pk,
+                measurable_id=str(self.repo.pk),
+                branch="master",
+                value=value,
+            )
+
+        response = self.client.get(
+            f"/api/v2/github/codecov/repos/{self.repo.name}/coverage?interval=1d&start_date=2022-08-15&end_date=2022-08-19&max_points=3"
+        )
+        assert response.status_code == 200
+        # the spike is kept along with the first and last measurements
+        assert [
+            (measurement["timestamp"], measurement["avg"])
+            for measurement in response.json()["results"]
+        ] == [
+            ("2022-08-15T00:00:00Z", 80.0),
+            ("2022-08-17T00:00:00Z", 95.0),
+            ("2022-08-19T00:00:00Z", 83.0),
+        ]
+
+        response = self.client.get(
+            f"/api/v2/github/codecov/repos/{self.repo.name}/coverage?interval=1d&max_points=1"
+        )
+        assert response.status_code == 400
+
     def test_repo_coverage_no_interval(self, get_repo_permissions):
         get_repo_permissions.return_value = (True, True)
 
@@ -1,6 +1,5 @@
 from django.conf import settings
 from django.http import Http404
-from django.shortcuts import get_object_or_404
 from django.utils.functional import cached_property
 from rest_framework.exceptions import NotFound
 
@@ -14,8 +13,9 @@ from codecov_auth.authentication import (
     SuperToken,
     SuperUser,
 )
-from codecov_auth.models import Owner, Service
+from codecov_auth.models import Service
 from core.models import Commit, Repository
+from services.lookup_cache import owner_cache, repository_cache
 from utils.services import get_long_service_name
 
 
@@ -26,17 +26,23 @@ class OwnerPropertyMixin:
         if service not in Service:
             raise Http404("Invalid service for Owner.")
 
-        return get_object_or_404(
-            Owner, username=self.kwargs.get("owner_username"), service=service
+        owner = owner_cache.get(
+            service=service, username=self.kwargs.get("owner_username")
         )
+        if owner is None:
+            raise Http404("No Owner matches the given query.")
+        return owner
 
 
 class RepoPropertyMixin(OwnerPropertyMixin):
     @cached_property
     def repo(self):
-        return get_object_or_404(
-            Repository, name=self.kwargs.get("repo_name"), author=self.owner
+        repo = repository_cache.get(
+            author_id=self.owner.pk, name=self.kwargs.get("repo_name")
         )
+        if repo is None:
+            raise Http404("No Repository matches the given query.")
+        return repo
 
     def get_commit(self) -> Commit:
         commit_sha = self.request.query_params.get("sha")
@@ -1,10 +1,16 @@
+import asyncio
+import contextvars
 import logging
+from contextlib import contextmanager
+from typing import Callable, List, Optional, Tuple
 
 from asgiref.sync import SyncToAsync
 from django.conf import settings
 from django.db import close_old_connections
 from django.db.models import Field, Lookup
 
+from utils import counters
+
 log = logging.getLogger(__name__)
 
 
@@ -71,11 +77,95 @@ class IsNot(Lookup):
         return "%s is not %s" % (lhs, rhs), params
 
 
+class ThreadHopBatch:
+    """
+    Runs the sync functions called with `sync_to_async` during the same
+    iteration of the event loop (e.g. the resolvers of sibling GraphQL fields,
+    which are awaited together) with a single hop to the thread they run in,
+    one after the other, instead of hopping back and forth for each of them.
+    Each function still runs in the context it was called from.
+    """
+
+    def __init__(self):
+        self.pending: List[
+            Tuple[asyncio.Future, contextvars.Context, Callable, tuple, dict]
+        ] = []
+
+    def submit(self, func: Callable, args: tuple, kwargs: dict) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append((future, contextvars.copy_context(), func, args, kwargs))
+        if len(self.pending) == 1:
+            loop.call_soon(self._flush)
+        return future
+
+    def _flush(self):
+        pending, self.pending = self.pending, []
+        asyncio.ensure_future(self._run(pending))
+
+    async def _run(self, pending):
+        # runs in the context of the first call of the batch
+        _current_batch.set(None)
+        try:
+            results = await DatabaseSyncToAsync(_run_batch)(pending)
+        except BaseException as error:
+            results = [(False, error)] * len(pending)
+        for (future, *_), (succeeded, value) in zip(pending, results):
+            if future.cancelled():
+                continue
+            if succeeded:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+
+_current_batch: contextvars.ContextVar[
+    Optional[ThreadHopBatch]
+] = contextvars.ContextVar("thread_hop_batch", default=None)
+
+
+@contextmanager
+def batching_thread_hops():
+    """
+    Batches the `sync_to_async` calls made by the code run in this block and
+    the tasks it starts (see `ThreadHopBatch`).
+    """
+    token = _current_batch.set(ThreadHopBatch())
+    try:
+        yield
+    finally:
+        _current_batch.reset(token)
+
+
+def _call_unbatched(func, args, kwargs):
+    # the function may itself go back to the event loop with `async_to_sync`,
+    # whose `sync_to_async` calls must not wait for the current batch
+    _current_batch.set(None)
+    return func(*args, **kwargs)
+
+
+def _run_batch(pending):
+    results = []
+    for _, context, func, args, kwargs in pending:
+        try:
+            results.append((True, context.run(_call_unbatched, func, args, kwargs)))
+        except Exception as error:
+            results.append((False, error))
+    return results
+
+
 class DatabaseSyncToAsync(SyncToAsync):
     """
     SyncToAsync version that cleans up old database connections.
     """
 
+    async def __call__(self, *args, **kwargs):
+        batch = _current_batch.get()
+        if batch is not None and self._thread_sensitive:
+            return await batch.submit(self.func, args, kwargs)
+        counters.record("thread_hops")
+        return await super().__call__(*args, **kwargs)
+
     def thread_handler(self, loop, *args, **kwargs):
         close_old_connections()
         try:
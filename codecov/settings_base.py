@@ -448,8 +448,35 @@ CORS_ALLOWED_ORIGINS = []
 
 GRAPHQL_PLAYGROUND = False
 
+# see graphql_api/cost.py: queries whose estimated cost exceeds the budget of
+# their operation (or the maximum cost if it has none) are rejected
+GRAPHQL_MAX_QUERY_COST = get_config(
+    "setup", "graphql", "query_cost", "maximum", default=25000
+)
+GRAPHQL_OPERATION_COST_BUDGETS = get_config(
+    "setup", "graphql", "query_cost", "operation_budgets", default={}
+)
+GRAPHQL_QUERY_COST_WEIGHTS = get_config(
+    "setup", "graphql", "query_cost", "weights", default={}
+)
+
+# see graphql_api/profiler.py: share of the operations whose resolvers are profiled
+GRAPHQL_PROFILER_SAMPLE_RATE = get_config(
+    "setup", "graphql", "profiler", "sample_rate", default=0
+)
+
+# see codecov/db/__init__.py: runs the resolvers of the fields resolved together
+# with a single hop to the thread of the database
+GRAPHQL_BATCH_THREAD_HOPS = get_config(
+    "setup", "graphql", "batch_thread_hops", default=True
+)
+
 UPLOAD_THROTTLING_ENABLED = True
 
+# see services/lookup_cache.py: caches the owners and repositories looked up by
+# most requests
+LOOKUP_CACHE_ENABLED = get_config("setup", "lookup_cache", "enabled", default=True)
+
 CANNY_SSO_PRIVATE_TOKEN = get_config("canny", "sso_private_token", default="")
 
 SENTRY_JWT_SHARED_SECRET = get_config(
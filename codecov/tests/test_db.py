@@ -0,0 +1,63 @@
+import asyncio
+from contextvars import ContextVar
+
+import pytest
+from django.test import TestCase
+
+from codecov.db import batching_thread_hops, sync_to_async
+from core.models import Repository
+from core.tests.factories import RepositoryFactory
+from utils.counters import Counters, counting
+
+current_value: ContextVar[int] = ContextVar("current_value", default=0)
+
+
+@sync_to_async
+def count_repositories(value):
+    if value < 0:
+        raise ValueError(value)
+    return value, current_value.get(), Repository.objects.count()
+
+
+async def call_in_context(value):
+    current_value.set(value)
+    return await count_repositories(value)
+
+
+class ThreadHopBatchTests(TestCase):
+    def setUp(self):
+        RepositoryFactory()
+
+    async def test_unbatched(self):
+        counters = Counters()
+        with counting(counters):
+            results = await asyncio.gather(*(call_in_context(i) for i in range(5)))
+        assert results == [(i, i, 1) for i in range(5)]
+        assert counters.thread_hops == 5
+
+    async def test_batched(self):
+        counters = Counters()
+        with counting(counters), batching_thread_hops():
+            results = await asyncio.gather(*(call_in_context(i) for i in range(5)))
+            # called after the batch was run
+            assert await count_repositories(5) == (5, 0, 1)
+        # the functions run in the context they're called from
+        assert results == [(i, i, 1) for i in range(5)]
+        assert counters.thread_hops == 2
+        assert counters.db_queries == 6
+
+    async def test_batched_errors(self):
+        with batching_thread_hops():
+            results = await asyncio.gather(
+                call_in_context(1),
+                call_in_context(-1),
+                call_in_context(2),
+                return_exceptions=True,
+            )
+        assert results[0] == (1, 1, 1)
+        assert isinstance(results[1], ValueError)
+        assert results[2] == (2, 2, 1)
+
+        with batching_thread_hops():
+            with pytest.raises(ValueError):
+                await call_in_context(-1)
@@ -6,3 +6,4 @@ class CodecovAuthConfig(AppConfig):
 
     def ready(self):
         import codecov_auth.signals
+        import services.lookup_cache  # connects its invalidation signals
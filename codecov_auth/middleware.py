@@ -7,6 +7,7 @@ from django.utils.deprecation import MiddlewareMixin
 from rest_framework import exceptions
 
 from codecov_auth.models import Owner, Service
+from services.lookup_cache import owner_cache
 from utils.services import get_long_service_name
 
 log = logging.getLogger(__name__)
@@ -49,7 +50,9 @@ class CurrentOwnerMiddleware(MiddlewareMixin):
 
         current_owner_id = request.session.get("current_owner_id")
         if current_owner_id is not None:
-            current_owner = current_user.owners.filter(pk=current_owner_id).first()
+            current_owner = owner_cache.get(pk=current_owner_id)
+            if current_owner is not None and current_owner.user_id != current_user.pk:
+                current_owner = None
 
         service = get_service(request)
         if service and (current_owner is None or service != current_owner.service):
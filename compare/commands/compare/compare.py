@@ -6,3 +6,8 @@ from .interactors.fetch_impacted_files import FetchImpactedFiles
 class CompareCommands(BaseCommand):
     def fetch_impacted_files(self, comparsion, filters):
         return self.get_interactor(FetchImpactedFiles).execute(comparsion, filters)
+
+    def fetch_impacted_file_summaries(self, comparison, filters):
+        return self.get_interactor(FetchImpactedFiles).filter_summaries(
+            comparison, filters
+        )
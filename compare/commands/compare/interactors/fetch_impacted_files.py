@@ -1,7 +1,8 @@
 import enum
+from typing import List
 
 from codecov.commands.base import BaseInteractor
-from services.comparison import ImpactedFile
+from services.comparison import ComparisonReport, ImpactedFile, ImpactedFileSummary
 
 
 class ImpactedFileParameter(enum.Enum):
@@ -23,21 +24,18 @@ class FetchImpactedFiles(BaseInteractor):
         return impacted_files
 
     def get_attribute(
-        self, impacted_file: ImpactedFile, parameter: ImpactedFileParameter
+        self, impacted_file: ImpactedFileSummary, parameter: ImpactedFileParameter
     ):
         if parameter == ImpactedFileParameter.FILE_NAME:
             return impacted_file.file_name
         elif parameter == ImpactedFileParameter.CHANGE_COVERAGE:
             return impacted_file.change_coverage
         elif parameter == ImpactedFileParameter.HEAD_COVERAGE:
-            if impacted_file.head_coverage is not None:
-                return impacted_file.head_coverage.coverage
+            return impacted_file.head_coverage
         elif parameter == ImpactedFileParameter.MISSES_COUNT:
-            if impacted_file.misses_count is not None:
-                return impacted_file.misses_count
+            return impacted_file.misses_count
         elif parameter == ImpactedFileParameter.PATCH_COVERAGE:
-            if impacted_file.patch_coverage is not None:
-                return impacted_file.patch_coverage.coverage
+            return impacted_file.patch_coverage
         else:
             raise ValueError(f"invalid impacted file parameter: {parameter}")
 
@@ -65,18 +63,33 @@ class FetchImpactedFiles(BaseInteractor):
         # Merge both lists together
         return files_with_coverage + files_without_coverage
 
-    def execute(self, comparison_report, filters):
+    def filter_summaries(
+        self, comparison_report: ComparisonReport, filters
+    ) -> List[ImpactedFileSummary]:
+        """
+        Filters and sorts the summaries of the impacted files, which are much
+        cheaper to build than the impacted files themselves (see
+        `ComparisonReport.impacted_file_at`).
+        """
+        impacted_files = comparison_report.file_summaries
         if filters is None:
-            return comparison_report.impacted_files
+            return impacted_files
 
         has_unintended_changes = filters.get("has_unintended_changes")
         if has_unintended_changes is not None:
-            impacted_files = (
-                comparison_report.impacted_files_with_unintended_changes
-                if has_unintended_changes
-                else comparison_report.impacted_files_with_direct_changes
-            )
-        else:
-            impacted_files = comparison_report.impacted_files
+            impacted_files = [
+                file
+                for file in impacted_files
+                if (file.has_changes if has_unintended_changes else file.has_diff)
+            ]
 
         return self._apply_filters(impacted_files, filters)
+
+    def execute(self, comparison_report, filters) -> List[ImpactedFile]:
+        if filters is None:
+            return comparison_report.impacted_files
+
+        return [
+            comparison_report.impacted_file_at(file.position)
+            for file in self.filter_summaries(comparison_report, filters)
+        ]
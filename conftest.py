@@ -12,6 +12,10 @@ from django.conf import settings
 # either since it cannot be called in a transaction.
 settings.TIMESERIES_REAL_TIME_AGGREGATES = True
 
+# owners and repositories are modified in place by many tests, which would then
+# read stale instances from the lookup cache (see services/lookup_cache.py)
+settings.LOOKUP_CACHE_ENABLED = False
+
 
 def pytest_configure(config):
     """
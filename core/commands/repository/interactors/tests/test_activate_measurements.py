@@ -45,8 +45,8 @@ class ActivateMeasurementsInteractorTest(TransactionTestCase):
         with pytest.raises(ValidationError):
             self.execute(owner=self.user)
 
-    @patch("services.task.TaskService.backfill_dataset")
-    def test_creates_flag_dataset(self, backfill_dataset):
+    @patch("services.task.TaskService.backfill_dataset_chunks")
+    def test_creates_flag_dataset(self, backfill_dataset_chunks):
         assert not Dataset.objects.filter(
             name=MeasurementName.FLAG_COVERAGE.value,
             repository_id=self.repo.pk,
@@ -59,8 +59,8 @@ class ActivateMeasurementsInteractorTest(TransactionTestCase):
             repository_id=self.repo.pk,
         ).exists()
 
-    @patch("services.task.TaskService.backfill_dataset")
-    def test_creates_component_dataset(self, backfill_dataset):
+    @patch("services.task.TaskService.backfill_dataset_chunks")
+    def test_creates_component_dataset(self, backfill_dataset_chunks):
         assert not Dataset.objects.filter(
             name=MeasurementName.COMPONENT_COVERAGE.value,
             repository_id=self.repo.pk,
@@ -77,8 +77,8 @@ class ActivateMeasurementsInteractorTest(TransactionTestCase):
             repository_id=self.repo.pk,
         ).exists()
 
-    @patch("services.task.TaskService.backfill_dataset")
-    def test_creates_coverage_dataset(self, backfill_dataset):
+    @patch("services.task.TaskService.backfill_dataset_chunks")
+    def test_creates_coverage_dataset(self, backfill_dataset_chunks):
         assert not Dataset.objects.filter(
             name=MeasurementName.COVERAGE.value,
             repository_id=self.repo.pk,
@@ -95,9 +95,9 @@ class ActivateMeasurementsInteractorTest(TransactionTestCase):
             repository_id=self.repo.pk,
         ).exists()
 
-    @patch("services.task.TaskService.backfill_dataset")
+    @patch("services.task.TaskService.backfill_dataset_chunks")
     @freeze_time("2022-01-01T00:00:00")
-    def test_triggers_task(self, backfill_dataset):
+    def test_triggers_task(self, backfill_dataset_chunks):
         CommitFactory(repository=self.repo, timestamp=datetime(2000, 1, 1, 1, 1, 1))
         CommitFactory(repository=self.repo, timestamp=datetime(2021, 12, 31, 1, 1, 1))
         self.execute(owner=self.user)
@@ -105,13 +105,19 @@ class ActivateMeasurementsInteractorTest(TransactionTestCase):
             name=MeasurementName.FLAG_COVERAGE.value,
             repository_id=self.repo.pk,
         ).first()
-        backfill_dataset.assert_called_once_with(
-            dataset,
-            start_date=timezone.datetime(2000, 1, 1),
-            end_date=timezone.datetime(2022, 1, 1),
+        backfill_dataset_chunks.assert_called_once()
+        args, kwargs = backfill_dataset_chunks.call_args
+        assert args[0] == dataset
+        chunks = args[1]
+        # most recent chunk first
+        assert chunks[0] == (
+            timezone.datetime(2021, 12, 2),
+            timezone.datetime(2022, 1, 1),
         )
+        assert chunks[-1][0] == timezone.datetime(2000, 1, 1)
+        assert all(newer[0] == older[1] for newer, older in zip(chunks, chunks[1:]))
 
-    @patch("services.task.TaskService.backfill_dataset")
-    def test_no_commits(self, backfill_dataset):
+    @patch("services.task.TaskService.backfill_dataset_chunks")
+    def test_no_commits(self, backfill_dataset_chunks):
         self.execute(owner=self.user)
-        assert backfill_dataset.call_count == 0
+        assert backfill_dataset_chunks.call_count == 0
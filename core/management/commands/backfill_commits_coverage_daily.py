@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection, transaction
+
+from core.models import Repository
+
+# like the `commits_coverage_daily_refresh` trigger function
+BACKFILL_SQL = """
+insert into commits_coverage_daily
+    (repoid, branch, day, coverage_min, coverage_max, coverage_sum, commit_count)
+select repoid, branch, day, min(coverage), max(coverage), sum(coverage), count(*)
+from (
+    select repoid, branch, timestamp::date as day, (totals->>'c')::float as coverage
+    from commits
+    where repoid = any(%s::integer[])
+        and branch is not null
+) repo_commits
+where coverage is not null
+group by repoid, branch, day
+on conflict (repoid, branch, day) do nothing
+"""
+
+
+class Command(BaseCommand):
+    help = "Rolls up the coverage of the existing commits into commits_coverage_daily"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        # this can be used to retry if there's an error - restart the command
+        # from the last ID printed before failure
+        parser.add_argument("--starting-repoid", type=int)
+        parser.add_argument("--batch-size", type=int, default=100)
+
+    def handle(self, *args, **options):
+        repoids = Repository.objects.order_by("repoid").values_list("repoid", flat=True)
+        if options["starting_repoid"]:
+            repoids = repoids.filter(pk__gte=options["starting_repoid"])
+
+        batch_size = options["batch_size"]
+        last_repoid = None
+        while True:
+            batch = repoids
+            if last_repoid is not None:
+                batch = batch.filter(pk__gt=last_repoid)
+            batch = list(batch[:batch_size])
+            if not batch:
+                break
+
+            print("repoid:", batch[0])
+            # days maintained by the triggers in the meantime are kept
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(BACKFILL_SQL, [batch])
+            last_repoid = batch[-1]
@@ -0,0 +1,69 @@
+from datetime import date, datetime
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from core.models import CommitCoverageDaily
+from core.tests.factories import CommitFactory, RepositoryFactory
+
+
+class BackfillCommitsCoverageDailyTest(TestCase):
+    def setUp(self):
+        self.repo1 = RepositoryFactory()
+        self.repo2 = RepositoryFactory()
+        CommitFactory(
+            repository=self.repo1,
+            branch="main",
+            timestamp=datetime(2022, 1, 1, 1, 0, 0),
+            totals={"c": "80.00"},
+        )
+        CommitFactory(
+            repository=self.repo1,
+            branch="main",
+            timestamp=datetime(2022, 1, 1, 2, 0, 0),
+            totals={"c": "90.00"},
+        )
+        CommitFactory(
+            repository=self.repo1,
+            branch="main",
+            timestamp=datetime(2022, 1, 1, 3, 0, 0),
+            totals=None,
+        )
+        CommitFactory(
+            repository=self.repo2,
+            branch="main",
+            timestamp=datetime(2022, 1, 2, 1, 0, 0),
+            totals={"c": "50.00"},
+        )
+        # commits that existed before the triggers
+        CommitCoverageDaily.objects.all().delete()
+
+    def _days(self):
+        return list(
+            CommitCoverageDaily.objects.order_by("repository_id", "day").values_list(
+                "repository_id",
+                "branch",
+                "day",
+                "coverage_min",
+                "coverage_max",
+                "coverage_sum",
+                "commit_count",
+            )
+        )
+
+    def test_backfill(self):
+        call_command("backfill_commits_coverage_daily", batch_size=1)
+        assert self._days() == [
+            (self.repo1.pk, "main", date(2022, 1, 1), 80.0, 90.0, 170.0, 2),
+            (self.repo2.pk, "main", date(2022, 1, 2), 50.0, 50.0, 50.0, 1),
+        ]
+
+        # running it again keeps the existing days
+        call_command("backfill_commits_coverage_daily")
+        assert len(self._days()) == 2
+
+    def test_backfill_starting_repoid(self):
+        call_command("backfill_commits_coverage_daily", starting_repoid=self.repo2.pk)
+        assert self._days() == [
+            (self.repo2.pk, "main", date(2022, 1, 2), 50.0, 50.0, 50.0, 1)
+        ]
@@ -0,0 +1,52 @@
+from datetime import date, datetime
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from core.models import CommitTotalsDaily
+from core.tests.factories import CommitFactory, RepositoryFactory
+
+
+class BackfillCommitsTotalsDailyTest(TestCase):
+    def setUp(self):
+        self.repo1 = RepositoryFactory()
+        self.repo2 = RepositoryFactory()
+        CommitFactory(
+            repository=self.repo1,
+            timestamp=datetime(2022, 1, 1, 1, 0, 0),
+            totals={"h": 8, "m": 2, "p": 0, "n": 10},
+        )
+        CommitFactory(
+            repository=self.repo1,
+            timestamp=datetime(2022, 1, 1, 2, 0, 0),
+            totals=None,
+        )
+        CommitFactory(
+            repository=self.repo2,
+            timestamp=datetime(2022, 1, 2, 1, 0, 0),
+            totals={"h": 5, "m": 4, "p": 1, "n": 10},
+        )
+        # commits that existed before the triggers
+        CommitTotalsDaily.objects.all().delete()
+
+    def _days(self):
+        return list(
+            CommitTotalsDaily.objects.order_by("repository_id", "day").values_list(
+                "repository_id", "day", "hits", "misses", "partials", "lines"
+            )
+        )
+
+    def test_backfill(self):
+        call_command("backfill_commits_totals_daily", batch_size=1)
+        assert self._days() == [
+            (self.repo1.pk, date(2022, 1, 1), 8, 2, 0, 10),
+            (self.repo2.pk, date(2022, 1, 2), 5, 4, 1, 10),
+        ]
+
+        # running it again keeps the existing days
+        call_command("backfill_commits_totals_daily")
+        assert len(self._days()) == 2
+
+    def test_backfill_starting_repoid(self):
+        call_command("backfill_commits_totals_daily", starting_repoid=self.repo2.pk)
+        assert self._days() == [(self.repo2.pk, date(2022, 1, 2), 5, 4, 1, 10)]
@@ -0,0 +1,141 @@
+# Generated by Django 4.2.2 on 2023-08-21 10:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from utils.migrations import RiskyRunSQL
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0034_remove_repository_cache"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CommitCoverageDaily",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("branch", models.TextField()),
+                ("day", models.DateField()),
+                ("coverage_min", models.FloatField()),
+                ("coverage_max", models.FloatField()),
+                ("coverage_sum", models.FloatField()),
+                ("commit_count", models.IntegerField()),
+                (
+                    "repository",
+                    models.ForeignKey(
+                        db_column="repoid",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="core.repository",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "commits_coverage_daily",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="commitcoveragedaily",
+            constraint=models.UniqueConstraint(
+                fields=("repository", "branch", "day"),
+                name="commits_coverage_daily_repoid_branch_day",
+            ),
+        ),
+        RiskyRunSQL(
+            """
+            create or replace function commits_coverage_daily_refresh(_repoid int, _branch text, _day date) returns void as $$
+            begin
+                -- concurrent refreshes of the same day are serialized, otherwise one that
+                -- doesn't see the other's commit yet can overwrite its result
+                perform pg_advisory_xact_lock(hashtext(_repoid || '/' || _branch || '/' || _day));
+
+                -- recompute the whole day since min/max can't be updated incrementally
+                insert into commits_coverage_daily
+                    (repoid, branch, day, coverage_min, coverage_max, coverage_sum, commit_count)
+                select _repoid, _branch, _day, min(coverage), max(coverage), sum(coverage), count(*)
+                from (
+                    select (totals->>'c')::float as coverage
+                    from commits
+                    where repoid = _repoid
+                        and branch = _branch
+                        and timestamp >= _day
+                        and timestamp < _day + 1
+                ) day_commits
+                where coverage is not null
+                having count(*) > 0
+                on conflict (repoid, branch, day) do update
+                set coverage_min = excluded.coverage_min,
+                    coverage_max = excluded.coverage_max,
+                    coverage_sum = excluded.coverage_sum,
+                    commit_count = excluded.commit_count;
+
+                if not found then
+                -- no commit with coverage left on that day
+                delete from commits_coverage_daily
+                where repoid = _repoid
+                    and branch = _branch
+                    and day = _day;
+                end if;
+            end;
+            $$ language plpgsql;
+
+            create or replace function commits_update_coverage_daily() returns trigger as $$
+            begin
+                if tg_op = 'DELETE' then
+                    if old.branch is not null then
+                    perform commits_coverage_daily_refresh(old.repoid, old.branch, old.timestamp::date);
+                    end if;
+                    return null;
+                end if;
+
+                if tg_op = 'UPDATE' and old.branch is not null and (
+                    new.repoid is distinct from old.repoid
+                    or new.branch is distinct from old.branch
+                    or new.timestamp::date is distinct from old.timestamp::date
+                ) then
+                -- the commit moved out of its previous day
+                perform commits_coverage_daily_refresh(old.repoid, old.branch, old.timestamp::date);
+                end if;
+
+                if new.branch is not null then
+                perform commits_coverage_daily_refresh(new.repoid, new.branch, new.timestamp::date);
+                end if;
+
+                return null;
+            end;
+            $$ language plpgsql;
+
+            create trigger commits_insert_coverage_daily after insert on commits
+            for each row
+            when (new.totals is not null)
+            execute procedure commits_update_coverage_daily();
+
+            create trigger commits_update_coverage_daily after update on commits
+            for each row
+            when (
+                new.totals is distinct from old.totals
+                or new.branch is distinct from old.branch
+                or new.timestamp is distinct from old.timestamp
+                or new.repoid is distinct from old.repoid
+            )
+            execute procedure commits_update_coverage_daily();
+
+            create trigger commits_delete_coverage_daily after delete on commits
+            for each row
+            when (old.totals is not null)
+            execute procedure commits_update_coverage_daily();
+
+            -- the existing commits are rolled up by the
+            -- `backfill_commits_coverage_daily` management command
+            """,
+            reverse_sql="""
+            drop trigger if exists commits_insert_coverage_daily on commits;
+            drop trigger if exists commits_update_coverage_daily on commits;
+            drop trigger if exists commits_delete_coverage_daily on commits;
+            drop function if exists commits_update_coverage_daily();
+            drop function if exists commits_coverage_daily_refresh(int, text, date);
+            """,
+        ),
+    ]
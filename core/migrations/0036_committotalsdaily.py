@@ -0,0 +1,144 @@
+# Generated by Django 4.2.2 on 2023-08-28 09:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from utils.migrations import RiskyRunSQL
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0035_commitcoveragedaily"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CommitTotalsDaily",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("branch", models.TextField()),
+                ("day", models.DateField()),
+                ("hits", models.BigIntegerField(null=True)),
+                ("misses", models.BigIntegerField(null=True)),
+                ("partials", models.BigIntegerField(null=True)),
+                ("lines", models.BigIntegerField(null=True)),
+                (
+                    "repository",
+                    models.ForeignKey(
+                        db_column="repoid",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="core.repository",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "commits_totals_daily",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="committotalsdaily",
+            constraint=models.UniqueConstraint(
+                fields=("repository", "branch", "day"),
+                name="commits_totals_daily_repoid_branch_day",
+            ),
+        ),
+        RiskyRunSQL(
+            """
+            create or replace function commits_totals_daily_refresh(_repoid int, _branch text, _day date) returns void as $$
+            begin
+                -- concurrent refreshes of the same day are serialized, otherwise one that
+                -- doesn't see the other's commit yet can overwrite its result
+                perform pg_advisory_xact_lock(hashtext(_repoid || '/' || _branch || '/' || _day));
+
+                -- the latest complete commit of the day, preferring the ones with totals
+                insert into commits_totals_daily
+                    (repoid, branch, day, hits, misses, partials, lines)
+                select _repoid, _branch, _day,
+                    (totals->>'h')::numeric,
+                    (totals->>'m')::numeric,
+                    (totals->>'p')::numeric,
+                    (totals->>'n')::numeric
+                from commits
+                where repoid = _repoid
+                    and branch = _branch
+                    and state = 'complete'
+                    and timestamp >= _day
+                    and timestamp < _day + 1
+                order by totals is null, timestamp desc
+                limit 1
+                on conflict (repoid, branch, day) do update
+                set hits = excluded.hits,
+                    misses = excluded.misses,
+                    partials = excluded.partials,
+                    lines = excluded.lines;
+
+                if not found then
+                -- no complete commit left on that day
+                delete from commits_totals_daily
+                where repoid = _repoid
+                    and branch = _branch
+                    and day = _day;
+                end if;
+            end;
+            $$ language plpgsql;
+
+            create or replace function commits_update_totals_daily() returns trigger as $$
+            begin
+                if tg_op = 'DELETE' then
+                    if old.branch is not null then
+                    perform commits_totals_daily_refresh(old.repoid, old.branch, old.timestamp::date);
+                    end if;
+                    return null;
+                end if;
+
+                if tg_op = 'UPDATE' and old.branch is not null and (
+                    new.repoid is distinct from old.repoid
+                    or new.branch is distinct from old.branch
+                    or new.timestamp::date is distinct from old.timestamp::date
+                ) then
+                -- the commit moved out of its previous day
+                perform commits_totals_daily_refresh(old.repoid, old.branch, old.timestamp::date);
+                end if;
+
+                if new.branch is not null then
+                perform commits_totals_daily_refresh(new.repoid, new.branch, new.timestamp::date);
+                end if;
+
+                return null;
+            end;
+            $$ language plpgsql;
+
+            create trigger commits_insert_totals_daily after insert on commits
+            for each row
+            when (new.state = 'complete')
+            execute procedure commits_update_totals_daily();
+
+            create trigger commits_update_totals_daily after update on commits
+            for each row
+            when (
+                new.state is distinct from old.state
+                or new.totals is distinct from old.totals
+                or new.branch is distinct from old.branch
+                or new.timestamp is distinct from old.timestamp
+                or new.repoid is distinct from old.repoid
+            )
+            execute procedure commits_update_totals_daily();
+
+            create trigger commits_delete_totals_daily after delete on commits
+            for each row
+            when (old.state = 'complete')
+            execute procedure commits_update_totals_daily();
+
+            -- the existing commits are rolled up by the
+            -- `backfill_commits_totals_daily` management command
+            """,
+            reverse_sql="""
+            drop trigger if exists commits_insert_totals_daily on commits;
+            drop trigger if exists commits_update_totals_daily on commits;
+            drop trigger if exists commits_delete_totals_daily on commits;
+            drop function if exists commits_update_totals_daily();
+            drop function if exists commits_totals_daily_refresh(int, text, date);
+            """,
+        ),
+    ]
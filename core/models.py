@@ -316,6 +316,70 @@ class Commit(models.Model):
     )
 
 
+class CommitCoverageDaily(models.Model):
+    """
+    Coverage of the commits of a repo's branch rolled up by (UTC) day.
+    Maintained by triggers on the commits table so coverage charts can be
+    served without Timescale and without parsing the totals of every commit.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    repository = models.ForeignKey(
+        "core.Repository",
+        db_column="repoid",
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    branch = models.TextField()
+    day = models.DateField()
+    coverage_min = models.FloatField()
+    coverage_max = models.FloatField()
+    # the sum is kept rather than the average so that days can be combined
+    coverage_sum = models.FloatField()
+    commit_count = models.IntegerField()
+
+    class Meta:
+        db_table = "commits_coverage_daily"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["repository", "branch", "day"],
+                name="commits_coverage_daily_repoid_branch_day",
+            )
+        ]
+
+
+class CommitTotalsDaily(models.Model):
+    """
+    Totals of the latest complete commit of each (UTC) day of a repo's branch.
+    Maintained by triggers on the commits table so the organization coverage
+    chart can be built without scanning every commit of every repo.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    repository = models.ForeignKey(
+        "core.Repository",
+        db_column="repoid",
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    branch = models.TextField()
+    day = models.DateField()
+    # null if none of the day's complete commits has totals
+    hits = models.BigIntegerField(null=True)
+    misses = models.BigIntegerField(null=True)
+    partials = models.BigIntegerField(null=True)
+    lines = models.BigIntegerField(null=True)
+
+    class Meta:
+        db_table = "commits_totals_daily"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["repository", "branch", "day"],
+                name="commits_totals_daily_repoid_branch_day",
+            )
+        ]
+
+
 class PullStates(models.TextChoices):
     OPEN = "open"
     MERGED = "merged"
@@ -1,11 +1,12 @@
 import json
+from datetime import date, datetime
 from unittest.mock import MagicMock, patch
 
 from django.forms import ValidationError
 from django.test import TestCase
 from shared.storage.exceptions import FileNotInStorageError
 
-from core.models import Commit
+from core.models import Commit, CommitCoverageDaily, CommitTotalsDaily
 from reports.tests.factories import CommitReportFactory
 
 from .factories import CommitFactory, RepositoryFactory
@@ -118,3 +119,132 @@ class CommitTests(TestCase):
         assert fetched.report == {}
         mock_archive.assert_called()
         mock_read_file.assert_called_with(storage_path)
+
+
+class CommitCoverageDailyTests(TestCase):
+    def setUp(self):
+        self.repo = RepositoryFactory()
+
+    def _days(self):
+        return list(
+            CommitCoverageDaily.objects.filter(repository=self.repo)
+            .order_by("branch", "day")
+            .values_list(
+                "branch",
+                "day",
+                "coverage_min",
+                "coverage_max",
+                "coverage_sum",
+                "commit_count",
+            )
+        )
+
+    def test_maintained_with_commits(self):
+        commit1 = CommitFactory(
+            repository=self.repo,
+            timestamp=datetime(2022, 1, 1, 1, 0, 0),
+            totals={"c": "80.00"},
+        )
+        commit2 = CommitFactory(
+            repository=self.repo,
+            timestamp=datetime(2022, 1, 1, 2, 0, 0),
+            totals={"c": "90.00"},
+        )
+        CommitFactory(
+            repository=self.repo, timestamp=datetime(2022, 1, 1, 3, 0, 0), totals=None
+        )
+        CommitFactory(
+            repository=self.repo,
+            timestamp=datetime(2022, 1, 2, 1, 0, 0),
+            totals={"c": "70.00"},
+        )
+        assert self._days() == [
+            ("master", date(2022, 1, 1), 80.0, 90.0, 170.0, 2),
+            ("master", date(2022, 1, 2), 70.0, 70.0, 70.0, 1),
+        ]
+
+        commit2.totals = {"c": "60.00"}
+        commit2.save()
+        assert self._days() == [
+            ("master", date(2022, 1, 1), 60.0, 80.0, 140.0, 2),
+            ("master", date(2022, 1, 2), 70.0, 70.0, 70.0, 1),
+        ]
+
+        commit2.branch = "other"
+        commit2.save()
+        assert self._days() == [
+            ("master", date(2022, 1, 1), 80.0, 80.0, 80.0, 1),
+            ("master", date(2022, 1, 2), 70.0, 70.0, 70.0, 1),
+            ("other", date(2022, 1, 1), 60.0, 60.0, 60.0, 1),
+        ]
+
+        commit1.delete()
+        commit2.delete()
+        assert self._days() == [
+            ("master", date(2022, 1, 2), 70.0, 70.0, 70.0, 1),
+        ]
+
+
+class CommitTotalsDailyTests(TestCase):
+    def setUp(self):
+        self.repo = RepositoryFactory()
+
+    def _days(self):
+        return list(
+            CommitTotalsDaily.objects.filter(repository=self.repo)
+            .order_by("branch", "day")
+            .values_list("branch", "day", "hits", "misses", "partials", "lines")
+        )
+
+    def test_maintained_with_commits(self):
+        CommitFactory(
+            repository=self.repo,
+            timestamp=datetime(2022, 1, 1, 1, 0, 0),
+            totals={"h": 8, "m": 2, "p": 0, "n": 10},
+        )
+        commit2 = CommitFactory(
+            repository=self.repo,
+            timestamp=datetime(2022, 1, 1, 2, 0, 0),
+            totals={"h": 9, "m": 1, "p": 0, "n": 10},
+        )
+        # without totals, so the previous commit's are kept
+        CommitFactory(
+            repository=self.repo, timestamp=datetime(2022, 1, 1, 3, 0, 0), totals=None
+        )
+        # not complete
+        CommitFactory(
+            repository=self.repo,
+            timestamp=datetime(2022, 1, 1, 4, 0, 0),
+            totals={"h": 1, "m": 9, "p": 0, "n": 10},
+            state="pending",
+        )
+        commit5 = CommitFactory(
+            repository=self.repo,
+            timestamp=datetime(2022, 1, 2, 1, 0, 0),
+            totals=None,
+        )
+        assert self._days() == [
+            ("master", date(2022, 1, 1), 9, 1, 0, 10),
+            ("master", date(2022, 1, 2), None, None, None, None),
+        ]
+
+        commit5.totals = {"h": 5, "m": 4, "p": 1, "n": 10}
+        commit5.save()
+        commit2.state = "error"
+        commit2.save()
+        assert self._days() == [
+            ("master", date(2022, 1, 1), 8, 2, 0, 10),
+            ("master", date(2022, 1, 2), 5, 4, 1, 10),
+        ]
+
+        commit5.branch = "other"
+        commit5.save()
+        assert self._days() == [
+            ("master", date(2022, 1, 1), 8, 2, 0, 10),
+            ("other", date(2022, 1, 2), 5, 4, 1, 10),
+        ]
+
+        commit5.delete()
+        assert self._days() == [
+            ("master", date(2022, 1, 1), 8, 2, 0, 10),
+        ]
@@ -6,7 +6,11 @@ from django.db.models import Avg, Max, Min, QuerySet
 from compare.models import CommitComparison, FlagComparison
 from core.models import Repository
 from reports.models import RepositoryFlag
-from timeseries.helpers import aggregate_measurements, aligned_start_date
+from timeseries.helpers import (
+    aggregate_measurements,
+    aligned_start_date,
+    cached_measurements,
+)
 from timeseries.models import Interval, MeasurementName, MeasurementSummary
 
 
@@ -48,22 +52,37 @@ def flag_measurements(
     after: datetime,
     before: datetime,
 ) -> Mapping[int, Iterable[dict]]:
+    flag_ids = sorted(flag_ids)
+    start_date = aligned_start_date(interval, after)
     queryset = MeasurementSummary.agg_by(interval).filter(
         name=MeasurementName.FLAG_COVERAGE.value,
         owner_id=repository.author_id,
         repo_id=repository.pk,
         measurable_id__in=[str(flag_id) for flag_id in flag_ids],
-        timestamp_bin__gte=aligned_start_date(interval, after),
+        timestamp_bin__gte=start_date,
         timestamp_bin__lte=before,
     )
 
     queryset = aggregate_measurements(
         queryset, ["timestamp_bin", "owner_id", "repo_id", "measurable_id"]
     )
+    rows = cached_measurements(
+        [repository.pk],
+        dict(
+            name=MeasurementName.FLAG_COVERAGE.value,
+            interval=interval.value,
+            # only the bins selected by `before` matter for the result
+            bounds=(start_date, aligned_start_date(interval, before)),
+            owner_id=repository.author_id,
+            repo_id=repository.pk,
+            flag_ids=flag_ids,
+        ),
+        lambda: queryset,
+    )
 
     # group by flag_id
     measurements = {}
-    for measurement in queryset:
+    for measurement in rows:
         flag_id = int(measurement["measurable_id"])
         if flag_id not in measurements:
             measurements[flag_id] = []
@@ -1,5 +1,6 @@
 from codecov.db import sync_to_async
 from codecov_auth.models import Owner
+from services.lookup_cache import owner_cache
 from utils.services import get_long_service_name
 
 
@@ -15,7 +16,7 @@ def search_my_owners(current_user, filters):
 @sync_to_async
 def get_owner(service, username):
     long_service = get_long_service_name(service)
-    return Owner.objects.filter(username=username, service=long_service).first()
+    return owner_cache.get(service=long_service, username=username)
 
 
 def get_owner_login_sessions(current_user):
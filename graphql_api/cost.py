@@ -0,0 +1,254 @@
+import logging
+from typing import Dict, Optional, Set, Tuple, Type
+
+from ariadne.types import Extension
+from django.conf import settings
+from graphql import (
+    GraphQLError,
+    GraphQLField,
+    GraphQLInterfaceType,
+    GraphQLNamedType,
+    GraphQLObjectType,
+    GraphQLSchema,
+    get_named_type,
+    is_leaf_type,
+)
+from graphql.execution.values import get_argument_values
+from graphql.language import (
+    DocumentNode,
+    FieldNode,
+    FragmentSpreadNode,
+    InlineFragmentNode,
+    OperationDefinitionNode,
+    SelectionSetNode,
+)
+from graphql.validation import ValidationRule
+
+from codecov.commands.exceptions import BaseException
+from graphql_api.helpers.connection import DEFAULT_PAGE_SIZE
+
+log = logging.getLogger(__name__)
+
+# Weights of the fields that are more expensive to resolve than the default,
+# by type and field name.  A weight is either an int or a dict with a `weight`
+# and a `multiplier` (how many times the field's selections are expected to be
+# resolved, e.g. for a list).  Fields returning objects weigh 1 by default and
+# scalars 0.  Connection fields multiply the cost of their selections by their
+# `first`/`last` argument.  Extended by `settings.GRAPHQL_QUERY_COST_WEIGHTS`.
+DEFAULT_FIELD_WEIGHTS = {
+    "Commit": {
+        "compareWithParent": 10,
+        "coverageFile": 10,
+        "pathContents": {"weight": 10, "multiplier": 50},
+    },
+    "Pull": {"compareWithBase": 10},
+    "Comparison": {
+        "impactedFiles": {"weight": 1, "multiplier": 50},
+        "flagComparisons": {"weight": 1, "multiplier": 20},
+        "componentComparisons": {"weight": 1, "multiplier": 20},
+    },
+    "ImpactedFile": {"segments": 10},
+}
+
+
+class QueryCostExceeded(BaseException):
+    def __init__(self, operation_name: Optional[str], cost: int, budget: int):
+        self.operation_name = operation_name
+        self.cost = cost
+        self.budget = budget
+
+    @property
+    def message(self):
+        return f"Query is too expensive: its estimated cost is {self.cost} while at most {self.budget} is allowed"
+
+
+class FieldWeights:
+    """
+    Weights of the schema's fields, see `DEFAULT_FIELD_WEIGHTS`.
+    """
+
+    def __init__(self, overrides: Optional[Dict[str, Dict]] = None):
+        self.weights = {
+            type_name: dict(fields)
+            for type_name, fields in DEFAULT_FIELD_WEIGHTS.items()
+        }
+        for type_name, fields in (overrides or {}).items():
+            self.weights.setdefault(type_name, {}).update(fields)
+        self._cache: Dict[Tuple[str, str], Tuple[int, int]] = {}
+
+    def get(
+        self, type_name: str, field_name: str, field: GraphQLField
+    ) -> Tuple[int, int]:
+        """
+        Returns the (weight, multiplier) of a field.
+        """
+        key = (type_name, field_name)
+        if key not in self._cache:
+            weight = 0 if is_leaf_type(get_named_type(field.type)) else 1
+            multiplier = 1
+            config = self.weights.get(type_name, {}).get(field_name)
+            if isinstance(config, dict):
+                weight = config.get("weight", weight)
+                multiplier = config.get("multiplier", multiplier)
+            elif config is not None:
+                weight = config
+            self._cache[key] = (weight, multiplier)
+        return self._cache[key]
+
+
+def estimate_query_cost(
+    schema: GraphQLSchema,
+    document: DocumentNode,
+    operation: OperationDefinitionNode,
+    variables: Optional[dict] = None,
+    weights: Optional[FieldWeights] = None,
+) -> int:
+    """
+    Statically estimates the cost of executing the given operation: the sum of
+    the weights of the fields it selects, multiplied by the number of times
+    they're expected to be resolved.
+    """
+    weights = weights or FieldWeights()
+    fragments = {
+        definition.name.value: definition
+        for definition in document.definitions
+        if not isinstance(definition, OperationDefinitionNode)
+    }
+
+    def selections_cost(
+        parent_type: Optional[GraphQLNamedType],
+        selection_set: Optional[SelectionSetNode],
+        spread_fragments: Set[str],
+    ) -> int:
+        if selection_set is None:
+            return 0
+
+        cost = 0
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                if not isinstance(
+                    parent_type, (GraphQLObjectType, GraphQLInterfaceType)
+                ):
+                    continue
+                field = parent_type.fields.get(selection.name.value)
+                if field is None:
+                    # reported by the schema's validation rules
+                    continue
+
+                weight, multiplier = weights.get(
+                    parent_type.name, selection.name.value, field
+                )
+                if "first" in field.args or "last" in field.args:
+                    try:
+                        args = get_argument_values(field, selection, variables)
+                    except GraphQLError:
+                        args = {}
+                    multiplier = (
+                        args.get("first") or args.get("last") or DEFAULT_PAGE_SIZE
+                    )
+                    # a negative page size would lower the cost of the siblings
+                    multiplier = max(multiplier, 0)
+
+                cost += weight + multiplier * selections_cost(
+                    get_named_type(field.type),
+                    selection.selection_set,
+                    spread_fragments,
+                )
+            elif isinstance(selection, InlineFragmentNode):
+                fragment_type = parent_type
+                if selection.type_condition:
+                    fragment_type = schema.get_type(selection.type_condition.name.value)
+                cost += selections_cost(
+                    fragment_type, selection.selection_set, spread_fragments
+                )
+            elif isinstance(selection, FragmentSpreadNode):
+                name = selection.name.value
+                fragment = fragments.get(name)
+                # fragment cycles are reported by the schema's validation rules
+                if fragment is None or name in spread_fragments:
+                    continue
+                cost += selections_cost(
+                    schema.get_type(fragment.type_condition.name.value),
+                    fragment.selection_set,
+                    spread_fragments | {name},
+                )
+        return cost
+
+    return selections_cost(
+        schema.get_root_type(operation.operation), operation.selection_set, set()
+    )
+
+
+def query_cost_validator(context_value: dict, data: dict) -> Type[ValidationRule]:
+    """
+    Returns a validation rule estimating the cost of the operation being
+    executed, which is rejected if it exceeds the operation's budget.  The
+    estimate is stored in the context (`query_cost`) to be reported along with
+    the actual cost by the `QueryCostExtension`.
+    """
+    operation_name = data.get("operationName")
+    variables = data.get("variables")
+
+    class QueryCostValidator(ValidationRule):
+        def enter_operation_definition(self, node: OperationDefinitionNode, *_args):
+            name = node.name.value if node.name else None
+            if operation_name is not None and name != operation_name:
+                return
+
+            cost = estimate_query_cost(
+                self.context.schema,
+                self.context.document,
+                node,
+                variables=variables if isinstance(variables, dict) else None,
+                weights=FieldWeights(settings.GRAPHQL_QUERY_COST_WEIGHTS),
+            )
+            budget = settings.GRAPHQL_OPERATION_COST_BUDGETS.get(
+                name, settings.GRAPHQL_MAX_QUERY_COST
+            )
+            context_value["query_cost"] = {
+                "operation_name": name,
+                "estimated": cost,
+                "budget": budget,
+            }
+
+            if budget is not None and cost > budget:
+                error = QueryCostExceeded(name, cost, budget)
+                self.report_error(
+                    GraphQLError(error.message, node, original_error=error)
+                )
+
+    return QueryCostValidator
+
+
+class QueryCostExtension(Extension):
+    """
+    Measures the actual cost of executed queries (the weights of the fields
+    that were resolved) and logs it along with their estimated cost.
+    """
+
+    def __init__(self):
+        self.weights = FieldWeights(settings.GRAPHQL_QUERY_COST_WEIGHTS)
+        self.actual_cost = 0
+
+    def resolve(self, next_, obj, info, **kwargs):
+        field = info.parent_type.fields.get(info.field_name)
+        if field is not None:
+            weight, _ = self.weights.get(info.parent_type.name, info.field_name, field)
+            self.actual_cost += weight
+        return next_(obj, info, **kwargs)
+
+    def request_finished(self, context):
+        query_cost = context.get("query_cost") if isinstance(context, dict) else None
+        if query_cost is None:
+            # the query couldn't be parsed
+            return
+
+        log.info(
+            "GraphQL query cost",
+            extra=dict(
+                operation_name=query_cost["operation_name"],
+                estimated_cost=query_cost["estimated"],
+                actual_cost=self.actual_cost,
+                budget=query_cost["budget"],
+            ),
+        )
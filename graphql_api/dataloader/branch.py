@@ -0,0 +1,8 @@
+from core.models import Branch
+
+from .relation import RelationLoader
+
+
+class BranchLoader(RelationLoader):
+    model = Branch
+    key_fields = ("repository_id", "name")
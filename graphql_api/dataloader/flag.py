@@ -0,0 +1,28 @@
+from reports.models import RepositoryFlag
+from timeseries.models import Dataset, MeasurementName
+
+from .relation import RelationCountLoader, RelationLoader
+
+
+class FlagCountLoader(RelationCountLoader):
+    """
+    Loads the number of (non-deleted) flags of repositories (keyed by repository id)
+    """
+
+    model = RepositoryFlag
+    key_fields = ("repository_id",)
+
+    def get_queryset(self):
+        return RepositoryFlag.objects.filter(deleted__isnot=True)
+
+
+class FlagCoverageDatasetLoader(RelationLoader):
+    """
+    Loads the flag coverage datasets of repositories (keyed by repository id)
+    """
+
+    model = Dataset
+    key_fields = ("repository_id",)
+
+    def get_queryset(self):
+        return Dataset.objects.filter(name=MeasurementName.FLAG_COVERAGE.value)
@@ -0,0 +1,8 @@
+from core.models import Pull
+
+from .relation import RelationLoader
+
+
+class PullLoader(RelationLoader):
+    model = Pull
+    key_fields = ("repository_id", "pullid")
@@ -0,0 +1,109 @@
+from collections import defaultdict
+from typing import Tuple, Type
+
+from django.db.models import Count, Model, Q, QuerySet
+
+from codecov.db import sync_to_async
+
+from .loader import BaseLoader
+
+
+def _field_value(record, field: str):
+    for name in field.split("__"):
+        record = getattr(record, name)
+    return record
+
+
+class RelationLoader(BaseLoader):
+    """
+    Declarative loader of the `model` records related to parent objects.
+
+    Records are keyed by the values of their `key_fields`: a single value for a
+    foreign key (e.g. `repository_id`) or a tuple of values for a natural key
+    (e.g. `(repository_id, name)`), so that the records of different parents are
+    loaded with a single query.  Key fields can span relations (e.g.
+    `report__commit_id`), which should then be selected by `get_queryset`:
+
+        class BranchLoader(RelationLoader):
+            model = Branch
+            key_fields = ("repository_id", "name")
+
+        BranchLoader.loader(info).load((repository.pk, name))
+
+    When `many` is set a list of records is loaded for every key instead.
+    """
+
+    model: Type[Model]
+    key_fields: Tuple[str, ...] = ("id",)
+    many: bool = False
+
+    @classmethod
+    def key(cls, record):
+        values = tuple(_field_value(record, field) for field in cls.key_fields)
+        return values[0] if len(values) == 1 else values
+
+    @classmethod
+    def default(cls):
+        """
+        Return the value loaded for a key without any record
+        """
+        return [] if cls.many else None
+
+    def get_queryset(self) -> QuerySet:
+        """
+        Return the QuerySet the records are loaded from (override to filter,
+        select or prefetch related records)
+        """
+        return self.model.objects.all()
+
+    def batch_queryset(self, keys):
+        queryset = self.get_queryset()
+        if len(self.key_fields) == 1:
+            return queryset.filter(**{f"{self.key_fields[0]}__in": keys})
+
+        condition = Q()
+        for key in keys:
+            condition |= Q(**dict(zip(self.key_fields, key)))
+        return queryset.filter(condition)
+
+    @sync_to_async
+    def batch_load_fn(self, keys):
+        results = defaultdict(list) if self.many else {}
+        for record in self.batch_queryset(keys):
+            if self.many:
+                results[self.key(record)].append(record)
+            else:
+                results[self.key(record)] = record
+
+        # the returned list of records must be in the exact order of `keys`
+        return [results.get(key, self.default()) for key in keys]
+
+
+class RelationCountLoader(RelationLoader):
+    """
+    Loads the number of `model` records related to parent objects, keyed by the
+    values of their `key_fields` (see `RelationLoader`).
+    """
+
+    @classmethod
+    def key(cls, row):
+        values = tuple(row[field] for field in cls.key_fields)
+        return values[0] if len(values) == 1 else values
+
+    @classmethod
+    def default(cls):
+        return 0
+
+    def batch_queryset(self, keys):
+        return (
+            super()
+            .batch_queryset(keys)
+            .order_by()
+            .values(*self.key_fields)
+            .annotate(count=Count("pk"))
+        )
+
+    @sync_to_async
+    def batch_load_fn(self, keys):
+        results = {self.key(row): row["count"] for row in self.batch_queryset(keys)}
+        return [results.get(key, self.default()) for key in keys]
@@ -0,0 +1,101 @@
+import asyncio
+
+from django.test import TransactionTestCase
+
+from core.tests.factories import BranchFactory, PullFactory, RepositoryFactory
+from graphql_api.dataloader.branch import BranchLoader
+from graphql_api.dataloader.flag import FlagCountLoader
+from graphql_api.dataloader.pull import PullLoader
+from graphql_api.dataloader.upload import UploadCountLoader, UploadsLoader
+from reports.tests.factories import (
+    CommitReportFactory,
+    RepositoryFlagFactory,
+    UploadFactory,
+)
+
+
+class GraphQLResolveInfo:
+    def __init__(self):
+        self.context = {}
+
+
+class RelationLoaderTestCase(TransactionTestCase):
+    def setUp(self):
+        self.repositories = [RepositoryFactory(), RepositoryFactory()]
+        self.branches = [
+            BranchFactory(repository=repository, name=name)
+            for repository in self.repositories
+            for name in ("main", "feature")
+        ]
+        self.pulls = [
+            PullFactory(repository=repository, pullid=pullid)
+            for repository in self.repositories
+            for pullid in (1, 2)
+        ]
+        self.info = GraphQLResolveInfo()
+
+    async def test_load_by_natural_key(self):
+        loader = BranchLoader.loader(self.info)
+        branches = await asyncio.gather(
+            loader.load((self.repositories[1].pk, "main")),
+            loader.load((self.repositories[0].pk, "feature")),
+            loader.load((self.repositories[0].pk, "missing")),
+        )
+        assert [
+            (branch.repository_id, branch.name) if branch else None
+            for branch in branches
+        ] == [
+            (self.repositories[1].pk, "main"),
+            (self.repositories[0].pk, "feature"),
+            None,
+        ]
+
+    async def test_load_pulls(self):
+        loader = PullLoader.loader(self.info)
+        pulls = await asyncio.gather(
+            loader.load((self.repositories[0].pk, 2)),
+            loader.load((self.repositories[1].pk, 1)),
+        )
+        assert pulls == [self.pulls[1], self.pulls[2]]
+
+    async def test_load_many_across_relation(self):
+        reports = [CommitReportFactory(), CommitReportFactory(), CommitReportFactory()]
+        commit_ids = [report.commit_id for report in reports]
+        uploads = [
+            UploadFactory(report=reports[0]),
+            UploadFactory(report=reports[1]),
+            UploadFactory(report=reports[0]),
+        ]
+
+        loader = UploadsLoader.loader(self.info)
+        loaded = await asyncio.gather(
+            loader.load(commit_ids[0]),
+            loader.load(commit_ids[1]),
+            loader.load(commit_ids[2]),
+        )
+        assert sorted(loaded[0], key=lambda upload: upload.pk) == [
+            uploads[0],
+            uploads[2],
+        ]
+        assert loaded[1:] == [[uploads[1]], []]
+
+        loader = UploadCountLoader.loader(self.info)
+        counts = await asyncio.gather(
+            loader.load(commit_ids[0]),
+            loader.load(commit_ids[1]),
+            loader.load(commit_ids[2]),
+        )
+        assert counts == [2, 1, 0]
+
+    async def test_count(self):
+        RepositoryFlagFactory(repository=self.repositories[0])
+        RepositoryFlagFactory(repository=self.repositories[0], deleted=False)
+        RepositoryFlagFactory(repository=self.repositories[0], deleted=True)
+        repository = RepositoryFactory()
+
+        loader = FlagCountLoader.loader(self.info)
+        counts = await asyncio.gather(
+            loader.load(self.repositories[0].pk),
+            loader.load(repository.pk),
+        )
+        assert counts == [2, 0]
@@ -0,0 +1,32 @@
+from reports.models import ReportSession
+
+from .relation import RelationCountLoader, RelationLoader
+
+
+class UploadsLoader(RelationLoader):
+    """
+    Loads the uploads of commits (keyed by commit id)
+    """
+
+    model = ReportSession
+    key_fields = ("report__commit_id",)
+    many = True
+
+    def get_queryset(self):
+        return (
+            ReportSession.objects.filter(report__code=None)
+            .select_related("report")
+            .prefetch_related("flags")
+        )
+
+
+class UploadCountLoader(RelationCountLoader):
+    """
+    Loads the number of uploads of commits (keyed by commit id)
+    """
+
+    model = ReportSession
+    key_fields = ("report__commit_id",)
+
+    def get_queryset(self):
+        return ReportSession.objects.filter(report__code=None)
@@ -0,0 +1,76 @@
+import logging
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from ariadne.graphql import validate_query
+from graphql import DocumentNode, GraphQLError, GraphQLSchema, parse
+from redis.exceptions import RedisError
+
+from services.redis_configuration import get_redis_connection
+
+log = logging.getLogger(__name__)
+
+# number of documents (and persisted queries) kept in memory by each process,
+# comfortably more than the number of distinct operations sent by the frontend
+DOCUMENT_CACHE_SIZE = 512
+
+# how long a persisted query is kept after it was registered
+PERSISTED_QUERY_TTL = 60 * 60 * 24 * 7
+
+
+class PersistedQueryNotFound(Exception):
+    pass
+
+
+def _persisted_query_key(query_hash: str) -> str:
+    return f"graphql_persisted_query/{query_hash}"
+
+
+def persist_query(query_hash: str, query: str) -> None:
+    """
+    Registers a query so that subsequent requests can only send its hash
+    (see "automatic persisted queries").
+    """
+    try:
+        get_redis_connection().set(
+            _persisted_query_key(query_hash), query, ex=PERSISTED_QUERY_TTL
+        )
+    except RedisError:
+        log.warning("Unable to persist GraphQL query", exc_info=True)
+
+
+@lru_cache(maxsize=DOCUMENT_CACHE_SIZE)
+def get_persisted_query(query_hash: str) -> str:
+    """
+    Returns the query registered with the given hash.  Raises
+    `PersistedQueryNotFound` if there is none (the client then sends the whole
+    query along with its hash to register it).
+    """
+    try:
+        query = get_redis_connection().get(_persisted_query_key(query_hash))
+    except RedisError:
+        log.warning("Unable to read persisted GraphQL query", exc_info=True)
+        query = None
+    if query is None:
+        # not cached by `lru_cache`
+        raise PersistedQueryNotFound()
+    return query.decode()
+
+
+@lru_cache(maxsize=DOCUMENT_CACHE_SIZE)
+def parse_and_validate(
+    schema: GraphQLSchema, query: str, introspection: bool
+) -> Tuple[Optional[DocumentNode], List[GraphQLError]]:
+    """
+    Parses the query and validates it against the schema with the rules of
+    the GraphQL spec.  Returns the document along with the errors found, if any.
+    Since neither depends on the request, they're cached so the documents of
+    the operations that are frequently sent are only parsed and validated once.
+    """
+    try:
+        document = parse(query)
+    except GraphQLError as error:
+        return None, [error]
+    return document, validate_query(
+        schema, document, enable_introspection=introspection
+    )
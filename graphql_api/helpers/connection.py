@@ -1,12 +1,94 @@
+import base64
 import enum
-from dataclasses import dataclass
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
 from functools import cached_property
+from typing import Callable, Optional, Sequence
 
 from cursor_pagination import CursorPage, CursorPaginator
+from django.db import connections
 from django.db.models import QuerySet
+from redis.exceptions import RedisError
 
 from codecov.db import sync_to_async
 from graphql_api.types.enums import OrderingDirection
+from services.redis_configuration import get_redis_connection
+
+log = logging.getLogger(__name__)
+
+# number of nodes returned when neither `first` nor `last` is given
+DEFAULT_PAGE_SIZE = 25
+
+
+class ExactCount:
+    """
+    Strategy computing the `totalCount` of a connection: counts all the records
+    of the queryset.
+    """
+
+    def count(self, queryset: QuerySet) -> int:
+        return queryset.count()
+
+
+class EstimatedCount(ExactCount):
+    """
+    Counts the records of the queryset exactly when there are fewer than
+    `threshold` of them, otherwise returns the query planner's estimate (which
+    is much cheaper than counting the records of a large table).
+    """
+
+    def __init__(self, threshold: int = 1000):
+        self.threshold = threshold
+
+    def count(self, queryset: QuerySet) -> int:
+        # only counts up to `threshold` records
+        count = queryset.order_by()[: self.threshold].count()
+        if count < self.threshold:
+            return count
+        return max(self.estimate(queryset), self.threshold)
+
+    def estimate(self, queryset: QuerySet) -> int:
+        sql, params = queryset.order_by().query.sql_with_params()
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(f"explain (format json) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class CachedCount(ExactCount):
+    """
+    Caches the counts of another strategy for `ttl` seconds (by query).
+    """
+
+    def __init__(self, ttl: int = 300, strategy: Optional[ExactCount] = None):
+        self.ttl = ttl
+        self.strategy = strategy or ExactCount()
+
+    def cache_key(self, queryset: QuerySet) -> str:
+        sql, params = queryset.order_by().query.sql_with_params()
+        digest = hashlib.md5(f"{sql} {params}".encode()).hexdigest()
+        return f"graphql_count/{type(self.strategy).__name__}/{digest}"
+
+    def count(self, queryset: QuerySet) -> int:
+        key = self.cache_key(queryset)
+        redis = get_redis_connection()
+        try:
+            count = redis.get(key)
+            if count is not None:
+                return int(count)
+        except RedisError:
+            log.warning("Unable to read cached count", exc_info=True)
+
+        count = self.strategy.count(queryset)
+        try:
+            redis.set(key, count, ex=self.ttl)
+        except RedisError:
+            log.warning("Unable to cache count", exc_info=True)
+        return count
 
 
 def build_connection_graphql(connection_name, type_node):
@@ -38,6 +120,7 @@ class Connection:
     queryset: QuerySet
     paginator: CursorPaginator
     page: CursorPage
+    count_strategy: ExactCount = field(default_factory=ExactCount)
 
     @cached_property
     def edges(self):
@@ -48,7 +131,7 @@ class Connection:
 
     @sync_to_async
     def total_count(self, *args, **kwargs):
-        return self.queryset.count()
+        return self.count_strategy.count(self.queryset)
 
     @cached_property
     def start_cursor(self):
@@ -68,6 +151,128 @@ class Connection:
         }
 
 
+@dataclass
+class ListConnection:
+    """
+    Connection of nodes that were already loaded (e.g. by a dataloader), all of
+    them being returned in a single page.
+    """
+
+    nodes: list
+    paginator: CursorPaginator
+
+    @cached_property
+    def edges(self):
+        return [
+            {"cursor": self.paginator.cursor(node), "node": node} for node in self.nodes
+        ]
+
+    async def total_count(self, *args, **kwargs):
+        return len(self.nodes)
+
+    async def page_info(self, *args, **kwargs):
+        return {
+            "has_next_page": False,
+            "has_previous_page": False,
+            "start_cursor": self.edges[0]["cursor"] if self.edges else None,
+            "end_cursor": self.edges[-1]["cursor"] if self.edges else None,
+        }
+
+
+def list_to_connection(queryset, nodes, *, ordering, ordering_direction):
+    """
+    A method to return all the given `nodes` of the queryset as a connection, in
+    the same order and with the same cursors as `queryset_to_connection`.
+    """
+    nodes = sorted(
+        nodes,
+        key=lambda node: tuple(
+            getattr(node, field.value if isinstance(field, enum.Enum) else field)
+            for field in ordering
+        ),
+        reverse=ordering_direction == OrderingDirection.DESC,
+    )
+    ordering = tuple(field_order(field, ordering_direction) for field in ordering)
+    paginator = CursorPaginator(queryset, ordering=ordering)
+    return ListConnection(nodes, paginator)
+
+
+def _offset_cursor(offset: int) -> str:
+    return base64.b64encode(f"offset:{offset}".encode()).decode()
+
+
+def _cursor_offset(cursor: str) -> int:
+    try:
+        prefix, offset = base64.b64decode(cursor).decode().split(":")
+        if prefix == "offset":
+            return int(offset)
+    except ValueError:
+        pass
+    raise ValueError(f"Invalid cursor: {cursor}")
+
+
+@dataclass
+class SequenceConnection:
+    """
+    Connection of a slice of a sequence that's already filtered and sorted in
+    memory: cursors are offsets in the sequence and only the nodes of the page
+    are built from its items (with `nodes`, given the items of the page).
+    """
+
+    items: Sequence
+    start: int
+    end: int
+    nodes: Callable[[Sequence], list]
+
+    @cached_property
+    def edges(self):
+        nodes = self.nodes(self.items[self.start : self.end])
+        return [
+            {"cursor": _offset_cursor(offset), "node": node}
+            for offset, node in zip(range(self.start, self.end), nodes)
+        ]
+
+    async def total_count(self, *args, **kwargs):
+        return len(self.items)
+
+    async def page_info(self, *args, **kwargs):
+        has_page = self.start < self.end
+        return {
+            "has_next_page": self.end < len(self.items),
+            "has_previous_page": self.start > 0,
+            "start_cursor": _offset_cursor(self.start) if has_page else None,
+            "end_cursor": _offset_cursor(self.end - 1) if has_page else None,
+        }
+
+
+def sequence_to_connection(
+    items: Sequence,
+    *,
+    nodes: Callable[[Sequence], list] = list,
+    first=None,
+    after=None,
+    last=None,
+    before=None,
+):
+    """
+    A method to paginate a sequence with the same arguments as
+    `queryset_to_connection`.
+    """
+    if not first and not last:
+        first = DEFAULT_PAGE_SIZE
+
+    start, end = 0, len(items)
+    if after is not None:
+        start = max(start, _cursor_offset(after) + 1)
+    if before is not None:
+        end = min(end, _cursor_offset(before))
+    if first:
+        end = min(end, start + first)
+    if last:
+        start = max(start, end - last)
+    return SequenceConnection(items, start, max(start, end), nodes)
+
+
 def queryset_to_connection_sync(
     queryset,
     *,
@@ -77,17 +282,19 @@ def queryset_to_connection_sync(
     after=None,
     last=None,
     before=None,
+    count_strategy=None,
 ):
     """
     A method to take a queryset and return it in paginated order based on the cursor pattern.
+    Its `totalCount` is computed with the given `count_strategy` (an exact count by default).
     """
     if not first and not last:
-        first = 25
+        first = DEFAULT_PAGE_SIZE
 
     ordering = tuple(field_order(field, ordering_direction) for field in ordering)
     paginator = CursorPaginator(queryset, ordering=ordering)
     page = paginator.page(first=first, after=after, last=last, before=before)
-    return Connection(queryset, paginator, page)
+    return Connection(queryset, paginator, page, count_strategy or ExactCount())
 
 
 @sync_to_async
@@ -1,7 +1,10 @@
-from typing import Iterable, Optional
+from typing import Iterable, List, Mapping, Optional, Set
 
+from django.db.models import QuerySet
 from graphql.language.ast import (
+    FieldNode,
     FragmentSpreadNode,
+    InlineFragmentNode,
     Node,
     SelectionSetNode,
     VariableNode,
@@ -51,15 +54,25 @@ class LookaheadNode:
         """
         Expand fragments into flat list of selections
         """
-        selections = []
-        for selection in selection_set.selections:
-            if isinstance(selection, FragmentSpreadNode):
-                fragment = self.info.fragments[selection.name.value]
-                for selection in fragment.selection_set.selections:
-                    selections.append(selection)
-            else:
-                selections.append(selection)
-        return selections
+        return _flatten_selections(selection_set, self.info)
+
+
+def _flatten_selections(
+    selection_set: SelectionSetNode, info: GraphQLResolveInfo
+) -> List[FieldNode]:
+    """
+    Expand (inline and named) fragments into flat list of field selections
+    """
+    selections = []
+    for selection in selection_set.selections:
+        if isinstance(selection, FragmentSpreadNode):
+            fragment = info.fragments[selection.name.value]
+            selections += _flatten_selections(fragment.selection_set, info)
+        elif isinstance(selection, InlineFragmentNode):
+            selections += _flatten_selections(selection.selection_set, info)
+        else:
+            selections.append(selection)
+    return selections
 
 
 def lookahead(info: GraphQLResolveInfo, path: Iterable[str]) -> Optional[LookaheadNode]:
@@ -75,3 +88,71 @@ def lookahead(info: GraphQLResolveInfo, path: Iterable[str]) -> Optional[Lookahe
             return None
 
     return node
+
+
+def selected_fields(
+    info: GraphQLResolveInfo, path: Iterable[str]
+) -> Optional[Set[str]]:
+    """
+    Return the names of the fields selected at the given `path`, merging all the
+    selections of the same field (e.g. from different fragments)
+    """
+    nodes = info.field_nodes
+    for item in path:
+        nodes = [
+            selection
+            for node in nodes
+            if node.selection_set
+            for selection in _flatten_selections(node.selection_set, info)
+            if selection.name.value == item
+        ]
+        if len(nodes) == 0:
+            return None
+
+    return {
+        selection.name.value
+        for node in nodes
+        if node.selection_set
+        for selection in _flatten_selections(node.selection_set, info)
+    }
+
+
+def prune_columns(
+    queryset: QuerySet,
+    info: GraphQLResolveInfo,
+    path: Iterable[str],
+    columns: Mapping[str, Iterable[str]],
+    related: Optional[Mapping[str, Iterable[str]]] = None,
+) -> QuerySet:
+    """
+    Only fetch the columns of the queryset's records that are needed by the fields
+    selected at the given `path`:
+
+    `columns` maps (usually wide) columns to the fields needing them, and the
+    columns whose fields aren't selected are deferred.  `related` maps fields to
+    the relations they need, which are selected along with the records.
+
+    Nothing is deferred if the selected fields can't be found.
+    """
+    fields = selected_fields(info, path)
+    if fields is None:
+        return queryset
+
+    deferred = [
+        column
+        for column, column_fields in columns.items()
+        if fields.isdisjoint(column_fields)
+    ]
+    if deferred:
+        queryset = queryset.defer(*deferred)
+
+    select_related = [
+        relation
+        for field, relations in (related or {}).items()
+        if field in fields
+        for relation in relations
+    ]
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+
+    return queryset
@@ -0,0 +1,17 @@
+from typing import Iterable, List, Optional
+
+from codecov.commands.exceptions import ValidationError
+from timeseries.helpers import downsample_measurements
+
+
+def downsample(measurements: Iterable[dict], max_points: Optional[int]) -> List[dict]:
+    """
+    Applies the `maxPoints` argument of the measurements fields: the series is
+    returned as is when it's omitted, and otherwise downsampled to at most
+    `max_points` measurements, without placeholders.
+    """
+    if max_points is None:
+        return measurements
+    if max_points < 2:
+        raise ValidationError("maxPoints must be at least 2")
+    return downsample_measurements(measurements, max_points)
@@ -1,8 +1,18 @@
+from unittest.mock import patch
+
+import pytest
 from asgiref.sync import async_to_sync
-from django.test import TransactionTestCase
+from django.test import TestCase, TransactionTestCase
+from redis.exceptions import ConnectionError as RedisConnectionError
 
 from core.models import Repository
 from core.tests.factories import RepositoryFactory
+from graphql_api.helpers.connection import (
+    CachedCount,
+    EstimatedCount,
+    queryset_to_connection,
+    sequence_to_connection,
+)
 from graphql_api.types.enums import OrderingDirection, RepositoryOrdering
 
 
@@ -65,3 +75,97 @@ class RepositoryQuerySetTests(TransactionTestCase):
 
         count = async_to_sync(connection.total_count)()
         assert count == 3
+
+
+class CountStrategyTests(TransactionTestCase):
+    @pytest.fixture(autouse=True)
+    def inject_mock_redis(self, mock_redis):
+        self.redis = mock_redis
+
+    def setUp(self):
+        self.repos = [RepositoryFactory(name=name) for name in ("a", "b", "c")]
+
+    def test_queryset_to_connection_count_strategy(self):
+        connection = async_to_sync(queryset_to_connection)(
+            Repository.objects.all(),
+            ordering=(RepositoryOrdering.NAME,),
+            ordering_direction=OrderingDirection.ASC,
+            count_strategy=EstimatedCount(threshold=2),
+        )
+
+        with patch.object(EstimatedCount, "estimate", return_value=1234):
+            count = async_to_sync(connection.total_count)()
+        assert count == 1234
+
+    def test_estimated_count_exact_when_small(self):
+        with patch.object(EstimatedCount, "estimate") as estimate:
+            assert EstimatedCount(threshold=4).count(Repository.objects.all()) == 3
+        estimate.assert_not_called()
+
+    def test_estimated_count_at_least_threshold(self):
+        with patch.object(EstimatedCount, "estimate", return_value=1):
+            assert EstimatedCount(threshold=3).count(Repository.objects.all()) == 3
+
+    def test_estimated_count_estimate(self):
+        estimate = EstimatedCount().estimate(Repository.objects.all())
+        assert isinstance(estimate, int)
+
+    def test_cached_count(self):
+        strategy = CachedCount(ttl=60)
+        queryset = Repository.objects.filter(name__in=["a", "b"])
+        assert strategy.count(queryset) == 2
+
+        RepositoryFactory(name="a")
+        assert strategy.count(queryset) == 2
+        assert strategy.count(Repository.objects.filter(name="a")) == 2
+
+        self.redis.flushall()
+        assert strategy.count(queryset) == 3
+
+    def test_cached_count_redis_unavailable(self):
+        strategy = CachedCount(ttl=60)
+        with patch.object(self.redis, "get", side_effect=RedisConnectionError):
+            with patch.object(self.redis, "set", side_effect=RedisConnectionError):
+                assert strategy.count(Repository.objects.all()) == 3
+
+
+class SequenceConnectionTests(TestCase):
+    def test_sequence_to_connection(self):
+        items = list(range(10))
+        connection = sequence_to_connection(
+            items, first=3, nodes=lambda page: [str(item) for item in page]
+        )
+        assert [edge["node"] for edge in connection.edges] == ["0", "1", "2"]
+        assert async_to_sync(connection.total_count)() == 10
+        page_info = async_to_sync(connection.page_info)()
+        assert page_info["has_next_page"] is True
+        assert page_info["has_previous_page"] is False
+
+        connection = sequence_to_connection(
+            items, first=3, after=page_info["end_cursor"]
+        )
+        assert [edge["node"] for edge in connection.edges] == [3, 4, 5]
+
+        connection = sequence_to_connection(
+            items, last=2, before=connection.edges[0]["cursor"]
+        )
+        assert [edge["node"] for edge in connection.edges] == [1, 2]
+        page_info = async_to_sync(connection.page_info)()
+        assert page_info["has_next_page"] is True
+        assert page_info["has_previous_page"] is True
+
+    def test_sequence_to_connection_past_the_end(self):
+        items = list(range(3))
+        last = sequence_to_connection(items, last=1)
+        connection = sequence_to_connection(items, after=last.edges[0]["cursor"])
+        assert connection.edges == []
+        assert async_to_sync(connection.page_info)() == {
+            "has_next_page": False,
+            "has_previous_page": True,
+            "start_cursor": None,
+            "end_cursor": None,
+        }
+
+    def test_sequence_to_connection_invalid_cursor(self):
+        with pytest.raises(ValueError):
+            sequence_to_connection([1, 2], after="invalid")
@@ -0,0 +1,88 @@
+from types import SimpleNamespace
+
+from django.test import TestCase
+from graphql import parse
+from graphql.language import FragmentDefinitionNode, OperationDefinitionNode
+
+from core.models import Repository
+from graphql_api.helpers.lookahead import prune_columns, selected_fields
+
+query = """
+query Repositories {
+    owner {
+        repositories {
+            edges {
+                node {
+                    name
+                    ...RepositoryFragment
+                }
+            }
+            edges {
+                node {
+                    ... on Repository {
+                        active
+                    }
+                }
+            }
+        }
+    }
+}
+
+fragment RepositoryFragment on Repository {
+    bot { username }
+}
+"""
+
+
+def resolve_info(query):
+    """
+    Resolve info of the first field of the query's operation
+    """
+    document = parse(query)
+    operation = next(
+        definition
+        for definition in document.definitions
+        if isinstance(definition, OperationDefinitionNode)
+    )
+    fragments = {
+        definition.name.value: definition
+        for definition in document.definitions
+        if isinstance(definition, FragmentDefinitionNode)
+    }
+    owner = operation.selection_set.selections[0]
+    return SimpleNamespace(
+        field_nodes=owner.selection_set.selections,
+        fragments=fragments,
+        variable_values={},
+    )
+
+
+class LookaheadTests(TestCase):
+    def test_selected_fields(self):
+        info = resolve_info(query)
+        assert selected_fields(info, ("edges", "node")) == {"name", "bot", "active"}
+        assert selected_fields(info, ("edges", "node", "bot")) == {"username"}
+        assert selected_fields(info, ("edges", "node", "name")) == set()
+        assert selected_fields(info, ("edges", "nodes")) is None
+
+    def test_prune_columns(self):
+        info = resolve_info(query)
+        queryset = prune_columns(
+            Repository.objects.all(),
+            info,
+            ("edges", "node"),
+            columns={"yaml": ("yaml",), "webhook_secret": ("name",)},
+            related={"bot": ("bot",), "author": ("author",)},
+        )
+        assert queryset.query.deferred_loading == (frozenset({"yaml"}), True)
+        assert queryset.query.select_related == {"bot": {}}
+
+    def test_prune_columns_unknown_path(self):
+        info = resolve_info(query)
+        queryset = Repository.objects.all()
+        assert (
+            prune_columns(
+                queryset, info, ("edges", "nodes"), columns={"yaml": ("yaml",)}
+            )
+            is queryset
+        )
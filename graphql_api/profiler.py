@@ -0,0 +1,225 @@
+import logging
+import random
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+from dataclasses import fields
+from inspect import isawaitable
+from typing import Dict, Optional
+
+from ariadne.types import Extension
+from django.conf import settings
+from redis.exceptions import RedisError
+
+from services.redis_configuration import get_redis_connection
+from utils.counters import Counters, counting
+
+log = logging.getLogger(__name__)
+
+# upper bounds (in milliseconds) of the buckets of the resolvers' wall time histograms
+DURATION_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# the profiles of the operations that weren't sampled for that long are dropped
+PROFILE_TTL = 60 * 60 * 24
+
+# name of the "field" aggregating whole operations
+OPERATION = "__operation__"
+
+# operation names are chosen by the clients: only that many distinct ones
+# (profiled within `PROFILE_TTL`) get a profile of their own, the others are
+# aggregated in `OTHER_OPERATIONS`, as are names longer than `MAX_NAME_LENGTH`
+MAX_PROFILED_OPERATIONS = 200
+MAX_NAME_LENGTH = 100
+OTHER_OPERATIONS = "__other__"
+
+# sorted set of the profiled operation names, scored by when they were last sampled
+OPERATIONS_KEY = "graphql_profile_operations"
+
+_COUNTERS = tuple(field.name for field in fields(Counters))
+
+
+def _profile_key(operation_name: str) -> str:
+    return f"graphql_profile/{operation_name}"
+
+
+def _bucket(duration: float) -> str:
+    for bound in DURATION_BUCKETS:
+        if duration <= bound:
+            return str(bound)
+    return "+Inf"
+
+
+class FieldStats:
+    def __init__(self):
+        self.calls = 0
+        self.durations = defaultdict(int)
+        self.total_duration = 0.0
+        self.counters = Counters()
+
+    def add(self, duration: float, counters: Counters):
+        self.calls += 1
+        self.durations[_bucket(duration)] += 1
+        self.total_duration += duration
+        self.counters.add(counters)
+
+
+class ResolverProfilerExtension(Extension):
+    """
+    Profiles a sample (`settings.GRAPHQL_PROFILER_SAMPLE_RATE`) of the executed
+    operations: records the wall time of each field's resolver along with the
+    database queries, `sync_to_async` thread hops and storage reads it made.
+    These are aggregated by operation name (for a bounded number of names) and
+    field into histograms stored in Redis, see `get_profiles`.
+    """
+
+    def __init__(self):
+        self.sampled = random.random() < settings.GRAPHQL_PROFILER_SAMPLE_RATE
+        self.operation_name: Optional[str] = None
+        self.fields: Dict[str, FieldStats] = defaultdict(FieldStats)
+        self.started_at = None
+        self.counters = Counters()
+        self._exit_stack = ExitStack()
+
+    def request_started(self, context):
+        if not self.sampled:
+            return
+        self.started_at = time.perf_counter()
+        # counts what's done outside of the resolvers as well (e.g. validation)
+        self._exit_stack.enter_context(counting(self.counters))
+
+    def resolve(self, next_, obj, info, **kwargs):
+        if not self.sampled:
+            return next_(obj, info, **kwargs)
+
+        if self.operation_name is None:
+            operation = info.operation.name
+            self.operation_name = operation.value if operation else "anonymous"
+
+        field = f"{info.parent_type.name}.{info.field_name}"
+        started_at = time.perf_counter()
+        counters = Counters()
+        with counting(counters):
+            result = next_(obj, info, **kwargs)
+        if not isawaitable(result):
+            self._add(field, started_at, counters)
+            return result
+
+        async def profiled():
+            try:
+                with counting(counters):
+                    return await result
+            finally:
+                self._add(field, started_at, counters)
+
+        return profiled()
+
+    def _add(self, field: str, started_at: float, counters: Counters):
+        duration = (time.perf_counter() - started_at) * 1000
+        self.fields[field].add(duration, counters)
+
+    def request_finished(self, context):
+        if not self.sampled or self.started_at is None:
+            return
+        self._exit_stack.close()
+        if self.operation_name is None:
+            # the operation wasn't executed
+            return
+
+        # the counters of the whole operation: what was done by the resolvers
+        # and outside of them
+        counters = self.counters
+        for stats in self.fields.values():
+            counters.add(stats.counters)
+        self.fields[OPERATION].add(
+            (time.perf_counter() - self.started_at) * 1000, counters
+        )
+        try:
+            self._store()
+        except RedisError:
+            log.warning("Unable to store GraphQL resolvers profile", exc_info=True)
+
+    def _profiled_name(self, redis, now: float) -> str:
+        name = self.operation_name
+        if len(name) > MAX_NAME_LENGTH:
+            return OTHER_OPERATIONS
+        pipeline = redis.pipeline()
+        pipeline.zremrangebyscore(OPERATIONS_KEY, "-inf", now - PROFILE_TTL)
+        pipeline.zscore(OPERATIONS_KEY, name)
+        pipeline.zcard(OPERATIONS_KEY)
+        _, score, count = pipeline.execute()
+        if score is None and count >= MAX_PROFILED_OPERATIONS:
+            return OTHER_OPERATIONS
+        return name
+
+    def _store(self):
+        redis = get_redis_connection()
+        now = time.time()
+        name = self._profiled_name(redis, now)
+        key = _profile_key(name)
+        pipeline = redis.pipeline()
+        pipeline.zadd(OPERATIONS_KEY, {name: now})
+        pipeline.expire(OPERATIONS_KEY, PROFILE_TTL)
+        for field, stats in self.fields.items():
+            pipeline.hincrby(key, f"{field}|calls", stats.calls)
+            pipeline.hincrbyfloat(key, f"{field}|duration_sum", stats.total_duration)
+            for bucket, count in stats.durations.items():
+                pipeline.hincrby(key, f"{field}|duration_bucket|{bucket}", count)
+            for name in _COUNTERS:
+                pipeline.hincrby(key, f"{field}|{name}", getattr(stats.counters, name))
+        pipeline.expire(key, PROFILE_TTL)
+        pipeline.execute()
+
+
+def get_profiles() -> Dict[str, Dict[str, dict]]:
+    """
+    Returns the profiles of the sampled operations by operation name
+    (`OTHER_OPERATIONS` for the ones over the limits) and field (`OPERATION`
+    for the whole operations):
+
+        {
+            "Commits": {
+                "Repository.commits": {
+                    "calls": 10,
+                    "duration_sum": 152.3,
+                    "duration_buckets": {"10": 4, "25": 6},
+                    "db_queries": 30,
+                    "thread_hops": 20,
+                    "storage_reads": 0,
+                },
+                ...
+            },
+            ...
+        }
+
+    Durations are in milliseconds and each histogram bucket counts the calls
+    that took at most its upper bound and more than the previous one.
+    """
+    redis = get_redis_connection()
+    operation_names = [
+        name.decode()
+        for name in redis.zrangebyscore(
+            OPERATIONS_KEY, time.time() - PROFILE_TTL, "+inf"
+        )
+    ]
+    pipeline = redis.pipeline()
+    for operation_name in operation_names:
+        pipeline.hgetall(_profile_key(operation_name))
+
+    profiles = {}
+    for operation_name, profile in zip(operation_names, pipeline.execute()):
+        if not profile:
+            # expired
+            continue
+        fields = defaultdict(
+            lambda: {"duration_buckets": {}, **{name: 0 for name in _COUNTERS}}
+        )
+        for name, value in profile.items():
+            field, stat, *bucket = name.decode().split("|")
+            if bucket:
+                fields[field]["duration_buckets"][bucket[0]] = int(value)
+            elif stat == "duration_sum":
+                fields[field][stat] = float(value)
+            else:
+                fields[field][stat] = int(value)
+        profiles[operation_name] = dict(fields)
+    return profiles
@@ -1,10 +1,13 @@
 import asyncio
 import hashlib
+import re
 from datetime import datetime, timedelta
 from unittest.mock import AsyncMock, PropertyMock, patch
 
 import yaml
+from django.db import connection
 from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from shared.reports.types import LineSession
 
 import services.comparison as comparison
@@ -14,6 +17,7 @@ from compare.tests.factories import CommitComparisonFactory
 from core.tests.factories import CommitErrorFactory, CommitFactory, RepositoryFactory
 from graphql_api.types.enums import UploadErrorEnum, UploadState
 from graphql_api.types.enums.enums import UploadType
+from graphql_api.types.repository.repository import COMMIT_COLUMNS
 from reports.tests.factories import (
     CommitReportFactory,
     ReportLevelTotalsFactory,
@@ -360,6 +364,88 @@ class TestCommit(GraphQLTestHelper, TransactionTestCase):
             {"id": 5, "uploadType": "UPLOADED", "flags": []},
         ]
 
+    def test_fetch_commits_uploads_queries(self):
+        query = (
+            query_commits
+            % "totalUploads uploads { totalCount edges { node { state flags } } }"
+        )
+        variables = {"org": self.org.username, "repo": self.repo.name}
+
+        def count_queries():
+            with CaptureQueriesContext(connection) as queries:
+                data = self.gql_request(query, variables=variables)
+            return len(queries), paginate_connection(
+                data["owner"]["repository"]["commits"]
+            )
+
+        UploadFactory(report=self.report)
+        num_queries, commits = count_queries()
+        assert len(commits) == 2
+
+        # the uploads of all the commits are loaded at once
+        for _ in range(10):
+            report = CommitReportFactory(commit=CommitFactory(repository=self.repo))
+            UploadFactory(report=report)
+            UploadFactory(report=report)
+        more_num_queries, commits = count_queries()
+        assert len(commits) == 12
+        assert more_num_queries == num_queries
+        assert sorted(commit["totalUploads"] for commit in commits) == [0, 1] + [2] * 10
+
+    @patch("services.components.final_commit_yaml")
+    @patch(
+        "services.profiling.ProfilingSummary.critical_files", new_callable=PropertyMock
+    )
+    @patch("services.report.build_report_from_commit")
+    def test_fetch_commits_fields_with_columns(
+        self, build_report_mock, critical_files, final_commit_yaml
+    ):
+        def build_report(commit, report_class=None):
+            # reports are built from the commit totals
+            commit.totals
+            return None if report_class else MockReport()
+
+        build_report_mock.side_effect = build_report
+        critical_files.return_value = []
+        final_commit_yaml.return_value.get_components.return_value = []
+
+        selections = {
+            "message": "message",
+            "totals": "totals { coverage }",
+            "coverageFile": 'coverageFile(path: "path") { hashedPath }',
+            "flagNames": "flagNames",
+            "pathContents": "pathContents { __typename }",
+            "components": "components { id }",
+            "criticalFiles": "criticalFiles { name }",
+            "compareWithParent": "compareWithParent { __typename }",
+        }
+        assert set(selections) == {
+            field for fields in COMMIT_COLUMNS.values() for field in fields
+        }
+
+        variables = {"org": self.org.username, "repo": self.repo.name}
+        for field, selection in selections.items():
+            with self.subTest(field=field):
+                with CaptureQueriesContext(connection) as queries:
+                    data = self.gql_request(
+                        query_commits % f"commitid {selection}", variables=variables
+                    )
+                commits = paginate_connection(data["owner"]["repository"]["commits"])
+                assert len(commits) == 2
+
+                # the columns the field needs are fetched with the commits
+                # rather than loaded again for each commit
+                reloads = [
+                    query["sql"]
+                    for query in queries
+                    if re.match(
+                        r'SELECT "commits"\."id", "commits"\."\w+" FROM "commits" '
+                        r'WHERE "commits"\."id" = ',
+                        query["sql"],
+                    )
+                ]
+                assert len(reloads) == 0
+
     def test_fetch_commit_uploads_no_report(self):
         commit = CommitFactory(
             repository=self.repo,
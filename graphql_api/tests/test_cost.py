@@ -0,0 +1,236 @@
+from unittest.mock import patch
+
+from ariadne import ObjectType, graphql, make_executable_schema
+from django.test import TestCase, override_settings
+from graphql import parse
+
+from ..cost import (
+    FieldWeights,
+    QueryCostExtension,
+    estimate_query_cost,
+    query_cost_validator,
+)
+
+types = """
+type Query {
+    repositories(first: Int, last: Int): RepositoryConnection
+}
+
+type RepositoryConnection {
+    edges: [RepositoryEdge]
+    totalCount: Int!
+}
+
+type RepositoryEdge {
+    node: Repository
+}
+
+type Repository {
+    name: String
+    commit: Commit
+}
+
+type Commit {
+    commitid: String
+    compareWithParent: ComparisonResult
+}
+
+type Comparison {
+    impactedFiles: [ImpactedFile]!
+}
+
+type MissingBaseCommit {
+    message: String
+}
+
+union ComparisonResult = Comparison | MissingBaseCommit
+
+type ImpactedFile {
+    fileName: String
+}
+"""
+
+query = ObjectType("Query")
+
+
+@query.field("repositories")
+def resolve_repositories(*_, first=None, last=None):
+    return {
+        "totalCount": 2,
+        "edges": [{"node": {"name": "a"}}, {"node": {"name": "b"}}],
+    }
+
+
+schema = make_executable_schema(types, query)
+
+
+def estimate(query_string, variables=None, weights=None):
+    document = parse(query_string)
+    return estimate_query_cost(
+        schema,
+        document,
+        document.definitions[0],
+        variables=variables,
+        weights=weights,
+    )
+
+
+class EstimateQueryCostTestCase(TestCase):
+    def test_scalars_are_free(self):
+        assert estimate("{ repositories { totalCount } }") == 1
+
+    def test_connections_multiply_by_page_size(self):
+        # repositories + first * (edges + node)
+        assert estimate("{ repositories(first: 10) { edges { node { name } } } }") == 21
+        assert estimate("{ repositories(last: 3) { edges { node { name } } } }") == 7
+        assert (
+            estimate(
+                "query($first: Int) { repositories(first: $first) { edges { node { name } } } }",
+                variables={"first": 4},
+            )
+            == 9
+        )
+
+        with self.subTest("defaults to the default page size"):
+            assert estimate("{ repositories { edges { node { name } } } }") == 51
+
+    def test_weights(self):
+        query_string = """
+            {
+                repositories(first: 2) {
+                    edges {
+                        node {
+                            commit {
+                                compareWithParent {
+                                    ... on Comparison {
+                                        impactedFiles {
+                                            fileName
+                                        }
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        """
+        # repositories + 2 * (edges + node + commit + compareWithParent(10) + impactedFiles)
+        assert estimate(query_string) == 29
+
+        with self.subTest("weights can be overridden"):
+            weights = FieldWeights(
+                {
+                    "Commit": {"compareWithParent": 100},
+                    "Comparison": {"impactedFiles": {"weight": 5, "multiplier": 2}},
+                    "ImpactedFile": {"fileName": 1},
+                }
+            )
+            # repositories + 2 * (edges + node + commit + 100 + (5 + 2 * fileName))
+            assert estimate(query_string, weights=weights) == 221
+
+    def test_fragments(self):
+        assert (
+            estimate(
+                """
+                query { repositories(first: 2) { ...Repositories } }
+                fragment Repositories on RepositoryConnection {
+                    edges { node { name } }
+                }
+                """
+            )
+            == 5
+        )
+
+
+class QueryCostValidatorTestCase(TestCase):
+    async def run_query(self, query_string, operation_name=None):
+        context = {}
+        data = {"query": query_string, "operationName": operation_name}
+        success, result = await graphql(
+            schema,
+            data,
+            context_value=context,
+            validation_rules=lambda context, document, data: [
+                query_cost_validator(context, data)
+            ],
+            extensions=[QueryCostExtension],
+        )
+        return success, result, context
+
+    @override_settings(GRAPHQL_MAX_QUERY_COST=100)
+    async def test_queries_over_budget_are_rejected(self):
+        success, result, context = await self.run_query(
+            "query Repositories { repositories(first: 10) { edges { node { name } } } }"
+        )
+        assert success
+        assert context["query_cost"] == {
+            "operation_name": "Repositories",
+            "estimated": 21,
+            "budget": 100,
+        }
+
+        success, result, context = await self.run_query(
+            "query Repositories { repositories(first: 100) { edges { node { name } } } }"
+        )
+        assert not success
+        assert "data" not in result
+        assert (
+            result["errors"][0]["message"]
+            == "Query is too expensive: its estimated cost is 201 while at most 100 is allowed"
+        )
+
+    @override_settings(GRAPHQL_MAX_QUERY_COST=100)
+    async def test_negative_page_sizes_are_not_discounted(self):
+        success, result, context = await self.run_query(
+            """
+            query Repositories {
+                negative: repositories(first: -1000) { edges { node { name } } }
+                repositories(first: 100) { edges { node { name } } }
+            }
+            """
+        )
+        assert not success
+        # the negative page size counts as an empty page
+        assert context["query_cost"]["estimated"] == 202
+
+    @override_settings(
+        GRAPHQL_MAX_QUERY_COST=100,
+        GRAPHQL_OPERATION_COST_BUDGETS={"Repositories": 10},
+    )
+    async def test_operation_budgets(self):
+        query_string = """
+            query Repositories { repositories(first: 10) { edges { node { name } } } }
+            query Count { repositories(first: 10) { totalCount } }
+        """
+        success, result, context = await self.run_query(
+            query_string, operation_name="Repositories"
+        )
+        assert not success
+        assert context["query_cost"]["budget"] == 10
+
+        success, result, context = await self.run_query(
+            query_string, operation_name="Count"
+        )
+        assert success
+        assert context["query_cost"] == {
+            "operation_name": "Count",
+            "estimated": 1,
+            "budget": 100,
+        }
+
+    @override_settings(GRAPHQL_MAX_QUERY_COST=100)
+    @patch("graphql_api.cost.log.info")
+    async def test_actual_cost_is_reported(self, log_info):
+        await self.run_query(
+            "query Repositories { repositories(first: 10) { edges { node { name } } } }"
+        )
+        log_info.assert_called_once_with(
+            "GraphQL query cost",
+            extra=dict(
+                operation_name="Repositories",
+                estimated_cost=21,
+                # repositories + edges + the 2 nodes that were resolved
+                actual_cost=4,
+                budget=100,
+            ),
+        )
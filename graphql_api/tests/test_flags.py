@@ -1,4 +1,5 @@
 from datetime import datetime
+from types import SimpleNamespace
 from unittest.mock import patch
 
 import pytest
@@ -10,7 +11,8 @@ from freezegun import freeze_time
 from codecov_auth.tests.factories import OwnerFactory
 from core.tests.factories import CommitFactory, RepositoryFactory
 from reports.tests.factories import RepositoryFlagFactory
-from timeseries.models import Dataset, MeasurementName
+from graphql_api.types.flag.flag import resolve_measurements
+from timeseries.models import Dataset, Interval, MeasurementName
 from timeseries.tests.factories import DatasetFactory, MeasurementFactory
 
 from .helper import GraphQLTestHelper
@@ -788,3 +790,24 @@ class TestFlags(GraphQLTestHelper, TransactionTestCase):
         )
         assert data["owner"]["repository"]["flagsMeasurementsActive"] == True
         assert data["owner"]["repository"]["flagsMeasurementsBackfilled"] == True
+
+    def test_flag_measurements_filled_per_repository(self):
+        after = datetime(2022, 6, 20, tzinfo=timezone.utc)
+        before = datetime(2022, 6, 21, tzinfo=timezone.utc)
+        info = SimpleNamespace(context={})
+        for repository_id, avg in [(1, 80.0), (2, 90.0)]:
+            # set by the parent resolver of each repository
+            info.context["flag_measurements"] = {
+                repository_id: [
+                    {"timestamp_bin": after, "avg": avg, "min": avg, "max": avg}
+                ]
+            }
+            flag = SimpleNamespace(pk=repository_id, repository_id=repository_id)
+            measurements = resolve_measurements(
+                flag,
+                info,
+                interval=Interval.INTERVAL_1_DAY,
+                after=after,
+                before=before,
+            )
+            assert measurements[0]["avg"] == avg
@@ -81,6 +81,47 @@ query ImpactedFiles(
 }
 """
 
+query_impacted_files_connection = """
+query ImpactedFilesConnection(
+    $org: String!
+    $repo: String!
+    $commit: String!
+    $after: String
+) {
+    owner(username: $org) {
+        repository(name: $repo) {
+            ... on Repository {
+                commit(id: $commit) {
+                    compareWithParent {
+                        ... on Comparison {
+                            impactedFilesConnection(
+                                filters: {
+                                    ordering: { parameter: MISSES_COUNT, direction: DESC }
+                                }
+                                first: 1
+                                after: $after
+                            ) {
+                                totalCount
+                                edges {
+                                    cursor
+                                    node {
+                                        headName
+                                        missesCount
+                                    }
+                                }
+                                pageInfo {
+                                    hasNextPage
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
+"""
+
 query_impacted_file_through_pull = """
 query ImpactedFile(
     $org: String!
@@ -314,6 +355,42 @@ class TestImpactedFile(GraphQLTestHelper, TransactionTestCase):
             }
         }
 
+    @patch("services.archive.ArchiveService.read_file")
+    def test_fetch_impacted_files_connection(self, read_file):
+        read_file.return_value = mock_data_from_archive
+        variables = {
+            "org": self.org.username,
+            "repo": self.repo.name,
+            "commit": self.commit.commitid,
+        }
+
+        def fetch_page(after=None):
+            data = self.gql_request(
+                query_impacted_files_connection,
+                variables={**variables, "after": after},
+            )
+            return data["owner"]["repository"]["commit"]["compareWithParent"][
+                "impactedFilesConnection"
+            ]
+
+        # only the impacted files of the page are built
+        with patch.object(
+            ImpactedFile, "create", wraps=ImpactedFile.create
+        ) as create_impacted_file:
+            page = fetch_page()
+        assert create_impacted_file.call_count == 1
+        assert page["totalCount"] == 2
+        assert page["pageInfo"] == {"hasNextPage": True}
+        assert [edge["node"] for edge in page["edges"]] == [
+            {"headName": "fileB", "missesCount": 2}
+        ]
+
+        page = fetch_page(after=page["edges"][0]["cursor"])
+        assert page["pageInfo"] == {"hasNextPage": False}
+        assert [edge["node"] for edge in page["edges"]] == [
+            {"headName": "fileA", "missesCount": 1}
+        ]
+
     @patch("services.task.TaskService.compute_comparisons")
     @patch("services.comparison.ComparisonReport.impacted_file")
     @patch("services.comparison.Comparison.validate")
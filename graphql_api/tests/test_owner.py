@@ -2,7 +2,9 @@ import asyncio
 from datetime import timedelta
 from unittest.mock import patch
 
+from django.db import connection
 from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from freezegun import freeze_time
 
@@ -12,9 +14,19 @@ from codecov_auth.tests.factories import (
     OwnerFactory,
     UserFactory,
 )
-from core.tests.factories import CommitFactory, OwnerFactory, RepositoryFactory
+from core.tests.factories import (
+    BranchFactory,
+    CommitFactory,
+    OwnerFactory,
+    PullFactory,
+    RepositoryFactory,
+)
 from plan.constants import PlanName, TrialStatus
-from reports.tests.factories import CommitReportFactory, UploadFactory
+from reports.tests.factories import (
+    CommitReportFactory,
+    RepositoryFlagFactory,
+    UploadFactory,
+)
 
 from .helper import GraphQLTestHelper, paginate_connection
 
@@ -62,6 +74,76 @@ class TestOwnerType(GraphQLTestHelper, TransactionTestCase):
             name="still-not",
         )
 
+    def test_fetching_repositories_relations_queries(self):
+        query = """{
+            owner(username: "%s") {
+                repositories(first: 50) {
+                    edges {
+                        node {
+                            name
+                            flagsCount
+                            branch(name: "main") { name headSha }
+                            pull(id: 1) { pullId title }
+                        }
+                    }
+                }
+            }
+        }
+        """
+
+        def add_repositories(owner, count):
+            for i in range(count):
+                repository = RepositoryFactory(author=owner, name=f"repo-{i}")
+                BranchFactory(repository=repository, name="main", head=f"sha-{i}")
+                PullFactory(repository=repository, pullid=1, title=f"pull-{i}")
+                RepositoryFlagFactory(repository=repository)
+
+        def count_queries(owner):
+            with CaptureQueriesContext(connection) as queries:
+                data = self.gql_request(query % owner.username, owner=owner)
+            return len(queries), paginate_connection(data["owner"]["repositories"])
+
+        owner = OwnerFactory(username="few-repos", service="github")
+        add_repositories(owner, 5)
+        num_queries, repositories = count_queries(owner)
+        assert len(repositories) == 5
+
+        # the branches, pulls and flag counts of all the repos are loaded at once
+        owner = OwnerFactory(username="many-repos", service="github")
+        add_repositories(owner, 50)
+        more_num_queries, repositories = count_queries(owner)
+        assert len(repositories) == 50
+        assert more_num_queries == num_queries
+        assert repositories[7] == {
+            "name": "repo-7",
+            "flagsCount": 1,
+            "branch": {"name": "main", "headSha": "sha-7"},
+            "pull": {"pullId": 1, "title": "pull-7"},
+        }
+
+    def test_fetching_repositories_only_fetches_selected_columns(self):
+        query = query_repositories % (self.owner.username, "", "")
+        with CaptureQueriesContext(connection) as queries:
+            self.gql_request(query, owner=self.owner)
+        repository_queries = [
+            query["sql"] for query in queries if 'FROM "repos"' in query["sql"]
+        ]
+        # the listed repositories are fetched without their yaml
+        assert any('"repos"."yaml"' not in sql for sql in repository_queries)
+
+        # the column is fetched when it's selected
+        query = """{
+            owner(username: "%s") {
+                repositories { edges { node { name yaml } } }
+            }
+        }
+        """
+        data = self.gql_request(query % self.owner.username, owner=self.owner)
+        assert paginate_connection(data["owner"]["repositories"]) == [
+            {"name": "a", "yaml": None},
+            {"name": "b", "yaml": None},
+        ]
+
     def test_fetching_repositories(self):
         query = query_repositories % (self.owner.username, "", "")
         data = self.gql_request(query, owner=self.owner)
@@ -0,0 +1,115 @@
+from unittest.mock import patch
+
+import pytest
+from ariadne import ObjectType, make_executable_schema
+from django.test import RequestFactory, TestCase, override_settings
+
+from codecov.db import sync_to_async
+from codecov_auth.tests.factories import UserFactory
+from core.models import Repository
+from core.tests.factories import RepositoryFactory
+
+from ..profiler import OPERATION, OTHER_OPERATIONS, get_profiles
+from ..views import resolver_profiles_view
+from .test_views import post_to_view
+
+
+def generate_schema_that_counts_repositories():
+    types = """
+    type Query {
+        repositories: Int
+        hello: String
+    }
+    """
+    query_bindable = ObjectType("Query")
+
+    @query_bindable.field("repositories")
+    @sync_to_async
+    def resolve_repositories(*_):
+        return Repository.objects.count()
+
+    @query_bindable.field("hello")
+    def resolve_hello(*_):
+        return "hello"
+
+    return make_executable_schema(types, query_bindable)
+
+
+class ResolverProfilerTestCase(TestCase):
+    @pytest.fixture(autouse=True)
+    def inject_mock_redis(self, mock_redis):
+        self.redis = mock_redis
+
+    def setUp(self):
+        RepositoryFactory()
+        self.schema = generate_schema_that_counts_repositories()
+
+    @override_settings(GRAPHQL_PROFILER_SAMPLE_RATE=1)
+    async def test_profiles_sampled_operations(self):
+        query = "query Count { repositories hello }"
+        for _ in range(2):
+            data = await post_to_view(self.schema, {"query": query})
+            assert data == {"data": {"repositories": 1, "hello": "hello"}}
+
+        profiles = await sync_to_async(get_profiles)()
+        assert list(profiles.keys()) == ["Count"]
+        profile = profiles["Count"]
+        assert set(profile.keys()) == {
+            "Query.repositories",
+            "Query.hello",
+            OPERATION,
+        }
+
+        repositories = profile["Query.repositories"]
+        assert repositories["calls"] == 2
+        assert sum(repositories["duration_buckets"].values()) == 2
+        assert repositories["duration_sum"] > 0
+        assert repositories["db_queries"] == 2
+        assert repositories["thread_hops"] == 2
+        assert repositories["storage_reads"] == 0
+
+        hello = profile["Query.hello"]
+        assert hello["calls"] == 2
+        assert hello["db_queries"] == 0
+        assert hello["thread_hops"] == 0
+
+        operation = profile[OPERATION]
+        assert operation["calls"] == 2
+        assert operation["db_queries"] >= 2
+        assert operation["duration_sum"] >= repositories["duration_sum"]
+
+    @override_settings(GRAPHQL_PROFILER_SAMPLE_RATE=0.5)
+    async def test_samples_operations(self):
+        query = "query Count { repositories }"
+        with patch("graphql_api.profiler.random.random", return_value=0.7):
+            await post_to_view(self.schema, {"query": query})
+        assert await sync_to_async(get_profiles)() == {}
+
+        with patch("graphql_api.profiler.random.random", return_value=0.2):
+            await post_to_view(self.schema, {"query": query})
+        profiles = await sync_to_async(get_profiles)()
+        assert profiles["Count"]["Query.repositories"]["calls"] == 1
+
+    @override_settings(GRAPHQL_PROFILER_SAMPLE_RATE=1)
+    async def test_limits_profiled_operations(self):
+        with patch("graphql_api.profiler.MAX_PROFILED_OPERATIONS", 2):
+            for name in ["First", "Second", "Third", "First", "Fourth"]:
+                await post_to_view(self.schema, {"query": f"query {name} {{ hello }}"})
+            await post_to_view(
+                self.schema, {"query": f"query {'Long' * 30} {{ hello }}"}
+            )
+
+        profiles = await sync_to_async(get_profiles)()
+        assert sorted(profiles.keys()) == ["First", "Second", OTHER_OPERATIONS]
+        assert profiles["First"][OPERATION]["calls"] == 2
+        assert profiles[OTHER_OPERATIONS][OPERATION]["calls"] == 3
+
+    def test_profiles_view(self):
+        request = RequestFactory().get("/graphql/profiles")
+        request.user = UserFactory(is_staff=False)
+        assert resolver_profiles_view(request).status_code == 403
+
+        request.user = UserFactory(is_staff=True)
+        response = resolver_profiles_view(request)
+        assert response.status_code == 200
+        assert response.content == b"{}"
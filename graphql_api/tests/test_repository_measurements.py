@@ -15,7 +15,7 @@ from .helper import GraphQLTestHelper
 class TestMeasurement(TransactionTestCase, GraphQLTestHelper):
     def _request(self, variables=None):
         query = f"""
-            query Measurements($branch: String) {{
+            query Measurements($branch: String, $maxPoints: Int) {{
                 owner(username: "{self.org.username}") {{
                     repository(name: "{self.repo.name}") {{
                         ... on Repository {{
@@ -24,6 +24,7 @@ class TestMeasurement(TransactionTestCase, GraphQLTestHelper):
                                 after: "2022-01-01"
                                 before: "2022-01-03"
                                 branch: $branch
+                                maxPoints: $maxPoints
                             ) {{
                                 timestamp
                                 avg
@@ -73,6 +74,7 @@ class TestMeasurement(TransactionTestCase, GraphQLTestHelper):
             start_date=datetime(2022, 1, 1, 0, 0, 0, tzinfo=timezone.utc),
             end_date=datetime(2022, 1, 3, 0, 0, 0, tzinfo=timezone.utc),
             branch=None,
+            cached=True,
         )
 
     @override_settings(TIMESERIES_ENABLED=False)
@@ -101,6 +103,7 @@ class TestMeasurement(TransactionTestCase, GraphQLTestHelper):
             start_date=datetime(2022, 1, 1, 0, 0, 0, tzinfo=timezone.utc),
             end_date=datetime(2022, 1, 3, 0, 0, 0, tzinfo=timezone.utc),
             branch=None,
+            cached=True,
         )
 
     @override_settings(TIMESERIES_ENABLED=True)
@@ -114,4 +117,58 @@ class TestMeasurement(TransactionTestCase, GraphQLTestHelper):
             start_date=datetime(2022, 1, 1, 0, 0, 0, tzinfo=timezone.utc),
             end_date=datetime(2022, 1, 3, 0, 0, 0, tzinfo=timezone.utc),
             branch="foo",
+            cached=True,
         )
+
+    @override_settings(TIMESERIES_ENABLED=True)
+    def test_measurements_max_points(
+        self, repository_coverage_measurements_with_fallback
+    ):
+        repository_coverage_measurements_with_fallback.return_value = [
+            {"timestamp_bin": datetime(2022, 1, 1), "min": 1, "max": 2, "avg": 1.5},
+            {"timestamp_bin": datetime(2022, 1, 2), "min": 3, "max": 4, "avg": 3.5},
+            {"timestamp_bin": datetime(2022, 1, 3), "min": 5, "max": 6, "avg": 5.5},
+        ]
+
+        assert self._request(variables={"maxPoints": 2}) == [
+            {"timestamp": "2022-01-01T00:00:00", "min": 1.0, "max": 2.0, "avg": 1.5},
+            {"timestamp": "2022-01-03T00:00:00", "min": 5.0, "max": 6.0, "avg": 5.5},
+        ]
+
+    @override_settings(TIMESERIES_ENABLED=True)
+    def test_measurements_max_points_drops_placeholders(
+        self, repository_coverage_measurements_with_fallback
+    ):
+        repository_coverage_measurements_with_fallback.return_value = [
+            {"timestamp_bin": datetime(2022, 1, 1), "min": 1, "max": 2, "avg": 1.5},
+            {"timestamp_bin": datetime(2022, 1, 3), "min": 5, "max": 6, "avg": 5.5},
+        ]
+
+        # the series isn't longer than `maxPoints` but the missing day is dropped
+        assert self._request(variables={"maxPoints": 3}) == [
+            {"timestamp": "2022-01-01T00:00:00", "min": 1.0, "max": 2.0, "avg": 1.5},
+            {"timestamp": "2022-01-03T00:00:00", "min": 5.0, "max": 6.0, "avg": 5.5},
+        ]
+
+    @override_settings(TIMESERIES_ENABLED=True)
+    def test_measurements_invalid_max_points(
+        self, repository_coverage_measurements_with_fallback
+    ):
+        repository_coverage_measurements_with_fallback.return_value = []
+
+        query = f"""
+            query {{
+                owner(username: "{self.org.username}") {{
+                    repository(name: "{self.repo.name}") {{
+                        ... on Repository {{
+                            measurements(interval: INTERVAL_1_DAY, maxPoints: 1) {{
+                                avg
+                            }}
+                        }}
+                    }}
+                }}
+            }}
+        """
+        data = self.gql_request(query, owner=self.owner, with_errors=True)
+        assert data["errors"][0]["message"] == "maxPoints must be at least 2"
+        assert data["errors"][0]["type"] == "ValidationError"
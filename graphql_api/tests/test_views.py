@@ -1,11 +1,14 @@
+import hashlib
 import json
 
+import pytest
 from ariadne import ObjectType, make_executable_schema
 from django.test import RequestFactory, TestCase, override_settings
 from django.urls import ResolverMatch
 
 from codecov.commands.exceptions import Unauthorized
 
+from ..documents import get_persisted_query, parse_and_validate
 from ..views import AsyncGraphqlView
 from .helper import GraphQLTestHelper
 
@@ -25,19 +28,40 @@ def generate_schema_that_raise_with(exception):
     return make_executable_schema(types, query_bindable)
 
 
+def generate_schema_that_greets():
+    types = """
+    type Query {
+        hello(name: String): String
+    }
+    """
+    query_bindable = ObjectType("Query")
+
+    @query_bindable.field("hello")
+    def hello_bindable(*_, name=None):
+        return f"Hello {name}"
+
+    return make_executable_schema(types, query_bindable)
+
+
+async def post_to_view(schema, body):
+    view = AsyncGraphqlView.as_view(schema=schema)
+    request = RequestFactory().post(
+        "/graphql/gh", body, content_type="application/json"
+    )
+    match = ResolverMatch(func=lambda: None, args=(), kwargs={"service": "github"})
+
+    request.resolver_match = match
+    request.user = None
+    request.current_owner = None
+    res = await view(request, service="gh")
+    if res["Content-Type"] != "application/json":
+        return res.content.decode()
+    return json.loads(res.content)
+
+
 class ArianeViewTestCase(GraphQLTestHelper, TestCase):
     async def do_query(self, schema, query="{ failing }"):
-        view = AsyncGraphqlView.as_view(schema=schema)
-        request = RequestFactory().post(
-            "/graphql/gh", {"query": query}, content_type="application/json"
-        )
-        match = ResolverMatch(func=lambda: None, args=(), kwargs={"service": "github"})
-
-        request.resolver_match = match
-        request.user = None
-        request.current_owner = None
-        res = await view(request, service="gh")
-        return json.loads(res.content)
+        return await post_to_view(schema, {"query": query})
 
     @override_settings(DEBUG=True)
     async def test_when_debug_is_true(self):
@@ -74,3 +98,82 @@ class ArianeViewTestCase(GraphQLTestHelper, TestCase):
             data["errors"][0]["message"]
             == "Cannot query field 'fieldThatDoesntExist' on type 'Query'."
         )
+
+    @override_settings(
+        DEBUG=False,
+        GRAPHQL_MAX_QUERY_COST=1,
+        GRAPHQL_QUERY_COST_WEIGHTS={"Query": {"failing": 5}},
+    )
+    async def test_when_query_is_too_expensive(self):
+        schema = generate_schema_that_raise_with(Unauthorized())
+        data = await self.do_query(schema, "query Failing { failing }")
+        assert data["errors"] is not None
+        assert data["errors"][0]["type"] == "QueryCostExceeded"
+        assert (
+            data["errors"][0]["message"]
+            == "Query is too expensive: its estimated cost is 5 while at most 1 is allowed"
+        )
+
+
+class PersistedQueriesTestCase(TestCase):
+    query = "query Hello($name: String) { hello(name: $name) }"
+
+    @pytest.fixture(autouse=True)
+    def inject_mock_redis(self, mock_redis):
+        self.redis = mock_redis
+
+    def setUp(self):
+        self.schema = generate_schema_that_greets()
+        self.query_hash = hashlib.sha256(self.query.encode()).hexdigest()
+        get_persisted_query.cache_clear()
+        parse_and_validate.cache_clear()
+
+    def _body(self, name, query=None, query_hash=None):
+        body = {
+            "variables": {"name": name},
+            "extensions": {
+                "persistedQuery": {
+                    "version": 1,
+                    "sha256Hash": query_hash or self.query_hash,
+                }
+            },
+        }
+        if query:
+            body["query"] = query
+        return body
+
+    async def test_persisted_query(self):
+        data = await post_to_view(self.schema, self._body("a"))
+        assert data == {
+            "errors": [
+                {
+                    "message": "PersistedQueryNotFound",
+                    "extensions": {"code": "PERSISTED_QUERY_NOT_FOUND"},
+                }
+            ]
+        }
+
+        data = await post_to_view(self.schema, self._body("a", query=self.query))
+        assert data == {"data": {"hello": "Hello a"}}
+
+        data = await post_to_view(self.schema, self._body("b"))
+        assert data == {"data": {"hello": "Hello b"}}
+
+    async def test_persisted_query_hash_mismatch(self):
+        data = await post_to_view(
+            self.schema, self._body("a", query=self.query, query_hash="abc")
+        )
+        assert data == "provided sha does not match query"
+
+        data = await post_to_view(self.schema, self._body("a"))
+        assert data["errors"][0]["message"] == "PersistedQueryNotFound"
+
+    async def test_documents_are_parsed_and_validated_once(self):
+        for name in ["a", "b", "c"]:
+            data = await post_to_view(
+                self.schema, {"query": self.query, "variables": {"name": name}}
+            )
+            assert data == {"data": {"hello": f"Hello {name}"}}
+
+        assert parse_and_validate.cache_info().misses == 1
+        assert parse_and_validate.cache_info().hits == 2
@@ -14,13 +14,15 @@ from graphql_api.actions.path_contents import sort_path_contents
 from graphql_api.dataloader.commit import CommitLoader
 from graphql_api.dataloader.comparison import ComparisonLoader
 from graphql_api.dataloader.owner import OwnerLoader
+from graphql_api.dataloader.upload import UploadCountLoader, UploadsLoader
 from graphql_api.helpers.connection import (
+    list_to_connection,
     queryset_to_connection,
-    queryset_to_connection_sync,
 )
 from graphql_api.types.comparison.comparison import MissingBaseCommit, MissingHeadReport
 from graphql_api.types.enums import OrderingDirection, PathContentDisplayType
 from graphql_api.types.errors import MissingCoverage, MissingHeadReport, UnknownPath
+from reports.models import ReportSession
 from services.comparison import Comparison, ComparisonReport
 from services.components import Component
 from services.path import ReportPaths
@@ -86,14 +88,18 @@ async def resolve_yaml_state(commit: Commit, info) -> YamlStates:
 
 
 @commit_bindable.field("uploads")
-@sync_to_async
-def resolve_list_uploads(commit: Commit, info, **kwargs):
-    queryset = commit_uploads(commit)
-
+async def resolve_list_uploads(commit: Commit, info, **kwargs):
     if not kwargs:  # temp to override kwargs -> return all current uploads
-        kwargs["first"] = queryset.count()
+        uploads = await UploadsLoader.loader(info).load(commit.pk)
+        return list_to_connection(
+            ReportSession.objects.filter(report__commit=commit, report__code=None),
+            uploads,
+            ordering=("id",),
+            ordering_direction=OrderingDirection.ASC,
+        )
 
-    return queryset_to_connection_sync(
+    queryset = await sync_to_async(commit_uploads)(commit)
+    return await queryset_to_connection(
         queryset, ordering=("id",), ordering_direction=OrderingDirection.ASC, **kwargs
     )
 
@@ -206,9 +212,8 @@ async def resolve_errors(commit, info, errorType):
 
 
 @commit_bindable.field("totalUploads")
-async def resolve_total_uploads(commit, info):
-    command = info.context["executor"].get_command("commit")
-    return await command.get_uploads_number(commit)
+def resolve_total_uploads(commit, info):
+    return UploadCountLoader.loader(info).load(commit.pk)
 
 
 @commit_bindable.field("components")
@@ -1,5 +1,9 @@
 from graphql_api.helpers.ariadne import ariadne_load_local_graphql
+from graphql_api.helpers.connection import build_connection_graphql
 
 from .comparison import comparison_bindable, comparison_result_bindable
 
 comparison = ariadne_load_local_graphql(__file__, "comparison.graphql")
+comparison = comparison + build_connection_graphql(
+    "ImpactedFileConnection", "ImpactedFile"
+)
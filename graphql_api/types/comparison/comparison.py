@@ -8,6 +8,7 @@ from codecov.db import sync_to_async
 from compare.models import ComponentComparison, FlagComparison
 from graphql_api.actions.flags import get_flag_comparisons
 from graphql_api.dataloader.commit import CommitLoader
+from graphql_api.helpers.connection import sequence_to_connection
 from graphql_api.types.errors import (
     MissingBaseCommit,
     MissingBaseReport,
@@ -41,22 +42,40 @@ def resolve_impacted_files(
     return command.fetch_impacted_files(comparison, filters)
 
 
+@comparison_bindable.field("impactedFilesConnection")
+@convert_kwargs_to_snake_case
+@sync_to_async
+def resolve_impacted_files_connection(
+    comparison: ComparisonReport, info, filters=None, **kwargs
+):
+    command = info.context["executor"].get_command("compare")
+    summaries = command.fetch_impacted_file_summaries(comparison, filters)
+    # only the impacted files of the requested page are built
+    return sequence_to_connection(
+        summaries,
+        nodes=lambda page: comparison.impacted_files_at(
+            [summary.position for summary in page]
+        ),
+        **kwargs,
+    )
+
+
 @comparison_bindable.field("impactedFilesCount")
 @sync_to_async
 def resolve_impacted_files_count(comparison: ComparisonReport, info):
-    return len(comparison.impacted_files)
+    return len(comparison.file_summaries)
 
 
 @comparison_bindable.field("directChangedFilesCount")
 @sync_to_async
 def resolve_direct_changed_files_count(comparison: ComparisonReport, info):
-    return len(comparison.impacted_files_with_direct_changes)
+    return sum(1 for file in comparison.file_summaries if file.has_diff)
 
 
 @comparison_bindable.field("indirectChangedFilesCount")
 @sync_to_async
 def resolve_indirect_changed_files_count(comparison: ComparisonReport, info):
-    return len(comparison.impacted_files_with_unintended_changes)
+    return sum(1 for file in comparison.file_summaries if file.has_changes)
 
 
 @comparison_bindable.field("impactedFile")
@@ -53,7 +53,6 @@ def resolve_seats_limit(_, info):
 
 
 @config_bindable.field("isTimescaleEnabled")
-@sync_to_async
 def resolve_is_timescale_enabled(_, info):
     if isinstance(settings.TIMESERIES_ENABLED, str):
         return bool(strtobool(settings.TIMESERIES_ENABLED))
@@ -1,10 +1,11 @@
 from datetime import datetime
-from typing import Iterable
+from typing import Iterable, Optional
 
-from ariadne import ObjectType
+from ariadne import ObjectType, convert_kwargs_to_snake_case
 
+from graphql_api.helpers.measurements import downsample
 from reports.models import RepositoryFlag
-from timeseries.helpers import fill_sparse_measurements
+from timeseries.helpers import fill_sparse_measurements_by_key
 from timeseries.models import Interval, MeasurementSummary
 
 flag_bindable = ObjectType("Flag")
@@ -42,10 +43,21 @@ def resolve_percent_change(flag: RepositoryFlag, info) -> float:
 
 
 @flag_bindable.field("measurements")
+@convert_kwargs_to_snake_case
 def resolve_measurements(
-    flag: RepositoryFlag, info, interval: Interval, after: datetime, before: datetime
+    flag: RepositoryFlag,
+    info,
+    interval: Interval,
+    after: datetime,
+    before: datetime,
+    max_points: Optional[int] = None,
 ) -> Iterable[MeasurementSummary]:
-    measurements = info.context["flag_measurements"].get(flag.pk, [])
-    if len(measurements) == 0:
-        return []
-    return fill_sparse_measurements(measurements, interval, after, before)
+    # the measurements of all the repository's flags are filled at once on the
+    # first call
+    key = ("filled_flag_measurements", flag.repository_id, interval, after, before)
+    if key not in info.context:
+        info.context[key] = fill_sparse_measurements_by_key(
+            info.context["flag_measurements"], interval, after, before
+        )
+    measurements = info.context[key].get(flag.pk, [])
+    return downsample(measurements, max_points)
@@ -17,6 +17,8 @@ from graphql_api.helpers.connection import (
     build_connection_graphql,
     queryset_to_connection,
 )
+from graphql_api.helpers.lookahead import prune_columns
+from graphql_api.helpers.measurements import downsample
 from graphql_api.types.enums import OrderingDirection, RepositoryOrdering
 from graphql_api.types.errors.errors import NotFoundError, OwnerNotActivatedError
 from plan.constants import FREE_PLAN_REPRESENTATIONS, PlanData, PlanName
@@ -29,6 +31,14 @@ owner = ariadne_load_local_graphql(__file__, "owner.graphql")
 owner = owner + build_connection_graphql("RepositoryConnection", "Repository")
 owner_bindable = ObjectType("Owner")
 
+# wide columns of the repositories and the fields needing them
+REPOSITORY_COLUMNS = {
+    "yaml": ("yaml", "repositoryConfig", "criticalFiles"),
+}
+REPOSITORY_RELATIONS = {
+    "bot": ("bot",),
+}
+
 
 @owner_bindable.field("repositories")
 @convert_kwargs_to_snake_case
@@ -42,6 +52,13 @@ def resolve_repositories(
 ):
     current_owner = info.context["request"].current_owner
     queryset = list_repository_for_owner(current_owner, owner, filters)
+    queryset = prune_columns(
+        queryset,
+        info,
+        ("edges", "node"),
+        columns=REPOSITORY_COLUMNS,
+        related=REPOSITORY_RELATIONS,
+    )
     return queryset_to_connection(
         queryset,
         ordering=(ordering, RepositoryOrdering.ID),
@@ -148,6 +165,7 @@ def resolve_org_default_org_username(owner: Owner, info, **kwargs) -> int:
 
 
 @owner_bindable.field("measurements")
+@convert_kwargs_to_snake_case
 @sync_to_async
 def resolve_measurements(
     owner: Owner,
@@ -156,6 +174,7 @@ def resolve_measurements(
     after: Optional[datetime] = None,
     before: Optional[datetime] = None,
     repos: Optional[List[str]] = None,
+    max_points: Optional[int] = None,
 ) -> Iterable[MeasurementSummary]:
     current_owner = info.context["request"].current_owner
 
@@ -165,18 +184,20 @@ def resolve_measurements(
     else:
         repo_ids = queryset.filter(name__in=repos).values_list("pk", flat=True)
 
-    return fill_sparse_measurements(
+    measurements = fill_sparse_measurements(
         timeseries_helpers.owner_coverage_measurements_with_fallback(
             owner,
             list(repo_ids),
             interval,
             start_date=after,
             end_date=before,
+            cached=True,
         ),
         interval,
         start_date=after,
         end_date=before,
     )
+    return downsample(measurements, max_points)
 
 
 @owner_bindable.field("isCurrentUserActivated")
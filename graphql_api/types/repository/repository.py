@@ -11,18 +11,24 @@ from codecov.db import sync_to_async
 from core.models import Repository
 from graphql_api.actions.commits import repo_commits
 from graphql_api.actions.flags import flag_measurements, flags_for_repo
+from graphql_api.dataloader.branch import BranchLoader
 from graphql_api.dataloader.commit import CommitLoader
+from graphql_api.dataloader.flag import FlagCountLoader, FlagCoverageDatasetLoader
 from graphql_api.dataloader.owner import OwnerLoader
+from graphql_api.dataloader.pull import PullLoader
 from graphql_api.helpers.connection import (
+    CachedCount,
+    EstimatedCount,
     queryset_to_connection,
     queryset_to_connection_sync,
 )
-from graphql_api.helpers.lookahead import lookahead
+from graphql_api.helpers.lookahead import lookahead, prune_columns
+from graphql_api.helpers.measurements import downsample
 from graphql_api.types.enums import OrderingDirection
 from graphql_api.types.errors.errors import NotFoundError, OwnerNotActivatedError
 from services.profiling import CriticalFile, ProfilingSummary
 from timeseries.helpers import fill_sparse_measurements
-from timeseries.models import Dataset, Interval, MeasurementName, MeasurementSummary
+from timeseries.models import Interval, MeasurementSummary
 
 repository_bindable = ObjectType("Repository")
 
@@ -34,6 +40,32 @@ repository_bindable.set_alias("updatedAt", "updatestamp")
 # see with_cache_latest_commit_at() from core/managers.py
 repository_bindable.set_alias("latestCommitAt", "true_latest_commit_at")
 
+# wide columns of the commits and the fields needing them (`_report` is never
+# fetched by `repo_commits`)
+COMMIT_COLUMNS = {
+    "message": ("message",),
+    "totals": (
+        "totals",
+        "coverageFile",
+        "flagNames",
+        "pathContents",
+        "components",
+        "criticalFiles",
+        "compareWithParent",
+    ),
+}
+
+# wide columns of the pulls which aren't needed by any field
+PULL_COLUMNS = {
+    "diff": (),
+    "_flare": (),
+}
+
+# counting all the commits or pulls of a large repo is slow, and clients page
+# through them for a while so a slightly stale commit count is fine
+COMMITS_COUNT = CachedCount(ttl=60, strategy=EstimatedCount())
+PULLS_COUNT = EstimatedCount()
+
 
 @repository_bindable.field("oldestCommitAt")
 def resolve_oldest_commit_at(repository: Repository, info):
@@ -70,8 +102,7 @@ def resolve_lines(repository: Repository, info) -> Optional[int]:
 
 @repository_bindable.field("branch")
 def resolve_branch(repository, info, name):
-    command = info.context["executor"].get_command("branch")
-    return command.fetch_branch(repository, name)
+    return BranchLoader.loader(info).load((repository.pk, name))
 
 
 @repository_bindable.field("author")
@@ -93,8 +124,7 @@ def resolve_upload_token(repository, info):
 
 @repository_bindable.field("pull")
 def resolve_pull(repository, info, id):
-    command = info.context["executor"].get_command("pull")
-    return command.fetch_pull_request(repository, id)
+    return PullLoader.loader(info).load((repository.pk, id))
 
 
 @repository_bindable.field("pulls")
@@ -104,10 +134,12 @@ async def resolve_pulls(
 ):
     command = info.context["executor"].get_command("pull")
     queryset = await command.fetch_pull_requests(repository, filters)
+    queryset = prune_columns(queryset, info, ("edges", "node"), columns=PULL_COLUMNS)
     return await queryset_to_connection(
         queryset,
         ordering=("pullid",),
         ordering_direction=ordering_direction,
+        count_strategy=PULLS_COUNT,
         **kwargs,
     )
 
@@ -116,18 +148,22 @@ async def resolve_pulls(
 @convert_kwargs_to_snake_case
 async def resolve_commits(repository, info, filters=None, **kwargs):
     queryset = await sync_to_async(repo_commits)(repository, filters)
+    queryset = prune_columns(queryset, info, ("edges", "node"), columns=COMMIT_COLUMNS)
     connection = await queryset_to_connection(
         queryset,
         ordering=("timestamp",),
         ordering_direction=OrderingDirection.DESC,
+        count_strategy=COMMITS_COUNT,
         **kwargs,
     )
 
     for edge in connection.edges:
         commit = edge["node"]
-        # cache all resulting commits in dataloader
-        loader = CommitLoader.loader(info, repository.repoid)
-        loader.cache(commit)
+        # cache all resulting commits in dataloader, unless some of their columns
+        # weren't fetched (other fields could select them through the dataloader)
+        if commit.get_deferred_fields() <= {"_report"}:
+            loader = CommitLoader.loader(info, repository.repoid)
+            loader.cache(commit)
 
     return connection
 
@@ -249,34 +285,25 @@ def resolve_active(repository: Repository, info) -> bool:
 
 
 @repository_bindable.field("flagsCount")
-@sync_to_async
 def resolve_flags_count(repository: Repository, info) -> int:
-    return repository.flags.filter(deleted__isnot=True).count()
+    return FlagCountLoader.loader(info).load(repository.pk)
 
 
 @repository_bindable.field("flagsMeasurementsActive")
-@sync_to_async
-def resolve_flags_measurements_active(repository: Repository, info) -> bool:
+async def resolve_flags_measurements_active(repository: Repository, info) -> bool:
     if not settings.TIMESERIES_ENABLED:
         return False
 
-    return Dataset.objects.filter(
-        name=MeasurementName.FLAG_COVERAGE.value,
-        repository_id=repository.pk,
-    ).exists()
+    dataset = await FlagCoverageDatasetLoader.loader(info).load(repository.pk)
+    return dataset is not None
 
 
 @repository_bindable.field("flagsMeasurementsBackfilled")
-@sync_to_async
-def resolve_flags_measurements_backfilled(repository: Repository, info) -> bool:
+async def resolve_flags_measurements_backfilled(repository: Repository, info) -> bool:
     if not settings.TIMESERIES_ENABLED:
         return False
 
-    dataset = Dataset.objects.filter(
-        name=MeasurementName.FLAG_COVERAGE.value,
-        repository_id=repository.pk,
-    ).first()
-
+    dataset = await FlagCoverageDatasetLoader.loader(info).load(repository.pk)
     if not dataset:
         return False
 
@@ -284,6 +311,7 @@ def resolve_flags_measurements_backfilled(repository: Repository, info) -> bool:
 
 
 @repository_bindable.field("measurements")
+@convert_kwargs_to_snake_case
 @sync_to_async
 def resolve_measurements(
     repository: Repository,
@@ -292,19 +320,22 @@ def resolve_measurements(
     before: Optional[datetime] = None,
     after: Optional[datetime] = None,
     branch: Optional[str] = None,
+    max_points: Optional[int] = None,
 ) -> Iterable[MeasurementSummary]:
-    return fill_sparse_measurements(
+    measurements = fill_sparse_measurements(
         timeseries_helpers.repository_coverage_measurements_with_fallback(
             repository,
             interval,
             start_date=after,
             end_date=before,
             branch=branch,
+            cached=True,
         ),
         interval,
         start_date=after,
         end_date=before,
     )
+    return downsample(measurements, max_points)
 
 
 @repository_bindable.field("repositoryConfig")
@@ -1,6 +1,6 @@
-from django.urls import re_path
+from django.urls import path, re_path
 
-from .views import ariadne_view
+from .views import ariadne_view, resolver_profiles_view
 
 ALLOWED_SERVICES = [
     "gh",
@@ -20,5 +20,6 @@ ALLOWED_SERVICES = [
 service_regex = "|".join(ALLOWED_SERVICES)
 
 urlpatterns = [
+    path("profiles", resolver_profiles_view, name="graphql-profiles"),
     re_path(r"^(?P<service>({}))$".format(service_regex), ariadne_view, name="graphql"),
 ]
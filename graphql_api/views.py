@@ -1,19 +1,39 @@
-import json
+import hashlib
 import logging
 import socket
 from asyncio import iscoroutine
+from contextlib import nullcontext
+from inspect import isawaitable
 
 from ariadne import format_error
+from ariadne.exceptions import HttpBadRequestError
+from ariadne.extensions import ExtensionManager
+from ariadne.graphql import handle_graphql_errors, handle_query_result, validate_data
 from ariadne_django.views import GraphQLAsyncView
 from django.conf import settings
-from django.http import HttpResponseNotAllowed
+from django.http import (
+    HttpResponseBadRequest,
+    HttpResponseForbidden,
+    HttpResponseNotAllowed,
+    JsonResponse,
+)
+from django.views.decorators.http import require_GET
+from graphql import GraphQLError, execute, validate
 from sentry_sdk import capture_exception
 
 from codecov.commands.exceptions import BaseException
 from codecov.commands.executor import get_executor_from_request
-from codecov.db import sync_to_async
+from codecov.db import batching_thread_hops, sync_to_async
 from services import ServiceException
 
+from .cost import QueryCostExtension, query_cost_validator
+from .documents import (
+    PersistedQueryNotFound,
+    get_persisted_query,
+    parse_and_validate,
+    persist_query,
+)
+from .profiler import ResolverProfilerExtension, get_profiles
 from .schema import schema
 
 log = logging.getLogger(__name__)
@@ -21,7 +41,7 @@ log = logging.getLogger(__name__)
 
 class AsyncGraphqlView(GraphQLAsyncView):
     schema = schema
-    extensions = []
+    extensions = [QueryCostExtension, ResolverProfilerExtension]
 
     async def get(self, *args, **kwargs):
         if settings.GRAPHQL_PLAYGROUND:
@@ -32,24 +52,121 @@ class AsyncGraphqlView(GraphQLAsyncView):
     async def post(self, request, *args, **kwargs):
         await self._get_user(request)
 
-        # get request body information
-        req_body = json.loads(request.body.decode("utf-8")) if request.body else {}
-
-        # clean up graphql query to remove new lines and extra spaces
-        req_body["query"] = req_body["query"].replace("\n", " ")
-        req_body["query"] = req_body["query"].replace("  ", "").strip()
+        try:
+            data = self.extract_data_from_request(request)
+        except HttpBadRequestError as error:
+            return HttpResponseBadRequest(error.message)
+
+        query_hash = None
+        persisted_query = (
+            data.get("extensions", {}).get("persistedQuery")
+            if isinstance(data, dict) and isinstance(data.get("extensions"), dict)
+            else None
+        )
+        if persisted_query:
+            # automatic persisted queries: clients send the hash of the query
+            # and only send the query itself when it isn't known yet
+            query_hash = persisted_query.get("sha256Hash")
+            if persisted_query.get("version") != 1 or not isinstance(query_hash, str):
+                return HttpResponseBadRequest("Unsupported persisted query")
+            if data.get("query"):
+                if (
+                    not isinstance(data["query"], str)
+                    or hashlib.sha256(data["query"].encode()).hexdigest() != query_hash
+                ):
+                    return HttpResponseBadRequest("provided sha does not match query")
+                persist_query(query_hash, data["query"])
+            else:
+                try:
+                    data["query"] = get_persisted_query(query_hash)
+                except PersistedQueryNotFound:
+                    return JsonResponse(
+                        {
+                            "errors": [
+                                {
+                                    "message": "PersistedQueryNotFound",
+                                    "extensions": {"code": "PERSISTED_QUERY_NOT_FOUND"},
+                                }
+                            ]
+                        }
+                    )
 
         # put everything together for log
         log_data = {
             "server_hostname": socket.gethostname(),
             "request_method": request.method,
             "request_path": request.get_full_path(),
-            "request_body": req_body,
+            "request_body": {
+                "operationName": data.get("operationName"),
+                "variables": data.get("variables"),
+                "queryHash": query_hash,
+            }
+            if isinstance(data, dict)
+            else data,
         }
         log.info("GraphQL Request", extra=log_data)
 
-        # request.user = await get_user(request) or AnonymousUser()
-        return await super().post(request, *args, **kwargs)
+        success, result = await self.execute_query(request, data)
+        return JsonResponse(result, status=200 if success else 400)
+
+    async def execute_query(self, request, data):
+        """
+        Same as `ariadne.graphql`, except that the documents of the queries are
+        parsed and validated against the GraphQL spec only once (see
+        `parse_and_validate`): only the request-dependent validation rules are
+        run for every request.
+        """
+        context_value = self.get_context_for_request(request)
+        extension_manager = ExtensionManager(
+            self.get_extensions_for_request(request, context_value), context_value
+        )
+        error_kwargs = dict(
+            logger=self.logger,
+            error_formatter=self.error_formatter,
+            debug=settings.DEBUG,
+            extension_manager=extension_manager,
+        )
+
+        with extension_manager.request():
+            try:
+                validate_data(data)
+                document, errors = parse_and_validate(
+                    self.schema, data["query"], self.introspection
+                )
+                if not errors:
+                    errors = validate(
+                        self.schema,
+                        document,
+                        self.validation_rules(context_value, document, data),
+                    )
+                if errors:
+                    return handle_graphql_errors(errors, **error_kwargs)
+
+                # the sync resolvers of the fields resolved together are run
+                # with a single `sync_to_async` hop
+                batching = (
+                    batching_thread_hops()
+                    if settings.GRAPHQL_BATCH_THREAD_HOPS
+                    else nullcontext()
+                )
+                with batching:
+                    result = execute(
+                        self.schema,
+                        document,
+                        root_value=self.root_value,
+                        context_value=context_value,
+                        variable_values=data.get("variables"),
+                        operation_name=data.get("operationName"),
+                        middleware=extension_manager.as_middleware_manager(
+                            self.middleware
+                        ),
+                    )
+                    if isawaitable(result):
+                        result = await result
+            except GraphQLError as error:
+                return handle_graphql_errors([error], **error_kwargs)
+
+            return handle_query_result(result, **error_kwargs)
 
     def context_value(self, request):
         return {
@@ -58,6 +175,9 @@ class AsyncGraphqlView(GraphQLAsyncView):
             "executor": get_executor_from_request(request),
         }
 
+    def validation_rules(self, context_value, document, data):
+        return [query_cost_validator(context_value, data)]
+
     def error_formatter(self, error, debug=False):
         # the only wat to check for a malformatted query
         is_bad_query = "Cannot query field" in error.formatted["message"]
@@ -101,3 +221,14 @@ async def ariadne_view(request, service):
 
 
 ariadne_view.csrf_exempt = True
+
+
+@require_GET
+def resolver_profiles_view(request):
+    """
+    Internal endpoint exposing the profiles of the resolvers of the sampled
+    operations (see `ResolverProfilerExtension`) to staff users.
+    """
+    if not request.user.is_authenticated or not request.user.is_staff:
+        return HttpResponseForbidden()
+    return JsonResponse(get_profiles())
@@ -11,6 +11,7 @@ from minio import Minio
 from shared.utils.ReportEncoder import ReportEncoder
 
 from services.storage import StorageService
+from utils import counters
 from utils.config import get_config
 
 log = logging.getLogger(__name__)
@@ -176,6 +177,8 @@ class ArchiveService(object):
 
     """
     Convenience write method, writes a raw upload to a destination.
+    `data` can also be a file-like object, which is then streamed to storage
+    instead of being read in memory.
     Returns the path it writes.
     """
 
@@ -192,7 +195,15 @@ class ArchiveService(object):
             )
         )
 
-        self.write_file(path, data, gzipped=gzipped)
+        if hasattr(data, "read"):
+            self.storage.write_file_stream(
+                self.root,
+                path,
+                data,
+                content_encoding="gzip" if gzipped else None,
+            )
+        else:
+            self.write_file(path, data, gzipped=gzipped)
 
         return path
 
@@ -213,6 +224,7 @@ class ArchiveService(object):
     """
 
     def read_file(self, path):
+        counters.record("storage_reads")
         contents = self.storage.read_file(self.root, path)
         return contents.decode()
 
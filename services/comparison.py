@@ -4,15 +4,16 @@ import functools
 import json
 import logging
 from collections import Counter
-from dataclasses import dataclass, field
+from dataclasses import astuple, dataclass, field
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 import minio
 import pytz
 from asgiref.sync import async_to_sync
 from django.db.models import Prefetch
 from django.utils.functional import cached_property
+from redis.exceptions import RedisError
 from shared.helpers.yaml import walk
 from shared.reports.types import ReportTotals
 from shared.utils.merge import LineType, line_type
@@ -35,6 +36,10 @@ redis = get_redis_connection()
 
 MAX_DIFF_SIZE = 170
 
+# how long the data of the files of a stored comparison is cached by file
+# (see `ComparisonReport`)
+COMPARISON_FILES_CACHE_TTL = 3600
+
 
 def _is_added(line_value):
     return line_value and line_value[0] == "+"
@@ -954,30 +959,149 @@ class ImpactedFile:
         return parts[-1]
 
 
+def _coverage(totals: dict) -> Optional[float]:
+    # same as `ImpactedFile.Totals.coverage`
+    hits = totals.get("hits", 0)
+    lines = hits + totals.get("misses", 0) + totals.get("partials", 0)
+    return (100 * hits / lines) if lines > 0 else None
+
+
+@dataclass(frozen=True)
+class ImpactedFileSummary:
+    """
+    Compact record of an impacted file holding the values impacted files are
+    filtered and sorted by, computed from the comparison data without building
+    the whole `ImpactedFile` (see `ComparisonReport.impacted_file_at`).
+    """
+
+    position: int  # index of the file in the comparison data
+    head_name: Optional[str]
+    file_name: Optional[str]
+    head_coverage: Optional[float]
+    patch_coverage: Optional[float]
+    change_coverage: Optional[float]
+    misses_count: int
+    has_diff: bool
+    has_changes: bool
+
+    @classmethod
+    def create(cls, position: int, data: dict) -> "ImpactedFileSummary":
+        head_name = data.get("head_name")
+        base_coverage = data.get("base_coverage")
+        head_coverage = data.get("head_coverage")
+        added_diff_coverage = data.get("added_diff_coverage") or []
+        unexpected_line_changes = data.get("unexpected_line_changes") or []
+
+        base_coverage = _coverage(base_coverage) if base_coverage else None
+        head_coverage = _coverage(head_coverage) if head_coverage else None
+        patch_coverage = None
+        if added_diff_coverage:
+            patch_coverage = _coverage(
+                Counter(
+                    {"h": "hits", "m": "misses", "p": "partials"}.get(coverage)
+                    for _, coverage in added_diff_coverage
+                )
+            )
+
+        return cls(
+            position=position,
+            head_name=head_name,
+            file_name=head_name.split("/")[-1] if head_name else None,
+            head_coverage=head_coverage,
+            patch_coverage=patch_coverage,
+            change_coverage=float(head_coverage - base_coverage)
+            if base_coverage and head_coverage
+            else None,
+            misses_count=sum(
+                1 for _, coverage in added_diff_coverage if coverage == "m"
+            )
+            + sum(1 for _, (_, coverage) in unexpected_line_changes if coverage == "m"),
+            has_diff=bool(
+                added_diff_coverage
+                or data.get("removed_diff_coverage")
+                or data.get("file_was_added_by_diff")
+                or data.get("file_was_removed_by_diff")
+            ),
+            has_changes=bool(unexpected_line_changes),
+        )
+
+
 @dataclass
 class ComparisonReport(object):
     """
     This is a wrapper around the data computed by the worker's commit comparison task.
     The raw data is stored in blob storage and accessible via the `report_storage_path`
-    on a `CommitComparison`
+    on a `CommitComparison`.  Once fetched, it's cached by file in Redis so that
+    the impacted files can be listed, or looked up individually, without
+    fetching and parsing all of it again.
     """
 
     commit_comparison: CommitComparison = None
 
     @cached_property
-    def files(self) -> List[ImpactedFile]:
+    def _files_data(self) -> List[dict]:
         if not self.commit_comparison.report_storage_path:
             return []
 
         comparison_data = self._fetch_raw_comparison_data()
-        return [
-            ImpactedFile.create(**data) for data in comparison_data.get("files", [])
+        return comparison_data.get("files", [])
+
+    @cached_property
+    def _impacted_files(self) -> Dict[int, ImpactedFile]:
+        return {}
+
+    def impacted_file_at(self, position: int) -> ImpactedFile:
+        """
+        Returns the impacted file at the given position of the comparison data
+        (see `ImpactedFileSummary.position`).
+        """
+        return self.impacted_files_at([position])[0]
+
+    def impacted_files_at(self, positions: List[int]) -> List[ImpactedFile]:
+        missing = [
+            position for position in positions if position not in self._impacted_files
+        ]
+        if missing:
+            for position, data in zip(missing, self._files_data_at(missing)):
+                self._impacted_files[position] = ImpactedFile.create(**data)
+        return [self._impacted_files[position] for position in positions]
+
+    @cached_property
+    def file_summaries(self) -> List[ImpactedFileSummary]:
+        if not self.commit_comparison.report_storage_path:
+            return []
+
+        if "_files_data" not in self.__dict__:
+            [summaries] = self._read_cache("summaries")
+            if summaries is not None:
+                return [
+                    ImpactedFileSummary(*values) for values in json.loads(summaries)
+                ]
+
+        summaries = [
+            ImpactedFileSummary.create(position, data)
+            for position, data in enumerate(self._files_data)
         ]
+        if summaries:
+            self._write_cache(summaries)
+        return summaries
+
+    @cached_property
+    def files(self) -> List[ImpactedFile]:
+        return self.impacted_files_at([file.position for file in self.file_summaries])
 
     def impacted_file(self, path: str) -> Optional[ImpactedFile]:
-        for file in self.files:
+        if not self.commit_comparison.report_storage_path:
+            return None
+
+        if "file_summaries" not in self.__dict__ and "_files_data" not in self.__dict__:
+            [position] = self._read_cache(f"path/{path}")
+            if position is not None:
+                return self.impacted_file_at(int(position))
+
+        for file in self.file_summaries:
             if file.head_name == path:
-                return file
+                return self.impacted_file_at(file.position)
 
     @cached_property
     def impacted_files(self) -> List[ImpactedFile]:
@@ -985,11 +1109,65 @@ class ComparisonReport(object):
 
     @cached_property
     def impacted_files_with_unintended_changes(self) -> List[ImpactedFile]:
-        return [file for file in self.files if file.has_changes]
+        return [
+            self.impacted_file_at(file.position)
+            for file in self.file_summaries
+            if file.has_changes
+        ]
 
     @cached_property
     def impacted_files_with_direct_changes(self) -> List[ImpactedFile]:
-        return [file for file in self.files if file.has_diff]
+        return [
+            self.impacted_file_at(file.position)
+            for file in self.file_summaries
+            if file.has_diff
+        ]
+
+    @cached_property
+    def _cache_key(self) -> str:
+        return "/".join(
+            (
+                "comparison_files",
+                str(self.commit_comparison.pk),
+                # the comparison may be computed again
+                str(self.commit_comparison.updated_at.timestamp()),
+            )
+        )
+
+    def _read_cache(self, *fields: str) -> List[Optional[bytes]]:
+        try:
+            return get_redis_connection().hmget(self._cache_key, fields)
+        except RedisError:
+            log.warning("ComparisonReport - couldn't read cached files", exc_info=True)
+            return [None] * len(fields)
+
+    def _write_cache(self, summaries: List[ImpactedFileSummary]) -> None:
+        """
+        Caches the comparison data by file so that the next requests don't
+        need to fetch and parse all of it: the summaries of the files, the data
+        of each file by position and the positions of the files by path.
+        """
+        mapping = {"summaries": json.dumps([astuple(file) for file in summaries])}
+        for file in summaries:
+            mapping[f"file/{file.position}"] = json.dumps(
+                self._files_data[file.position]
+            )
+            if file.head_name is not None:
+                mapping[f"path/{file.head_name}"] = file.position
+        try:
+            pipeline = get_redis_connection().pipeline()
+            pipeline.hset(self._cache_key, mapping=mapping)
+            pipeline.expire(self._cache_key, COMPARISON_FILES_CACHE_TTL)
+            pipeline.execute()
+        except RedisError:
+            log.warning("ComparisonReport - couldn't cache files", exc_info=True)
+
+    def _files_data_at(self, positions: List[int]) -> List[dict]:
+        if "_files_data" not in self.__dict__:
+            cached = self._read_cache(*(f"file/{position}" for position in positions))
+            if all(data is not None for data in cached):
+                return [json.loads(data) for data in cached]
+        return [self._files_data[position] for position in positions]
 
     def _fetch_raw_comparison_data(self) -> dict:
         """
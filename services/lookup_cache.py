@@ -0,0 +1,209 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Generic, Iterable, Optional, Set, Tuple, Type, TypeVar
+
+from django.conf import settings
+from django.db import router, transaction
+from django.db.models import Model, QuerySet
+from django.db.models.signals import post_delete, post_save
+from redis.exceptions import RedisError
+
+from codecov_auth.models import Owner
+from core.models import Repository
+from services.redis_configuration import get_redis_connection
+
+log = logging.getLogger(__name__)
+
+# number of instances kept in memory by each process
+LOCAL_CACHE_SIZE = 1024
+# how long an instance is kept in memory: other processes' writes are only
+# seen once it expired
+LOCAL_CACHE_TTL = 5
+# how long an instance is kept in Redis
+REDIS_CACHE_TTL = 30
+
+M = TypeVar("M", bound=Model)
+
+
+class LookupCache(Generic[M]):
+    """
+    Caches the `model` instances looked up by one of the given sets of fields
+    (e.g. an owner by `service` and `username`) so that the identities resolved
+    by almost every request don't need to be fetched from Postgres every time.
+
+    The field values of the instances are cached as they were read, as JSON:
+    in memory for `LOCAL_CACHE_TTL` seconds and in Redis for `REDIS_CACHE_TTL`
+    seconds.  They're invalidated once the transaction saving or deleting an
+    instance is committed (writes that don't send signals, like
+    `QuerySet.update`, need to call `invalidate`) and each lookup returns a
+    fresh instance, which can safely be modified.  Missing instances aren't
+    cached.
+
+    When an instance returned by the cache is saved, the keys it was looked up
+    with are invalidated as well, in case one of its lookup fields changed
+    (e.g. a renamed owner).  Other instances only invalidate their current
+    keys, so the previous ones expire after `REDIS_CACHE_TTL` seconds.
+
+    String values are compared case-insensitively, like the `citext` columns
+    the instances are looked up by.
+    """
+
+    def __init__(self, model: Type[M], lookups: Iterable[Tuple[str, ...]]):
+        self.model = model
+        self.lookups = [tuple(sorted(fields)) for fields in lookups]
+        self._local: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        post_save.connect(self._invalidate, sender=model, weak=False)
+        post_delete.connect(self._invalidate, sender=model, weak=False)
+
+    def get(self, **lookup) -> Optional[M]:
+        fields = tuple(sorted(lookup))
+        if fields not in self.lookups:
+            raise ValueError(f"{self.model.__name__} isn't cached by {fields}")
+
+        if not settings.LOOKUP_CACHE_ENABLED:
+            return self.model.objects.filter(**lookup).first()
+
+        key = self._key(lookup)
+        data = self._get_local(key)
+        if data is None:
+            try:
+                data = get_redis_connection().get(key)
+            except RedisError:
+                log.warning("Unable to read cached instance", exc_info=True)
+            if data is not None:
+                data = data.decode() if isinstance(data, bytes) else data
+                self._set_local(key, data)
+        if data is not None:
+            return self._load(data)
+
+        instance = self.model.objects.filter(**lookup).first()
+        if instance is not None:
+            data = self._dump(instance)
+            self._set_local(key, data)
+            try:
+                get_redis_connection().set(key, data, ex=REDIS_CACHE_TTL)
+            except RedisError:
+                log.warning("Unable to cache instance", exc_info=True)
+            instance._lookup_cache_keys = self._instance_keys(instance)
+        return instance
+
+    def invalidate(self, queryset: "QuerySet[M]") -> None:
+        """
+        Invalidates the instances matching `queryset` once the current
+        transaction is committed, for writes that don't send signals.  It must
+        be called before the write, in the same transaction, in case the write
+        changes what the queryset matches.
+        """
+        if not settings.LOOKUP_CACHE_ENABLED:
+            return
+
+        fields = {field for lookup in self.lookups for field in lookup}
+        keys = set()
+        for values in queryset.values(*fields).iterator():
+            keys |= self._keys(values)
+        if keys:
+            transaction.on_commit(lambda: self._delete(keys), using=queryset.db)
+
+    def clear_local(self) -> None:
+        with self._lock:
+            self._local.clear()
+
+    def _key(self, lookup: dict) -> str:
+        values = "/".join(
+            f"{field}={str(lookup[field]).lower()}" for field in sorted(lookup)
+        )
+        return f"lookup_cache/{self.model._meta.label_lower}/{values}"
+
+    def _instance_keys(self, instance: M) -> Set[str]:
+        return self._keys({**instance.__dict__, "pk": instance.pk})
+
+    def _keys(self, values: dict) -> Set[str]:
+        keys = set()
+        for fields in self.lookups:
+            lookup = {field: values[field] for field in fields if field in values}
+            # deferred fields aren't loaded just to compute the keys
+            if len(lookup) == len(fields):
+                keys.add(self._key(lookup))
+        return keys
+
+    def _dump(self, instance: M) -> str:
+        # like Django's serializers: values of JSON types are kept as they are
+        # and the others are converted to strings, which `Field.to_python`
+        # converts back.  Deferred fields aren't loaded just to be cached
+        values = {}
+        for field in self.model._meta.concrete_fields:
+            if field.attname in instance.__dict__:
+                value = field.value_from_object(instance)
+                if value is not None:
+                    value = field.value_to_string(instance)
+                values[field.attname] = value
+        return json.dumps(values)
+
+    def _load(self, data: str) -> M:
+        values = json.loads(data)
+        fields = [
+            field
+            for field in self.model._meta.concrete_fields
+            if field.attname in values
+        ]
+        instance = self.model.from_db(
+            router.db_for_read(self.model),
+            [field.attname for field in fields],
+            [field.to_python(values[field.attname]) for field in fields],
+        )
+        instance._lookup_cache_keys = self._instance_keys(instance)
+        return instance
+
+    def _get_local(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            expires_at, data = entry
+            if expires_at < time.monotonic():
+                del self._local[key]
+                return None
+            self._local.move_to_end(key)
+            return data
+
+    def _set_local(self, key: str, data: str) -> None:
+        with self._lock:
+            self._local[key] = (time.monotonic() + LOCAL_CACHE_TTL, data)
+            self._local.move_to_end(key)
+            while len(self._local) > LOCAL_CACHE_SIZE:
+                self._local.popitem(last=False)
+
+    def _invalidate(self, sender, instance: M, using: str, **kwargs):
+        if not settings.LOOKUP_CACHE_ENABLED:
+            return
+
+        keys = self._instance_keys(instance) | instance.__dict__.pop(
+            "_lookup_cache_keys", set()
+        )
+        if instance.pk is not None:
+            instance._lookup_cache_keys = self._instance_keys(instance)
+        if keys:
+            # deleted once committed, otherwise a concurrent lookup could cache
+            # the previous values again before they're replaced
+            transaction.on_commit(lambda: self._delete(keys), using=using)
+
+    def _delete(self, keys: Set[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._local.pop(key, None)
+        try:
+            get_redis_connection().delete(*keys)
+        except RedisError:
+            log.warning("Unable to invalidate cached instance", exc_info=True)
+
+
+owner_cache: LookupCache[Owner] = LookupCache(
+    Owner, lookups=[("pk",), ("service", "username")]
+)
+repository_cache: LookupCache[Repository] = LookupCache(
+    Repository, lookups=[("pk",), ("author_id", "name")]
+)
@@ -1,7 +1,43 @@
-from redis import Redis
+import threading
+import time
+from typing import Dict
+
+from redis import ConnectionPool, Redis
+from shared.metrics import metrics
 
 from utils.config import get_config
 
+# one connection pool per redis url, shared by every client of the process
+_connection_pools: Dict[str, ConnectionPool] = {}
+_connection_pools_lock = threading.Lock()
+
+# how often (at most) each pool reports how many of its connections are in use
+CONNECTIONS_IN_USE_GAUGE_INTERVAL = 10
+
+
+class InstrumentedConnectionPool(ConnectionPool):
+    """
+    Connection pool reporting how many connections it opened and how many
+    of them are currently checked out (sampled every
+    `CONNECTIONS_IN_USE_GAUGE_INTERVAL` seconds).
+    """
+
+    _gauge_in_use_at = 0.0
+
+    def make_connection(self):
+        metrics.incr("redis.pool.connections_created")
+        return super().make_connection()
+
+    def get_connection(self, command_name, *keys, **options):
+        connection = super().get_connection(command_name, *keys, **options)
+        now = time.monotonic()
+        if now >= self._gauge_in_use_at:
+            self._gauge_in_use_at = now + CONNECTIONS_IN_USE_GAUGE_INTERVAL
+            metrics.gauge(
+                "redis.pool.connections_in_use", len(self._in_use_connections)
+            )
+        return connection
+
 
 def get_redis_url() -> str:
     url = get_config("services", "redis_url")
@@ -17,5 +53,18 @@ def get_redis_connection() -> Redis:
     return _get_redis_instance_from_url(url)
 
 
+def _get_connection_pool(url) -> ConnectionPool:
+    with _connection_pools_lock:
+        if url not in _connection_pools:
+            _connection_pools[url] = InstrumentedConnectionPool.from_url(
+                url,
+                max_connections=get_config(
+                    "services", "redis", "max_connections", default=None
+                ),
+            )
+        return _connection_pools[url]
+
+
 def _get_redis_instance_from_url(url):
-    return Redis.from_url(url)
+    # clients are cheap, the connections are held (and reused) by the pool
+    return Redis(connection_pool=_get_connection_pool(url))
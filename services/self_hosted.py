@@ -9,6 +9,7 @@ from shared.license import get_current_license
 
 from codecov_auth.models import Owner
 from services import ServiceException
+from services.lookup_cache import owner_cache
 from utils.config import get_config
 
 
@@ -107,7 +108,9 @@ def activate_owner(owner: Owner):
             "No seats remaining. Please contact Codecov support or deactivate users."
         )
 
-    Owner.objects.filter(pk__in=owner.organizations).update(
+    organizations = Owner.objects.filter(pk__in=owner.organizations)
+    owner_cache.invalidate(organizations)
+    organizations.update(
         plan_activated_users=Func(
             owner.pk,
             function="array_append_unique",
@@ -116,6 +119,7 @@ def activate_owner(owner: Owner):
     )
 
 
+@transaction.atomic
 def deactivate_owner(owner: Owner):
     """
     Deactivate the given owner across ALL orgs.
@@ -125,13 +129,15 @@ def deactivate_owner(owner: Owner):
             "deactivate_owner is only available in self-hosted environments"
         )
 
-    Owner.objects.filter(
+    organizations = Owner.objects.filter(
         plan_activated_users__contains=Func(
             owner.pk,
             function="array",
             template="%(function)s[%(expressions)s]",
         )
-    ).update(
+    )
+    owner_cache.invalidate(organizations)
+    organizations.update(
         plan_activated_users=Func(
             owner.pk,
             function="array_remove",
@@ -140,6 +146,7 @@ def deactivate_owner(owner: Owner):
     )
 
 
+@transaction.atomic
 def enable_autoactivation():
     """
     Enable auto-activation for the entire instance.
@@ -147,9 +154,11 @@ def enable_autoactivation():
     There's no good place to store this instance-wide so we're just saving this
     for all owners.
     """
+    owner_cache.invalidate(Owner.objects.all())
     Owner.objects.all().update(plan_auto_activate=True)
 
 
+@transaction.atomic
 def disable_autoactivation():
     """
     Disable auto-activation for the entire instance.
@@ -157,6 +166,7 @@ def disable_autoactivation():
     There's no good place to store this instance-wide so we're just saving this
     for all owners.
     """
+    owner_cache.invalidate(Owner.objects.all())
     Owner.objects.all().update(plan_auto_activate=False)
 
 
@@ -10,6 +10,9 @@ log = logging.getLogger(__name__)
 
 MINIO_CLIENT = None
 
+# size of the parts streamed uploads are sent in, the minimum allowed by S3
+STREAM_PART_SIZE = 5 * 1024 * 1024
+
 
 # Service class for interfacing with codecov's underlying storage layer, minio
 class StorageService(MinioStorageService):
@@ -51,3 +54,20 @@ class StorageService(MinioStorageService):
     def create_presigned_get(self, bucket, path, expires):
         expires = timedelta(seconds=expires)
         return self.minio_client.presigned_get_object(bucket, path, expires)
+
+    def write_file_stream(self, bucket, path, stream, content_encoding=None):
+        """
+        Writes the contents of a file-like object to storage one part at a time,
+        so at most `STREAM_PART_SIZE` bytes of it are held in memory.
+        """
+        metadata = {"Content-Encoding": content_encoding} if content_encoding else None
+        return self.minio_client.put_object(
+            bucket,
+            path,
+            stream,
+            length=-1,
+            content_type="text/plain",
+            metadata=metadata,
+            part_size=STREAM_PART_SIZE,
+            num_parallel_uploads=1,
+        )
@@ -1,7 +1,7 @@
 import logging
 import os
 from datetime import datetime, timedelta
-from typing import Iterable, List
+from typing import Iterable, List, Tuple
 
 import celery
 import sentry_sdk
@@ -292,6 +292,37 @@ class TaskService(object):
             ),
         ).apply_async()
 
+    def backfill_dataset_chunks(
+        self,
+        dataset: Dataset,
+        chunks: Iterable[Tuple[datetime, datetime]],
+    ):
+        """
+        Backfills the dataset one chunk at a time, in the given order.
+        """
+        chunks = list(chunks)
+        log.info(
+            f"Triggering chunked dataset backfill",
+            extra=dict(
+                dataset_id=dataset.pk,
+                chunks=len(chunks),
+            ),
+        )
+
+        signatures = [
+            self._create_signature(
+                "app.tasks.timeseries.backfill_dataset",
+                kwargs=dict(
+                    dataset_id=dataset.pk,
+                    start_date=start_date.isoformat(),
+                    end_date=end_date.isoformat(),
+                ),
+            ).set(immutable=True)
+            for start_date, end_date in chunks
+        ]
+        if signatures:
+            chain(*signatures).apply_async()
+
     def delete_timeseries(self, repository_id: int):
         log.info(
             f"Delete repository timeseries data",
@@ -1,4 +1,5 @@
 import json
+import tracemalloc
 from pathlib import Path
 from time import time
 from unittest.mock import patch
@@ -8,6 +9,7 @@ from shared.storage import MinioStorageService
 
 from core.tests.factories import RepositoryFactory
 from services.archive import ArchiveService
+from services.storage import STREAM_PART_SIZE
 
 current_file = Path(__file__)
 
@@ -117,3 +119,87 @@ class TestWriteData(object):
             gzipped=False,
             reduced_redundancy=False,
         )
+
+
+class ZeroesStream(object):
+    """
+    File-like object producing `size` bytes without ever holding them all in memory.
+    """
+
+    def __init__(self, size):
+        self.remaining = size
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        self.remaining -= size
+        return b"0" * size
+
+
+class TestWriteRawUpload(object):
+    def test_write_raw_upload_bytes(self, mocker, db):
+        repo = RepositoryFactory()
+        mock_write_file = mocker.patch.object(MinioStorageService, "write_file")
+        archive_service = ArchiveService(repository=repo)
+
+        path = archive_service.write_raw_upload("abc", "report", b"data")
+
+        assert path.endswith(f"/{archive_service.storage_hash}/abc/report.txt")
+        mock_write_file.assert_called_with(
+            archive_service.root,
+            path,
+            b"data",
+            gzipped=False,
+            reduced_redundancy=False,
+        )
+
+    def test_write_raw_upload_stream_gzipped(self, mocker, db):
+        repo = RepositoryFactory()
+        archive_service = ArchiveService(repository=repo)
+        mock_put_object = mocker.patch.object(
+            archive_service.storage.minio_client, "put_object"
+        )
+        stream = ZeroesStream(10)
+
+        path = archive_service.write_raw_upload("abc", "report", stream, gzipped=True)
+
+        mock_put_object.assert_called_with(
+            archive_service.root,
+            path,
+            stream,
+            length=-1,
+            content_type="text/plain",
+            metadata={"Content-Encoding": "gzip"},
+            part_size=STREAM_PART_SIZE,
+            num_parallel_uploads=1,
+        )
+
+    def test_write_raw_upload_stream_memory(self, mocker, db):
+        """
+        Streams a 100MB upload through the minio client (with the HTTP calls
+        mocked out) and checks that only a couple of parts are ever in memory.
+        """
+        repo = RepositoryFactory()
+        archive_service = ArchiveService(repository=repo)
+        minio_client = archive_service.storage.minio_client
+        mocker.patch.object(
+            minio_client, "_create_multipart_upload", return_value="upload-id"
+        )
+        # a plain function rather than a mock, so the parts aren't kept around
+        uploaded_parts = []
+        mocker.patch.object(
+            minio_client,
+            "_upload_part",
+            new=lambda *args: uploaded_parts.append(len(args[2])) or "etag",
+        )
+        mocker.patch.object(minio_client, "_complete_multipart_upload")
+        size = 100 * 1024 * 1024
+
+        tracemalloc.start()
+        archive_service.write_raw_upload("abc", "report", ZeroesStream(size))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert uploaded_parts == [STREAM_PART_SIZE] * 20
+        # vs. ~100MB when reading the whole request body
+        assert peak < 4 * STREAM_PART_SIZE
@@ -1637,6 +1637,10 @@ mocked_files_with_direct_and_indirect_changes = """
 
 
 class ComparisonReportTest(TestCase):
+    @pytest.fixture(autouse=True)
+    def inject_mock_redis(self, mock_redis):
+        self.redis = mock_redis
+
     def setUp(self):
         self.user = OwnerFactory(username="codecov-user")
         self.parent_commit = CommitFactory()
@@ -1685,6 +1689,52 @@ class ComparisonReportTest(TestCase):
         impacted_files = self.comparison_report.impacted_files_with_direct_changes
         assert [file.head_name for file in impacted_files] == ["fileA", "fileB"]
 
+    @patch("services.archive.ArchiveService.read_file")
+    def test_file_summaries(self, read_file):
+        read_file.return_value = mock_data_from_archive
+        summaries = self.comparison_report.file_summaries
+        assert [summary.position for summary in summaries] == [0, 1]
+        for summary in summaries:
+            file = self.comparison_report.impacted_file_at(summary.position)
+            assert summary.head_name == file.head_name
+            assert summary.file_name == file.file_name
+            assert summary.head_coverage == file.head_coverage.coverage
+            assert summary.patch_coverage == (
+                file.patch_coverage.coverage if file.patch_coverage else None
+            )
+            assert summary.change_coverage == file.change_coverage
+            assert summary.misses_count == file.misses_count
+            assert summary.has_diff == bool(file.has_diff)
+            assert summary.has_changes == bool(file.has_changes)
+
+        # impacted files are only built once
+        assert self.comparison_report.impacted_file_at(
+            1
+        ) is self.comparison_report.impacted_file("fileB")
+
+    @patch("services.archive.ArchiveService.read_file")
+    def test_files_cached_across_comparison_reports(self, read_file):
+        read_file.return_value = mock_data_from_archive
+        summaries = self.comparison_report.file_summaries
+        assert read_file.call_count == 1
+
+        # a single file is read from the cache
+        comparison_report = ComparisonReport(self.comparison)
+        assert comparison_report.impacted_file("fileB").head_name == "fileB"
+        assert comparison_report.impacted_file("missing") is None
+        assert comparison_report.file_summaries == summaries
+        assert [file.head_name for file in comparison_report.files] == [
+            "fileA",
+            "fileB",
+        ]
+        assert read_file.call_count == 1
+
+        # until the comparison is computed again
+        self.comparison.save()
+        comparison_report = ComparisonReport(self.comparison)
+        assert comparison_report.impacted_file("fileB").head_name == "fileB"
+        assert read_file.call_count == 2
+
     def test_file_has_diff(self):
         file = ImpactedFile(
             **{
@@ -0,0 +1,155 @@
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from redis.exceptions import ConnectionError
+
+from codecov_auth.models import Owner
+from core.tests.factories import OwnerFactory, RepositoryFactory
+from services.lookup_cache import owner_cache, repository_cache
+from services.self_hosted import enable_autoactivation
+
+
+@pytest.fixture(autouse=True)
+def lookup_cache(settings):
+    settings.LOOKUP_CACHE_ENABLED = True
+    owner_cache.clear_local()
+    repository_cache.clear_local()
+    yield
+    owner_cache.clear_local()
+    repository_cache.clear_local()
+
+
+def test_get_caches_instances(db, mock_redis):
+    owner = OwnerFactory.create(service="github", username="codecov")
+
+    with CaptureQueriesContext(connection) as queries:
+        first = owner_cache.get(service="github", username="codecov")
+        second = owner_cache.get(service="github", username="Codecov")
+    assert len(queries) == 1
+    assert first.pk == second.pk == owner.pk
+    # each lookup returns its own copy
+    assert first is not second
+
+    # other processes read it from Redis
+    owner_cache.clear_local()
+    with CaptureQueriesContext(connection) as queries:
+        assert owner_cache.get(service="github", username="codecov").pk == owner.pk
+    assert len(queries) == 0
+
+
+def test_get_missing_instance_is_not_cached(db, mock_redis):
+    assert repository_cache.get(author_id=1, name="missing") is None
+    assert mock_redis.keys("lookup_cache/*") == []
+
+
+def test_get_invalid_lookup(db, mock_redis):
+    with pytest.raises(ValueError):
+        owner_cache.get(username="codecov")
+
+
+def test_cached_as_json(db, mock_redis):
+    owner = OwnerFactory.create(
+        service="github", username="codecov", permission=[1, 2], staff=False
+    )
+    owner_cache.get(service="github", username="codecov")
+
+    (data,) = mock_redis.mget(mock_redis.keys("lookup_cache/*"))
+    assert json.loads(data)["username"] == "codecov"
+
+    owner_cache.clear_local()
+    cached = owner_cache.get(service="github", username="codecov")
+    assert cached.pk == owner.pk
+    assert cached.permission == [1, 2]
+    assert cached.staff is False
+    assert cached.createstamp == owner.createstamp
+    assert cached._state.adding is False
+
+
+def test_save_invalidates_instance(db, mock_redis, django_capture_on_commit_callbacks):
+    repository = RepositoryFactory.create(name="api", private=True)
+    cached = repository_cache.get(author_id=repository.author_id, name="api")
+    assert repository_cache.get(pk=repository.pk).private is True
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        cached.private = False
+        cached.save()
+        # the previous values are cached until the transaction is committed
+        assert repository_cache.get(pk=repository.pk).private is True
+
+    for callback in callbacks:
+        callback()
+    assert (
+        repository_cache.get(author_id=repository.author_id, name="api").private
+        is False
+    )
+    assert repository_cache.get(pk=repository.pk).private is False
+
+
+def test_rename_invalidates_previous_key(
+    db, mock_redis, django_capture_on_commit_callbacks
+):
+    owner = OwnerFactory.create(service="github", username="codecov")
+    cached = owner_cache.get(service="github", username="codecov")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        cached.username = "renamed"
+        cached.save()
+    assert owner_cache.get(service="github", username="codecov") is None
+    assert owner_cache.get(service="github", username="renamed").pk == owner.pk
+
+
+def test_delete_invalidates_instance(
+    db, mock_redis, django_capture_on_commit_callbacks
+):
+    owner = OwnerFactory.create()
+    assert owner_cache.get(pk=owner.pk) is not None
+
+    with django_capture_on_commit_callbacks(execute=True):
+        owner.delete()
+    assert owner_cache.get(pk=owner.pk) is None
+
+
+def test_invalidate_queryset(db, mock_redis, django_capture_on_commit_callbacks):
+    owner = OwnerFactory.create(service="github", username="codecov", staff=False)
+    owner_cache.get(pk=owner.pk)
+    owner_cache.get(service="github", username="codecov")
+
+    queryset = Owner.objects.filter(pk=owner.pk)
+    with django_capture_on_commit_callbacks(execute=True):
+        owner_cache.invalidate(queryset)
+        queryset.update(staff=True)
+    assert owner_cache.get(pk=owner.pk).staff is True
+    assert owner_cache.get(service="github", username="codecov").staff is True
+
+
+def test_bulk_updates_invalidate_instances(
+    db, mock_redis, django_capture_on_commit_callbacks
+):
+    owner = OwnerFactory.create(plan_auto_activate=False)
+    assert owner_cache.get(pk=owner.pk).plan_auto_activate is False
+
+    with django_capture_on_commit_callbacks(execute=True):
+        enable_autoactivation()
+    assert owner_cache.get(pk=owner.pk).plan_auto_activate is True
+
+
+def test_get_without_redis(db, mocker):
+    mocker.patch(
+        "services.lookup_cache.get_redis_connection", side_effect=ConnectionError
+    )
+    owner = OwnerFactory.create()
+    assert owner_cache.get(pk=owner.pk).pk == owner.pk
+    assert owner_cache.get(pk=owner.pk).pk == owner.pk
+
+
+def test_disabled(db, mock_redis, settings):
+    settings.LOOKUP_CACHE_ENABLED = False
+    owner = OwnerFactory.create()
+
+    with CaptureQueriesContext(connection) as queries:
+        owner_cache.get(pk=owner.pk)
+        owner_cache.get(pk=owner.pk)
+    assert len(queries) == 2
+    assert mock_redis.keys("lookup_cache/*") == []
@@ -1,9 +1,43 @@
-from services.redis_configuration import get_redis_connection
+from services.redis_configuration import (
+    InstrumentedConnectionPool,
+    _connection_pools,
+    get_redis_connection,
+)
 
 
 def test_get_redis_connection(mocker):
     mocker.patch("services.redis_configuration.get_config", return_value=None)
-    mocked = mocker.patch("services.redis_configuration.Redis.from_url")
+    mocker.patch.dict(_connection_pools, clear=True)
+    mocked = mocker.patch(
+        "services.redis_configuration.InstrumentedConnectionPool.from_url"
+    )
     res = get_redis_connection()
     assert res is not None
-    mocked.assert_called_with("redis://redis:6379")
+    mocked.assert_called_with("redis://redis:6379", max_connections=None)
+
+
+def test_get_redis_connection_shares_pool(mocker):
+    mocker.patch("services.redis_configuration.get_config", return_value=None)
+    mocker.patch.dict(_connection_pools, clear=True)
+    first = get_redis_connection()
+    second = get_redis_connection()
+    assert first is not second
+    assert first.connection_pool is second.connection_pool
+    assert isinstance(first.connection_pool, InstrumentedConnectionPool)
+    assert list(_connection_pools.keys()) == ["redis://redis:6379"]
+
+
+def test_instrumented_connection_pool_metrics(mocker):
+    mocked_metrics = mocker.patch("services.redis_configuration.metrics")
+    mocker.patch("redis.connection.Connection.connect")
+    mocker.patch("redis.connection.Connection.can_read", return_value=False)
+    pool = InstrumentedConnectionPool.from_url("redis://redis:6379")
+    connection = pool.get_connection("GET")
+    mocked_metrics.incr.assert_called_with("redis.pool.connections_created")
+    mocked_metrics.gauge.assert_called_with("redis.pool.connections_in_use", 1)
+
+    # the connections in use are sampled
+    other_connection = pool.get_connection("GET")
+    assert mocked_metrics.gauge.call_count == 1
+    pool.release(other_connection)
+    pool.release(connection)
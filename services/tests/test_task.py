@@ -317,3 +317,39 @@ def test_make_http_request_task(mocker):
         time_limit=None,
         headers=dict(created_timestamp="2023-06-13T10:01:01.000123"),
     )
+
+
+@pytest.mark.skipif(
+    not settings.TIMESERIES_ENABLED, reason="requires timeseries data storage"
+)
+@pytest.mark.django_db(databases={"default", "timeseries"})
+def test_backfill_dataset_chunks(mocker):
+    chain_mock = mocker.patch("services.task.task.chain")
+    signature_mock = mocker.patch("services.task.task.signature")
+    mocker.patch("services.task.task.route_task", return_value={"queue": "celery"})
+
+    dataset = DatasetFactory()
+    TaskService().backfill_dataset_chunks(
+        dataset,
+        [
+            (datetime(2022, 2, 1), datetime(2022, 3, 1)),
+            (datetime(2022, 1, 1), datetime(2022, 2, 1)),
+        ],
+    )
+
+    assert [call.kwargs["kwargs"] for call in signature_mock.call_args_list] == [
+        dict(
+            dataset_id=dataset.pk,
+            start_date="2022-02-01T00:00:00",
+            end_date="2022-03-01T00:00:00",
+        ),
+        dict(
+            dataset_id=dataset.pk,
+            start_date="2022-01-01T00:00:00",
+            end_date="2022-02-01T00:00:00",
+        ),
+    ]
+    signature_mock.return_value.set.assert_called_with(immutable=True)
+    chain_mock.assert_called_once()
+    assert len(chain_mock.call_args.args) == 2
+    chain_mock.return_value.apply_async.assert_called_once_with()
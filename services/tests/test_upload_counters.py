@@ -0,0 +1,141 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from freezegun import freeze_time
+from redis.exceptions import ConnectionError
+
+from core.tests.factories import CommitFactory, OwnerFactory, RepositoryFactory
+from reports.tests.factories import UploadFactory
+from services.upload_counters import UploadCounterService
+
+
+def test_monthly_uploads_used_reconciles_from_database(db, mock_redis):
+    owner = OwnerFactory.create()
+    repository = RepositoryFactory.create(author=owner, private=True)
+    public_repository = RepositoryFactory.create(author=owner, private=False)
+    for i in range(3):
+        UploadFactory.create(report__commit__repository=repository)
+    UploadFactory.create(report__commit__repository=public_repository)
+
+    assert UploadCounterService().monthly_uploads_used(owner.ownerid, 250) == 3
+    assert mock_redis.get(f"uploads_window/{owner.ownerid}/reconciled") is not None
+
+    # further uploads are not seen until they are recorded or reconciled
+    UploadFactory.create(report__commit__repository=repository)
+    assert UploadCounterService().monthly_uploads_used(owner.ownerid, 250) == 3
+    UploadCounterService().record_upload(repository, "abc")
+    assert UploadCounterService().monthly_uploads_used(owner.ownerid, 250) == 4
+
+
+def test_monthly_uploads_used_slides_window(db, mock_redis):
+    owner = OwnerFactory.create()
+    repository = RepositoryFactory.create(author=owner, private=True)
+    service = UploadCounterService()
+    with freeze_time("2023-06-01T12:00:00"):
+        service.reconcile_monthly_uploads(owner.ownerid)
+        service.record_upload(repository, "abc")
+        service.record_upload(repository, "abc")
+    with freeze_time("2023-06-20T12:00:00"):
+        service.record_upload(repository, "def")
+        assert service.monthly_uploads_used(owner.ownerid, 250) == 3
+    with freeze_time("2023-07-05T12:00:00"):
+        mock_redis.setex(f"uploads_window/{owner.ownerid}/reconciled", 60, 1)
+        assert service.monthly_uploads_used(owner.ownerid, 250) == 1
+
+
+def test_monthly_uploads_used_redis_unavailable(db, mocker):
+    redis = mocker.MagicMock(mget=mocker.MagicMock(side_effect=ConnectionError()))
+    owner = OwnerFactory.create()
+    commit = CommitFactory.create(
+        repository__author=owner,
+        repository__private=True,
+        timestamp=timezone.now() - timedelta(days=2),
+    )
+    for i in range(5):
+        UploadFactory.create(report__commit=commit)
+
+    assert UploadCounterService(redis).monthly_uploads_used(owner.ownerid, 3) == 3
+
+
+def test_record_upload_redis_unavailable(db, mocker):
+    redis = mocker.MagicMock()
+    redis.pipeline.return_value.execute.side_effect = ConnectionError()
+    repository = RepositoryFactory.create(private=True)
+    # the upload is picked up by the next read/reconciliation instead
+    UploadCounterService(redis).record_upload(repository, "abc")
+
+
+def test_commit_uploads_count_seeded_from_database(db, mock_redis):
+    commit = CommitFactory.create()
+    for i in range(3):
+        UploadFactory.create(report__commit=commit)
+    UploadFactory.create(report__commit=commit, state="error")
+    UploadFactory.create(report__commit=commit, upload_type="carriedforward")
+
+    service = UploadCounterService()
+    assert service.commit_uploads_count(commit) == 3
+    assert (
+        mock_redis.get(f"commit_uploads/{commit.repository_id}/{commit.commitid}")
+        == b"3"
+    )
+
+    service.record_upload(commit.repository, commit.commitid)
+    assert service.commit_uploads_count(commit) == 4
+
+
+def test_commit_uploads_count_over_limit_recounted(db, mock_redis):
+    commit = CommitFactory.create()
+    uploads = [UploadFactory.create(report__commit=commit) for i in range(3)]
+    service = UploadCounterService()
+    assert service.commit_uploads_count(commit, limit=3) == 3
+
+    service.record_upload(commit.repository, commit.commitid)
+    # one of the counted uploads errored in the meantime
+    uploads[0].state = "error"
+    uploads[0].save()
+    assert service.commit_uploads_count(commit) == 4
+    assert service.commit_uploads_count(commit, limit=3) == 2
+    assert (
+        mock_redis.get(f"commit_uploads/{commit.repository_id}/{commit.commitid}")
+        == b"2"
+    )
+
+
+def test_record_commit_upload_not_seeded(db, mock_redis):
+    commit = CommitFactory.create()
+    UploadFactory.create(report__commit=commit)
+
+    service = UploadCounterService()
+    service.record_upload(commit.repository, commit.commitid)
+    assert (
+        mock_redis.get(f"commit_uploads/{commit.repository_id}/{commit.commitid}")
+        is None
+    )
+    assert service.commit_uploads_count(commit) == 1
+
+
+def test_commit_uploads_count_redis_unavailable(db, mocker):
+    redis = mocker.MagicMock(get=mocker.MagicMock(side_effect=ConnectionError()))
+    commit = CommitFactory.create()
+    for i in range(2):
+        UploadFactory.create(report__commit=commit)
+
+    assert UploadCounterService(redis).commit_uploads_count(commit) == 2
+
+
+def test_queue_upload(db, mock_redis):
+    commit = CommitFactory.create(repository__private=True)
+    UploadFactory.create(report__commit=commit)
+    service = UploadCounterService()
+    assert service.commit_uploads_count(commit) == 1
+
+    # sent along with other commands
+    pipeline = mock_redis.pipeline()
+    service.queue_upload(pipeline, commit.repository, commit.commitid, count=2)
+    pipeline.set("other", 1)
+    commit_count, *_ = pipeline.execute()
+    service.upload_recorded(commit_count, commit.repository, commit.commitid, count=2)
+    assert service.commit_uploads_count(commit) == 3
+    ownerid = commit.repository.author_id
+    today = timezone.now().strftime("%Y%m%d")
+    assert mock_redis.get(f"uploads_window/{ownerid}/{today}") == b"2"
@@ -0,0 +1,200 @@
+import logging
+from datetime import date, timedelta
+from typing import List, Optional
+
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from redis import Redis
+from redis.client import Pipeline
+from redis.exceptions import RedisError
+from shared.reports.enums import UploadType
+
+from core.models import Commit, Repository
+from reports.models import ReportSession
+from services.redis_configuration import get_redis_connection
+
+log = logging.getLogger(__name__)
+
+# size of the window used for the monthly uploads limit
+MONTHLY_UPLOADS_WINDOW_DAYS = 30
+# how often (at most) the window buckets of an owner get re-synced with Postgres
+MONTHLY_UPLOADS_RECONCILE_INTERVAL = 3600
+# how long a commit's uploads count is trusted before being counted again in Postgres
+COMMIT_UPLOADS_COUNT_TTL = 900
+
+
+def monthly_uploads_queryset(ownerid: int):
+    """
+    Uploads that count towards the monthly uploads limit of the given owner.
+    """
+    return ReportSession.objects.filter(
+        report__commit__repository__author_id=ownerid,
+        report__commit__repository__private=True,
+        created_at__gte=timezone.now() - timedelta(days=MONTHLY_UPLOADS_WINDOW_DAYS),
+        # attempt at making the query more performant by telling the db to not
+        # check old commits, which are unlikely to have recent uploads
+        report__commit__timestamp__gte=timezone.now()
+        - timedelta(days=MONTHLY_UPLOADS_WINDOW_DAYS * 2),
+        upload_type="uploaded",
+    )
+
+
+def commit_uploads_queryset(commit: Commit):
+    """
+    Uploads that count towards the max number of uploads of the given commit.
+    """
+    return ReportSession.objects.filter(
+        ~Q(state="error"),
+        ~Q(upload_type=UploadType.CARRIEDFORWARD.db_name),
+        report__commit=commit,
+    )
+
+
+class UploadCounterService(object):
+    """
+    Keeps upload counts in Redis so the uploads throttling and validation
+    don't need to count uploads in Postgres on every request:
+    - the per-owner monthly counts are kept as one bucket per day. Buckets are
+    incremented as uploads come in and periodically overwritten with the
+    actual counts from the database.
+    - the per-commit counts are seeded from the database on first read and
+    incremented as uploads come in.  Uploads that later error are not
+    decremented, so counts over the limit are recounted in the database
+    before an upload is rejected.
+    """
+
+    def __init__(self, redis: Redis = None):
+        self.redis = redis or get_redis_connection()
+
+    def _bucket_key(self, ownerid: int, day: date) -> str:
+        return f"uploads_window/{ownerid}/{day.strftime('%Y%m%d')}"
+
+    def _reconciled_key(self, ownerid: int) -> str:
+        return f"uploads_window/{ownerid}/reconciled"
+
+    def _window_days(self) -> List[date]:
+        today = timezone.now().date()
+        return [
+            today - timedelta(days=offset)
+            for offset in range(MONTHLY_UPLOADS_WINDOW_DAYS)
+        ]
+
+    def monthly_uploads_used(self, ownerid: int, limit: int) -> int:
+        try:
+            keys = [self._reconciled_key(ownerid)] + [
+                self._bucket_key(ownerid, day) for day in self._window_days()
+            ]
+            reconciled, *buckets = self.redis.mget(keys)
+            if reconciled is None:
+                return self.reconcile_monthly_uploads(ownerid)
+            return sum(int(value) for value in buckets if value is not None)
+        except RedisError:
+            log.warning(
+                "Unable to read monthly uploads from redis, counting in database",
+                extra=dict(ownerid=ownerid),
+                exc_info=True,
+            )
+            return monthly_uploads_queryset(ownerid)[:limit].count()
+
+    def reconcile_monthly_uploads(self, ownerid: int) -> int:
+        """
+        Overwrites the window buckets of the owner with the counts from the database.
+        """
+        counts_per_day = {
+            row["day"]: row["count"]
+            for row in monthly_uploads_queryset(ownerid)
+            .annotate(day=TruncDate("created_at"))
+            .values("day")
+            .annotate(count=Count("id"))
+        }
+        window_days = self._window_days()
+        pipeline = self.redis.pipeline()
+        for offset, day in enumerate(window_days):
+            pipeline.setex(
+                self._bucket_key(ownerid, day),
+                timedelta(days=MONTHLY_UPLOADS_WINDOW_DAYS - offset + 1),
+                counts_per_day.get(day, 0),
+            )
+        pipeline.setex(
+            self._reconciled_key(ownerid), MONTHLY_UPLOADS_RECONCILE_INTERVAL, 1
+        )
+        pipeline.execute()
+        return sum(counts_per_day.get(day, 0) for day in window_days)
+
+    def _commit_key(self, repoid: int, commitid: str) -> str:
+        return f"commit_uploads/{repoid}/{commitid}"
+
+    def commit_uploads_count(self, commit: Commit, limit: Optional[int] = None) -> int:
+        """
+        Number of uploads to the given commit.  When `limit` is given, a cached
+        count over it is checked against the database, since it may include
+        uploads that errored since then.
+        """
+        key = self._commit_key(commit.repository_id, commit.commitid)
+        try:
+            count = self.redis.get(key)
+            if count is not None and (limit is None or int(count) <= limit):
+                return int(count)
+            database_count = commit_uploads_queryset(commit).count()
+            # don't overwrite a count seeded by a concurrent upload in the meantime
+            self.redis.set(
+                key, database_count, ex=COMMIT_UPLOADS_COUNT_TTL, nx=count is None
+            )
+            return database_count
+        except RedisError:
+            log.warning(
+                "Unable to read commit uploads count from redis, counting in database",
+                extra=dict(commit=commit.commitid, repoid=commit.repository_id),
+                exc_info=True,
+            )
+            return commit_uploads_queryset(commit).count()
+
+    def record_upload(self, repository: Repository, commitid: str, count: int = 1):
+        """
+        Counts `count` new uploads to the given commit, in a single round-trip to Redis.
+        """
+        try:
+            pipeline = self.redis.pipeline()
+            self.queue_upload(pipeline, repository, commitid, count)
+            commit_count, *_ = pipeline.execute()
+            self.upload_recorded(commit_count, repository, commitid, count)
+        except RedisError:
+            # the counts get fixed up by the next read/reconciliation from the database
+            log.warning(
+                "Unable to record upload in redis counters",
+                extra=dict(commit=commitid, repoid=repository.repoid),
+                exc_info=True,
+            )
+
+    def queue_upload(
+        self, pipeline: Pipeline, repository: Repository, commitid: str, count: int = 1
+    ):
+        """
+        Queues the commands counting `count` new uploads to the given commit on
+        `pipeline`, so they can be sent along with other commands.  They must be
+        queued first: the result of the first command is the commit count to
+        pass to `upload_recorded` once the pipeline is executed.
+        """
+        commit_key = self._commit_key(repository.repoid, commitid)
+        pipeline.incr(commit_key, count)
+        if repository.private:
+            bucket_key = self._bucket_key(repository.author_id, timezone.now().date())
+            pipeline.incr(bucket_key, count)
+            pipeline.expire(bucket_key, timedelta(days=MONTHLY_UPLOADS_WINDOW_DAYS + 1))
+
+    def upload_recorded(
+        self, commit_count: int, repository: Repository, commitid: str, count: int = 1
+    ):
+        if commit_count != count:
+            return
+        # the commit count was never seeded (or it expired), so let the next
+        # read count the uploads in the database instead
+        try:
+            self.redis.delete(self._commit_key(repository.repoid, commitid))
+        except RedisError:
+            log.warning(
+                "Unable to reset commit uploads count in redis",
+                extra=dict(commit=commitid, repoid=repository.repoid),
+                exc_info=True,
+            )
@@ -10,11 +10,12 @@ from django.shortcuts import render
 from codecov.admin import AdminMixin
 from core.models import Repository
 from services.task import TaskService
+from timeseries.helpers import invalidate_measurements_cache
 from timeseries.models import Dataset
 
 
 def enqueue_tasks(datasets: QuerySet, start_date: datetime, end_date: datetime):
-    count = datasets.update(backfilled=False)
+    count = datasets.update(backfilled=False, backfilled_since=None)
 
     for dataset in datasets:
         TaskService().backfill_dataset(
@@ -22,6 +23,9 @@ def enqueue_tasks(datasets: QuerySet, start_date: datetime, end_date: datetime):
             start_date=start_date,
             end_date=end_date,
         )
+    invalidate_measurements_cache(
+        list(datasets.values_list("repository_id", flat=True))
+    )
 
     return count
 
@@ -1,11 +1,27 @@
+import hashlib
+import json
+import logging
 import math
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Iterable, List, Optional
+from decimal import Decimal
+from typing import (
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 from django.conf import settings
 from django.db import connections
 from django.db.models import (
     Avg,
+    Count,
     DateTimeField,
     DecimalField,
     F,
@@ -13,18 +29,21 @@ from django.db.models import (
     Func,
     Max,
     Min,
+    Q,
     QuerySet,
     Sum,
     Value,
 )
-from django.db.models.fields.json import KeyTextTransform
 from django.db.models.functions import Cast
 from django.utils import timezone
+from redis.exceptions import RedisError
+from shared.metrics import metrics
 
 import services.report as report_service
 from codecov_auth.models import Owner
-from core.models import Commit, Repository
+from core.models import Commit, CommitCoverageDaily, Repository
 from reports.models import RepositoryFlag
+from services.redis_configuration import get_redis_connection
 from services.task import TaskService
 from timeseries.models import (
     Dataset,
@@ -34,12 +53,28 @@ from timeseries.models import (
     MeasurementSummary,
 )
 
+log = logging.getLogger(__name__)
+
 interval_deltas = {
     Interval.INTERVAL_1_DAY: timedelta(days=1),
     Interval.INTERVAL_7_DAY: timedelta(days=7),
     Interval.INTERVAL_30_DAY: timedelta(days=30),
 }
 
+continuous_aggregates = {
+    Interval.INTERVAL_1_DAY: "timeseries_measurement_summary_1day",
+    Interval.INTERVAL_7_DAY: "timeseries_measurement_summary_7day",
+    Interval.INTERVAL_30_DAY: "timeseries_measurement_summary_30day",
+}
+
+# size of the time ranges datasets are backfilled in
+BACKFILL_CHUNK_SIZE = timedelta(days=30)
+
+# Cached measurement series are dropped when the aggregates of their repos are
+# refreshed or backfilled.  Measurements written by the worker in between only
+# show up once the TTL expires.
+MEASUREMENTS_CACHE_TTL = 600
+
 
 def refresh_measurement_summaries(start_date: datetime, end_date: datetime) -> None:
     """
@@ -47,15 +82,177 @@ def refresh_measurement_summaries(start_date: datetime, end_date: datetime) -> N
     This calls a TimescaleDB provided SQL function for each of the continuous aggregates
     to refresh the aggregate data in the provided time range.
     """
-    continuous_aggregates = [
-        "timeseries_measurement_summary_1day",
-        "timeseries_measurement_summary_7day",
-        "timeseries_measurement_summary_30day",
-    ]
     with connections["timeseries"].cursor() as cursor:
-        for cagg in continuous_aggregates:
+        for cagg in continuous_aggregates.values():
             sql = f"CALL refresh_continuous_aggregate('{cagg}', '{start_date.isoformat()}', '{end_date.isoformat()}')"
             cursor.execute(sql)
+    invalidate_measurements_cache()
+
+
+def plan_summary_refreshes(
+    timestamps: Iterable[datetime],
+) -> Dict[Interval, List[Tuple[datetime, datetime]]]:
+    """
+    Computes the time ranges each continuous aggregate needs to be refreshed over
+    so that the buckets containing the given measurement timestamps are up to date.
+    Only whole buckets are refreshed by TimescaleDB, so each timestamp maps to
+    exactly its bucket and adjacent or overlapping buckets (e.g. measurements of
+    different repos written on the same day) are coalesced into a single range.
+    """
+    timestamps = sorted(
+        {
+            timestamp
+            if timezone.is_aware(timestamp)
+            else timestamp.replace(tzinfo=timezone.utc)
+            for timestamp in timestamps
+        }
+    )
+
+    plan = {}
+    for interval, delta in interval_deltas.items():
+        ranges = []
+        for timestamp in timestamps:
+            bucket_start = aligned_start_date(interval, timestamp)
+            bucket_end = bucket_start + delta
+            if ranges and ranges[-1][1] >= bucket_start:
+                ranges[-1] = (ranges[-1][0], max(ranges[-1][1], bucket_end))
+            else:
+                ranges.append((bucket_start, bucket_end))
+        plan[interval] = ranges
+    return plan
+
+
+def _refresh_continuous_aggregate(
+    interval: Interval, ranges: List[Tuple[datetime, datetime]]
+) -> None:
+    cagg = continuous_aggregates[interval]
+    try:
+        with metrics.timer(f"timeseries.refresh_continuous_aggregate.{cagg}"):
+            with connections["timeseries"].cursor() as cursor:
+                for start_date, end_date in ranges:
+                    cursor.execute(
+                        "CALL refresh_continuous_aggregate(%s, %s, %s)",
+                        [
+                            cagg,
+                            start_date.replace(tzinfo=None).isoformat(),
+                            end_date.replace(tzinfo=None).isoformat(),
+                        ],
+                    )
+    finally:
+        # each aggregate is refreshed from its own thread and connection
+        connections["timeseries"].close()
+
+
+def refresh_touched_measurement_summaries(
+    measurements: Iterable[Tuple[int, datetime]],
+) -> None:
+    """
+    Refreshes the measurement summaries affected by the given newly written
+    measurements, as (repo_id, timestamp) pairs.  Only the buckets containing
+    those measurements are refreshed (see `plan_summary_refreshes`) and the
+    continuous aggregates are refreshed concurrently on separate connections.
+    """
+    measurements = list(measurements)
+    if len(measurements) == 0:
+        return
+
+    plan = plan_summary_refreshes(timestamp for _, timestamp in measurements)
+    with ThreadPoolExecutor(max_workers=len(plan)) as executor:
+        futures = [
+            executor.submit(_refresh_continuous_aggregate, interval, ranges)
+            for interval, ranges in plan.items()
+        ]
+        for future in futures:
+            future.result()
+
+    invalidate_measurements_cache({repo_id for repo_id, _ in measurements})
+
+
+def _measurements_cache_version_key(repo_id: Optional[int] = None) -> str:
+    return f"timeseries_cache_version/{repo_id if repo_id is not None else 'all'}"
+
+
+def invalidate_measurements_cache(repo_ids: Optional[Iterable[int]] = None) -> None:
+    """
+    Invalidates the cached measurements of the given repos, or of every repo
+    if none are given, by bumping the versions the cache keys are built from.
+    """
+    if repo_ids is None:
+        keys = [_measurements_cache_version_key()]
+    else:
+        keys = [_measurements_cache_version_key(repo_id) for repo_id in repo_ids]
+    try:
+        pipeline = get_redis_connection().pipeline()
+        for key in keys:
+            pipeline.incr(key)
+        pipeline.execute()
+    except RedisError:
+        log.warning("Unable to invalidate cached measurements", exc_info=True)
+
+
+def _encode_measurement_value(value):
+    # timestamps are cached as ISO 8601 strings and decimal aggregates as
+    # strings, tagged so they're decoded back into the same types
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"$decimal": str(value)}
+    raise TypeError(f"{type(value).__name__} measurement values can't be cached")
+
+
+def _decode_measurement_value(obj: dict):
+    if obj.keys() == {"$datetime"}:
+        return datetime.fromisoformat(obj["$datetime"])
+    if obj.keys() == {"$decimal"}:
+        return Decimal(obj["$decimal"])
+    return obj
+
+
+def cached_measurements(
+    repo_ids: Iterable[int],
+    key_params: dict,
+    compute: Callable[[], Iterable[dict]],
+) -> List[dict]:
+    """
+    Returns the measurements computed by `compute`, reusing the ones cached by
+    a previous call with the same `key_params` until the measurements of
+    one of `repo_ids` are invalidated.
+    """
+    repo_ids = sorted(set(int(repo_id) for repo_id in repo_ids))
+    redis = get_redis_connection()
+    try:
+        versions = redis.mget(
+            [_measurements_cache_version_key()]
+            + [_measurements_cache_version_key(repo_id) for repo_id in repo_ids]
+        )
+    except RedisError:
+        log.warning("Unable to read cached measurements", exc_info=True)
+        return list(compute())
+
+    digest = hashlib.md5(
+        json.dumps(
+            [key_params, repo_ids, versions], sort_keys=True, default=str
+        ).encode()
+    ).hexdigest()
+    key = f"timeseries_measurements/{digest}"
+    try:
+        cached = redis.get(key)
+    except RedisError:
+        log.warning("Unable to read cached measurements", exc_info=True)
+        cached = None
+    if cached is not None:
+        return json.loads(cached, object_hook=_decode_measurement_value)
+
+    measurements = list(compute())
+    try:
+        redis.set(
+            key,
+            json.dumps(measurements, default=_encode_measurement_value),
+            ex=MEASUREMENTS_CACHE_TTL,
+        )
+    except RedisError:
+        log.warning("Unable to cache measurements", exc_info=True)
+    return measurements
 
 
 def aggregate_measurements(
@@ -89,15 +286,24 @@ def aggregate_measurements(
 
 
 def _filter_repos(
-    queryset: QuerySet, repos: Optional[List[Repository]], column_name: str = "repo_id"
+    queryset: QuerySet,
+    repo_branches: Optional[Sequence[Tuple[int, str]]],
 ) -> QuerySet:
     """
-    Filter the given generic queryset by a set of (repoid, branch) tuples.
+    Filter the given measurements queryset by a set of (repoid, branch) tuples.
+    The measurements live in another database than the repos, so the tuples
+    are passed as two arrays joined back together with `unnest` so Postgres
+    hashes them once instead of planning one condition per repo.
     """
-    if repos:
+    if repo_branches:
         queryset = queryset.extra(
-            where=[f"({column_name}, branch) in %s"],
-            params=[tuple((repo.repoid, repo.branch) for repo in repos)],
+            where=[
+                "(repo_id, branch) in (select * from unnest(%s::integer[], %s::text[]))"
+            ],
+            params=[
+                [repoid for repoid, _ in repo_branches],
+                [branch for _, branch in repo_branches],
+            ],
         )
     return queryset
 
@@ -106,7 +312,7 @@ def coverage_measurements(
     interval: Interval,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-    repos: Optional[List[Repository]] = None,
+    repo_branches: Optional[Sequence[Tuple[int, str]]] = None,
     **filters,
 ):
     timestamp_filters = {}
@@ -121,7 +327,7 @@ def coverage_measurements(
         .filter(**filters)
     )
 
-    queryset = _filter_repos(queryset, repos)
+    queryset = _filter_repos(queryset, repo_branches)
 
     if start_date:
         # The first measurement of the specified range (`start_date` through `end_date`)
@@ -136,7 +342,7 @@ def coverage_measurements(
             )
             .filter(**filters)
         )
-        older = _filter_repos(older, repos)
+        older = _filter_repos(older, repo_branches)
         older = aggregate_measurements(older).order_by("-timestamp_bin")[:1]
 
         return older.union(aggregate_measurements(queryset)).order_by("timestamp_bin")
@@ -144,9 +350,29 @@ def coverage_measurements(
         return aggregate_measurements(queryset).order_by("timestamp_bin")
 
 
+def backfill_chunks(
+    start_date: datetime,
+    end_date: datetime,
+    chunk_size: timedelta = BACKFILL_CHUNK_SIZE,
+) -> List[Tuple[datetime, datetime]]:
+    """
+    Splits the `start_date` through `end_date` range into chunks of `chunk_size`,
+    most recent first.
+    """
+    chunks = []
+    chunk_end_date = end_date
+    while chunk_end_date > start_date:
+        chunk_start_date = max(chunk_end_date - chunk_size, start_date)
+        chunks.append((chunk_start_date, chunk_end_date))
+        chunk_end_date = chunk_start_date
+    return chunks
+
+
 def trigger_backfill(dataset: Dataset):
     """
-    Triggers a backfill for the full timespan of the dataset's repo's commits.
+    Triggers a backfill for the timespan of the dataset's repo's commits that
+    is not backfilled yet.  The backfill runs in chunks, most recent first, so
+    recent measurements become available while older history is filled in.
     """
     oldest_commit = (
         Commit.objects.filter(repository_id=dataset.repository_id)
@@ -167,11 +393,96 @@ def trigger_backfill(dataset: Dataset):
         end_date = newest_commit.timestamp.date() + timedelta(days=1)
         end_date = datetime.fromordinal(end_date.toordinal())
 
-        TaskService().backfill_dataset(
-            dataset,
-            start_date=start_date,
-            end_date=end_date,
+        if dataset.backfilled_since is not None:
+            # resume from where the previous backfill is known to have gotten to
+            end_date = min(end_date, dataset.backfilled_since)
+
+        TaskService().backfill_dataset_chunks(
+            dataset, backfill_chunks(start_date, end_date)
         )
+        invalidate_measurements_cache([dataset.repository_id])
+
+
+def datasets_backfilled_since(
+    datasets: Sequence[Dataset], owner_id: int, start_date: Optional[datetime] = None
+) -> bool:
+    """
+    Returns whether the measurements of all the datasets are complete from
+    `start_date` onwards, in which case they can be served even though the
+    backfill of older history is still running.
+
+    Datasets are complete from their persisted `backfilled_since` onwards.
+    The range older than that is verified for all the datasets at once by
+    comparing the number of measurements with the number of commits with
+    coverage, and the datasets found complete are updated in a single query.
+    Without a `start_date` only fully backfilled datasets are complete.
+    """
+    pending = [dataset for dataset in datasets if not dataset.is_backfilled()]
+    if not pending:
+        return True
+    if start_date is None or not isinstance(start_date, datetime):
+        # full history or e.g. an unparsed query parameter
+        return False
+    if timezone.is_aware(start_date):
+        start_date = timezone.make_naive(start_date, timezone.utc)
+
+    pending = [
+        dataset
+        for dataset in pending
+        if not (dataset.backfilled_since and start_date >= dataset.backfilled_since)
+    ]
+    if not pending:
+        return True
+
+    # only the range of each dataset that's not known to be complete needs to
+    # be verified
+    commits_range = Q()
+    measurements_range = Q()
+    for dataset in pending:
+        commits_filter = Q(repository_id=dataset.repository_id)
+        measurements_filter = Q(
+            repo_id=dataset.repository_id,
+            measurable_id=str(dataset.repository_id),
+        )
+        if dataset.backfilled_since is not None:
+            commits_filter &= Q(timestamp__lt=dataset.backfilled_since)
+            measurements_filter &= Q(timestamp__lt=dataset.backfilled_since)
+        commits_range |= commits_filter
+        measurements_range |= measurements_filter
+
+    commit_counts = dict(
+        Commit.objects.filter(
+            commits_range, totals__c__isnull=False, timestamp__gte=start_date
+        )
+        .values("repository_id")
+        .annotate(count=Count("pk"))
+        .values_list("repository_id", "count")
+        .order_by()
+    )
+    measurement_counts = dict(
+        Measurement.objects.filter(
+            measurements_range,
+            owner_id=owner_id,
+            name=MeasurementName.COVERAGE.value,
+            timestamp__gte=start_date,
+        )
+        .values("repo_id")
+        .annotate(count=Count("timestamp"))
+        .values_list("repo_id", "count")
+        .order_by()
+    )
+
+    complete = [
+        dataset.pk
+        for dataset in pending
+        if measurement_counts.get(dataset.repository_id, 0)
+        >= commit_counts.get(dataset.repository_id, 0)
+    ]
+    if complete:
+        Dataset.objects.filter(pk__in=complete).update(
+            backfilled_since=start_date, updated_at=timezone.now()
+        )
+    return len(complete) == len(pending)
 
 
 def aligned_start_date(interval: Interval, date: datetime) -> datetime:
@@ -193,6 +504,25 @@ def aligned_start_date(interval: Interval, date: datetime) -> datetime:
     return aligning_date + (intervals_before * delta)
 
 
+def _aligned_bounds(
+    interval: Interval,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+) -> tuple:
+    """
+    Returns the first and last time bins selected by a `start_date` through
+    `end_date` range, which identify the measurements of that range.
+    """
+    if start_date is not None:
+        aligned = aligned_start_date(interval, start_date)
+        start_date = (
+            aligned if aligned == start_date else aligned + interval_deltas[interval]
+        )
+    if end_date is not None:
+        end_date = aligned_start_date(interval, end_date)
+    return start_date, end_date
+
+
 def fill_sparse_measurements(
     measurements: Iterable[dict],
     interval: Interval,
@@ -204,97 +534,206 @@ def fill_sparse_measurements(
     have an entry for every interval within the requested time range.
     Those placeholder entries will have empty measurement values.
     """
-    by_timestamp = {
-        measurement["timestamp_bin"].replace(tzinfo=timezone.utc): measurement
-        for measurement in measurements
-    }
-    timestamps = sorted(by_timestamp.keys())
-    if len(timestamps) == 0:
-        return []
+    return fill_sparse_measurements_by_key(
+        {None: measurements}, interval, start_date=start_date, end_date=end_date
+    )[None]
+
+
+def _wall_clock_microseconds(date: datetime) -> int:
+    """
+    Microseconds since 0001-01-01 of the given date's wall clock time,
+    ignoring its timezone.  Much cheaper than replacing the timezone of each
+    measurement to compare them.
+    """
+    return (
+        (date.toordinal() * 86400 + date.hour * 3600 + date.minute * 60 + date.second)
+        * 1000000
+    ) + date.microsecond
+
+
+def _from_wall_clock_microseconds(microseconds: int) -> datetime:
+    return datetime.min.replace(tzinfo=timezone.utc) + timedelta(
+        microseconds=microseconds - _wall_clock_microseconds(datetime.min)
+    )
 
+
+def fill_sparse_measurements_by_key(
+    measurements_by_key: Mapping[Hashable, Iterable[dict]],
+    interval: Interval,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> Dict[Hashable, List[dict]]:
+    """
+    Same as `fill_sparse_measurements` for many series at once (e.g. the
+    measurements of every flag of a repo).  The time bins are computed once
+    for all the series, and measurements are placed by their bin index instead
+    of looking up every bin of every series.  Each series gets placeholder
+    entries of its own, so they can safely be mutated.
+    """
     delta = interval_deltas[interval]
+    delta_us = delta // timedelta(microseconds=1)
+
+    # measurements are keyed by their UTC wall clock time
+    series = {}
+    for key, measurements in measurements_by_key.items():
+        by_timestamp = {
+            _wall_clock_microseconds(measurement["timestamp_bin"]): measurement
+            for measurement in measurements
+        }
+        if len(by_timestamp) > 0:
+            series[key] = (min(by_timestamp), by_timestamp)
+
+    filled = {key: [] for key in measurements_by_key}
+    if len(series) == 0:
+        return filled
 
     if start_date is None:
-        start_date = timestamps[0]
-    start_date = aligned_start_date(interval, start_date)
+        # each series starts at its own oldest measurement
+        bins_start = aligned_start_date(
+            interval,
+            _from_wall_clock_microseconds(min(oldest for oldest, _ in series.values())),
+        )
+    else:
+        bins_start = aligned_start_date(interval, start_date)
 
     if end_date is None:
         end_date = timezone.now()
 
-    intervals = []
+    bins_count = (end_date - bins_start) // delta + 1 if end_date >= bins_start else 0
+    timestamp_bins = [bins_start + index * delta for index in range(bins_count)]
+    bins_start_us = _wall_clock_microseconds(bins_start)
 
-    current_date = start_date
-    while current_date <= end_date:
-        if current_date in by_timestamp:
-            intervals.append(by_timestamp[current_date])
-        else:
-            # interval not found
-            intervals.append(
-                {
-                    "timestamp_bin": current_date,
-                    "avg": None,
-                    "min": None,
-                    "max": None,
-                }
+    for key, (oldest, by_timestamp) in series.items():
+        if start_date is None:
+            series_start = aligned_start_date(
+                interval, _from_wall_clock_microseconds(oldest)
             )
-        current_date += delta
-
-    if len(timestamps) > 0:
-        oldest_date = timestamps[0]
-        if (
-            oldest_date <= start_date
-            and len(intervals) > 0
-            and intervals[0]["avg"] is None
-        ):
+        else:
+            series_start = bins_start
+        series_start_us = _wall_clock_microseconds(series_start)
+        intervals = [
+            {"timestamp_bin": timestamp_bin, "avg": None, "min": None, "max": None}
+            for timestamp_bin in timestamp_bins[
+                (series_start_us - bins_start_us) // delta_us :
+            ]
+        ]
+
+        bins = len(intervals)
+        for timestamp, measurement in by_timestamp.items():
+            index, remainder = divmod(timestamp - series_start_us, delta_us)
+            if not remainder and 0 <= index < bins:
+                intervals[index] = measurement
+
+        if oldest <= series_start_us and bins > 0 and intervals[0]["avg"] is None:
             # we're missing the first datapoint but we can carry forward
             # and older measurement that was selected
-            measurement = by_timestamp[oldest_date]
             intervals[0] = {
-                **measurement,
-                "timestamp_bin": start_date,
+                **by_timestamp[oldest],
+                "timestamp_bin": series_start,
             }
 
-    return intervals
+        filled[key] = intervals
+
+    return filled
+
+
+def downsample_measurements(
+    measurements: Iterable[dict], max_points: int
+) -> List[dict]:
+    """
+    Reduces a series of measurements to at most `max_points` (at least 2)
+    using the Largest-Triangle-Three-Buckets algorithm: the series is split in
+    buckets and the measurement of each bucket that contributes the most to the
+    shape of the series (peaks and drops) is kept, instead of averaging them away.
+    Placeholder entries (without values) are always dropped.
+    """
+    if max_points < 2:
+        raise ValueError(f"Can't downsample to {max_points} points")
+
+    points = [
+        measurement for measurement in measurements if measurement["avg"] is not None
+    ]
+    if len(points) <= max_points:
+        return points
+    if max_points == 2:
+        return [points[0], points[-1]]
+
+    xs = [point["timestamp_bin"].timestamp() for point in points]
+    ys = [float(point["avg"]) for point in points]
+
+    # the first and last points are always kept, the others are split in buckets
+    bucket_size = (len(points) - 2) / (max_points - 2)
+    bucket_bounds = [int(index * bucket_size) + 1 for index in range(max_points - 2)]
+    bucket_bounds.append(len(points) - 1)
+
+    sampled = [points[0]]
+    previous = 0
+    for bucket in range(max_points - 2):
+        start, end = bucket_bounds[bucket], bucket_bounds[bucket + 1]
+        # the average of the next bucket is the third vertex of the triangles
+        if bucket + 2 < len(bucket_bounds):
+            next_start, next_end = end, bucket_bounds[bucket + 2]
+        else:
+            next_start, next_end = len(points) - 1, len(points)
+        next_x = sum(xs[next_start:next_end]) / (next_end - next_start)
+        next_y = sum(ys[next_start:next_end]) / (next_end - next_start)
+
+        previous_x, previous_y = xs[previous], ys[previous]
+        previous = max(
+            range(start, end),
+            key=lambda index: abs(
+                (previous_x - next_x) * (ys[index] - previous_y)
+                - (previous_x - xs[index]) * (next_y - previous_y)
+            ),
+        )
+        sampled.append(points[previous])
+
+    sampled.append(points[-1])
+    return sampled
 
 
 def coverage_fallback_query(
     interval: Interval,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-    repos: Optional[List[Repository]] = None,
+    repo_ids: Optional[Sequence[int]] = None,
     **filters,
 ):
     """
-    Query for coverage timeseries directly from the database
+    Query for coverage timeseries directly from the database, using the daily
+    rollup of the commits' coverage maintained alongside the commits table.
+    With `repo_ids`, the default branch of each of these repos is selected by
+    joining the repos table instead of passing the branches along.
     """
     timestamp_filters = {}
     if start_date is not None:
-        timestamp_filters["timestamp__gte"] = start_date
+        timestamp_filters["timestamp_bin__gte"] = start_date
     if end_date is not None:
-        timestamp_filters["timestamp__lte"] = end_date
-    commits = Commit.objects.filter(**timestamp_filters).filter(**filters)
-    commits = _filter_repos(commits, repos, column_name="repoid")
-    commits = _commits_coverage(commits, interval)
+        timestamp_filters["timestamp_bin__lte"] = end_date
+    days = CommitCoverageDaily.objects.filter(**filters)
+    if repo_ids is not None:
+        days = days.filter(branch=F("repository__branch")).extra(
+            where=['"commits_coverage_daily"."repoid" = any(%s::integer[])'],
+            params=[list(repo_ids)],
+        )
+    coverage = _daily_coverage(days, interval).filter(**timestamp_filters)
 
     if start_date:
         # The first measurement of the specified range (`start_date` through `end_date`)
         # may be missing the first datapoint.  In order for consumers of this API to have
         # usable data to show we can carry an older datapoint forward to the first time bin.
         # Including this older datapoint in the result set makes that possible.
-        older = Commit.objects.filter(
-            timestamp__lt=start_date,
-        ).filter(**filters)
-        older = _filter_repos(older, repos, column_name="repoid")
-        older = _commits_coverage(older, interval).order_by("-timestamp_bin")[:1]
+        older = _daily_coverage(days, interval).filter(timestamp_bin__lt=start_date)
+        older = older.order_by("-timestamp_bin")[:1]
 
-        return older.union(commits).order_by("timestamp_bin")
+        return older.union(coverage).order_by("timestamp_bin")
     else:
-        return commits.order_by("timestamp_bin")
+        return coverage.order_by("timestamp_bin")
 
 
-def _commits_coverage(
-    commits_queryset: QuerySet[Commit], interval: Interval
-) -> QuerySet[Commit]:
+def _daily_coverage(
+    days_queryset: QuerySet[CommitCoverageDaily], interval: Interval
+) -> QuerySet[CommitCoverageDaily]:
     intervals = {
         Interval.INTERVAL_1_DAY: "1 day",
         Interval.INTERVAL_7_DAY: "7 days",
@@ -302,23 +741,20 @@ def _commits_coverage(
     }
 
     return (
-        commits_queryset.annotate(
+        days_queryset.annotate(
             timestamp_bin=Func(
                 Value(intervals[interval]),
-                F("timestamp"),
+                Cast("day", output_field=DateTimeField()),
                 Value("2000-01-03"),  # mimic how Timescale aligns bins
                 function="date_bin",
-                template="%(function)s(%(expressions)s) at time zone 'utc'",
                 output_field=DateTimeField(),
             ),
-            coverage=Cast(KeyTextTransform("c", "totals"), output_field=FloatField()),
         )
-        .filter(coverage__isnull=False)
         .values("timestamp_bin")
         .annotate(
-            min=Min("coverage"),
-            max=Max("coverage"),
-            avg=Avg("coverage"),
+            min=Min("coverage_min"),
+            max=Max("coverage_max"),
+            avg=Sum("coverage_sum") / Sum("commit_count"),
         )
         .order_by("timestamp_bin")
     )
@@ -330,11 +766,14 @@ def repository_coverage_measurements_with_fallback(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     branch: str = None,
+    cached: bool = False,
 ):
     """
     Tries to return repository coverage measurements from Timescale.
     If those are not available then we trigger a backfill and return computed results
     directly from the primary database (much slower to query).
+    With `cached`, measurements from Timescale are returned as a list which is
+    cached until the repository's measurements are refreshed.
     """
     dataset = None
     if settings.TIMESERIES_ENABLED:
@@ -343,17 +782,34 @@ def repository_coverage_measurements_with_fallback(
             repository_id=repository.pk,
         ).first()
 
-    if settings.TIMESERIES_ENABLED and dataset and dataset.is_backfilled():
+    if (
+        settings.TIMESERIES_ENABLED
+        and dataset
+        and (datasets_backfilled_since([dataset], repository.author_id, start_date))
+    ):
         # timeseries data is ready
-        return coverage_measurements(
-            interval,
-            start_date=start_date,
-            end_date=end_date,
+        filters = dict(
             owner_id=repository.author_id,
             repo_id=repository.pk,
             measurable_id=str(repository.pk),
             branch=branch or repository.branch,
         )
+        if not cached:
+            return coverage_measurements(
+                interval, start_date=start_date, end_date=end_date, **filters
+            )
+        return cached_measurements(
+            [repository.pk],
+            dict(
+                name=MeasurementName.COVERAGE.value,
+                interval=interval.value,
+                bounds=_aligned_bounds(interval, start_date, end_date),
+                **filters,
+            ),
+            lambda: coverage_measurements(
+                interval, start_date=start_date, end_date=end_date, **filters
+            ),
+        )
     else:
         if settings.TIMESERIES_ENABLED and not dataset:
             # we need to backfill
@@ -379,35 +835,62 @@ def owner_coverage_measurements_with_fallback(
     interval: Interval,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
+    cached: bool = False,
 ):
     """
     Tries to return owner coverage measurements from Timescale.
     If those are not available then we trigger a backfill and return computed results
     directly from the primary database (much slower to query).
+    With `cached`, measurements from Timescale are returned as a list which is
+    cached until the measurements of one of the repositories are refreshed.
     """
+    repo_ids = list(repo_ids)
     datasets = []
     if settings.TIMESERIES_ENABLED:
         datasets = Dataset.objects.filter(
             name=MeasurementName.COVERAGE.value,
-            repository_id__in=repo_ids,
-        )
+        ).extra(where=["repository_id = any(%s::integer[])"], params=[repo_ids])
 
-    all_backfilled = len(datasets) == len(repo_ids) and all(
-        dataset.is_backfilled() for dataset in datasets
+    datasets = list(datasets)
+    all_backfilled = len(datasets) == len(repo_ids) and datasets_backfilled_since(
+        datasets, owner.pk, start_date
     )
 
-    # we can't join across databases so we need to load all this into memory.
-    # select just the needed columns to keep this manageable
-    repos = Repository.objects.filter(repoid__in=repo_ids).only("repoid", "branch")
-
     if settings.TIMESERIES_ENABLED and all_backfilled:
+        # we can't join across databases so we need to load all this into memory.
+        # plain (repoid, branch) tuples keep this manageable for large orgs
+        repo_branches = sorted(
+            Repository.objects.extra(
+                where=["repoid = any(%s::integer[])"], params=[repo_ids]
+            ).values_list("repoid", "branch")
+        )
+
         # timeseries data is ready
-        return coverage_measurements(
-            interval,
-            start_date=start_date,
-            end_date=end_date,
-            owner_id=owner.pk,
-            repos=repos,
+        if not cached:
+            return coverage_measurements(
+                interval,
+                start_date=start_date,
+                end_date=end_date,
+                owner_id=owner.pk,
+                repo_branches=repo_branches,
+            )
+        # the repos' branches are part of the key since they select the series
+        return cached_measurements(
+            [repoid for repoid, _ in repo_branches],
+            dict(
+                name=MeasurementName.COVERAGE.value,
+                interval=interval.value,
+                bounds=_aligned_bounds(interval, start_date, end_date),
+                owner_id=owner.pk,
+                repos=repo_branches,
+            ),
+            lambda: coverage_measurements(
+                interval,
+                start_date=start_date,
+                end_date=end_date,
+                owner_id=owner.pk,
+                repo_branches=repo_branches,
+            ),
         )
     else:
         if settings.TIMESERIES_ENABLED:
@@ -428,5 +911,5 @@ def owner_coverage_measurements_with_fallback(
             interval,
             start_date=start_date,
             end_date=end_date,
-            repos=repos,
+            repo_ids=repo_ids,
         )
@@ -0,0 +1,177 @@
+import io
+import logging
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from django.db import connections, transaction
+
+from timeseries.helpers import refresh_touched_measurement_summaries
+
+log = logging.getLogger(__name__)
+
+# number of measurements buffered before they're written
+INGESTION_BATCH_SIZE = 10000
+
+_COLUMNS = (
+    "timestamp",
+    "owner_id",
+    "repo_id",
+    "measurable_id",
+    "branch",
+    "commit_sha",
+    "name",
+    "value",
+)
+
+
+def _copy_value(value) -> str:
+    """
+    Formats a value for Postgres' COPY text format.
+    """
+    if value is None:
+        return "\\N"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+class MeasurementIngestor:
+    """
+    Writes measurements in bulk (e.g. while backfilling a repo with many commits)
+    instead of upserting them one at a time.  Measurements are buffered and each
+    batch is COPY'd into a temporary staging table and then upserted into the
+    measurements table with a single statement, so a measurement that already
+    exists (see the `timeseries_measurement_unique` constraint) is updated.
+    The constraint doesn't apply to measurements without a `commit_sha` (NULLs
+    are distinct), so those replace the existing ones of the same series and
+    timestamp instead.
+
+        with MeasurementIngestor() as ingestor:
+            for commit in commits:
+                ingestor.add(...)
+    """
+
+    def __init__(
+        self,
+        batch_size: int = INGESTION_BATCH_SIZE,
+        refresh_summaries: bool = False,
+    ):
+        self.batch_size = batch_size
+        # refresh the measurement summaries touched by each batch once it's written
+        self.refresh_summaries = refresh_summaries
+        self._rows: List[Tuple] = []
+
+    def __enter__(self) -> "MeasurementIngestor":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+
+    def add(
+        self,
+        *,
+        name: str,
+        owner_id: int,
+        repo_id: int,
+        measurable_id: str,
+        timestamp: datetime,
+        value: float,
+        branch: Optional[str] = None,
+        commit_sha: Optional[str] = None,
+    ) -> None:
+        self._rows.append(
+            (
+                timestamp,
+                owner_id,
+                repo_id,
+                measurable_id,
+                branch,
+                commit_sha,
+                name,
+                value,
+            )
+        )
+        if len(self._rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Writes the buffered measurements and returns how many were written.
+        """
+        rows, self._rows = self._rows, []
+        if len(rows) == 0:
+            return 0
+
+        data = io.StringIO()
+        for ordinal, row in enumerate(rows):
+            data.write("\t".join(_copy_value(value) for value in (ordinal, *row)))
+            data.write("\n")
+        data.seek(0)
+
+        columns = ", ".join(_COLUMNS)
+        with transaction.atomic(using="timeseries"):
+            with connections["timeseries"].cursor() as cursor:
+                cursor.execute(
+                    """
+                    create temporary table if not exists timeseries_measurement_staging (
+                        ordinal bigint,
+                        timestamp timestamp with time zone,
+                        owner_id bigint,
+                        repo_id bigint,
+                        measurable_id text,
+                        branch text,
+                        commit_sha text,
+                        name text,
+                        value double precision
+                    ) on commit drop;
+                    -- left over by a previous batch if this runs in an outer transaction
+                    truncate timeseries_measurement_staging;
+                    """
+                )
+                cursor.copy_expert(
+                    f"copy timeseries_measurement_staging (ordinal, {columns}) from stdin",
+                    data,
+                )
+                if any(row[5] is None for row in rows):
+                    cursor.execute(
+                        """
+                        delete from timeseries_measurement m
+                        using timeseries_measurement_staging s
+                        where s.commit_sha is null
+                            and m.commit_sha is null
+                            and m.name = s.name
+                            and m.owner_id = s.owner_id
+                            and m.repo_id = s.repo_id
+                            and m.measurable_id = s.measurable_id
+                            and m.timestamp = s.timestamp
+                        """
+                    )
+                # a batch may contain the same measurement more than once, in
+                # which case the last one wins (an upsert can't touch a row twice)
+                cursor.execute(
+                    f"""
+                    insert into timeseries_measurement ({columns})
+                    select distinct on (name, owner_id, repo_id, measurable_id, commit_sha, timestamp)
+                        {columns}
+                    from timeseries_measurement_staging
+                    order by name, owner_id, repo_id, measurable_id, commit_sha, timestamp, ordinal desc
+                    on conflict (name, owner_id, repo_id, measurable_id, commit_sha, timestamp)
+                    do update set branch = excluded.branch, value = excluded.value
+                    """
+                )
+
+        log.info("Ingested measurements", extra=dict(count=len(rows)))
+
+        if self.refresh_summaries:
+            refresh_touched_measurement_summaries(
+                (repo_id, timestamp) for timestamp, _, repo_id, *_ in rows
+            )
+
+        return len(rows)
@@ -0,0 +1,23 @@
+# Generated by Django 4.2 on 2023-06-05 14:12
+
+from django.db import migrations
+
+import core.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "timeseries",
+            "0014_remove_measurement_timeseries_measurement_flag_unique_and_more",
+        ),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dataset",
+            name="backfilled_since",
+            field=core.models.DateTimeWithoutTZField(null=True),
+        ),
+    ]
@@ -136,6 +136,10 @@ class Dataset(models.Model):
     # The solution would be to somehow have a celery task return when it's done, hence the TODO
     backfilled = models.BooleanField(null=False, default=False)
 
+    # measurements are known to be complete from this date onwards -
+    # backfill chunks run newest-first so this moves back in time as they complete
+    backfilled_since = DateTimeWithoutTZField(null=True)
+
     created_at = DateTimeWithoutTZField(default=timezone.now, null=True)
     updated_at = DateTimeWithoutTZField(default=timezone.now, null=True)
 
@@ -164,6 +168,8 @@ class Dataset(models.Model):
 
         TODO: this should eventually read `self.backfilled` which will be updated via the worker
         """
+        if self.backfilled:
+            return True
         if not self.created_at:
             return False
         return datetime.now() > self.created_at + timedelta(hours=1)
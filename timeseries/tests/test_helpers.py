@@ -1,24 +1,37 @@
-from datetime import datetime, timezone
+import json
+from datetime import datetime, timedelta, timezone
 from unittest.mock import call, patch
 
 import pytest
 from django.conf import settings
-from django.test import TransactionTestCase
+from django.db import connections
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from freezegun import freeze_time
 from freezegun.api import FakeDatetime
+from redis.exceptions import ConnectionError as RedisConnectionError
 from shared.reports.resources import Report, ReportFile, ReportLine
 from shared.utils.sessions import Session
 
 from codecov_auth.tests.factories import OwnerFactory
+from core.models import Repository
 from core.tests.factories import CommitFactory, RepositoryFactory
 from reports.tests.factories import RepositoryFlagFactory
 from timeseries.helpers import (
+    backfill_chunks,
     coverage_measurements,
+    datasets_backfilled_since,
+    downsample_measurements,
     fill_sparse_measurements,
+    fill_sparse_measurements_by_key,
+    invalidate_measurements_cache,
     owner_coverage_measurements_with_fallback,
+    plan_summary_refreshes,
     refresh_measurement_summaries,
+    refresh_touched_measurement_summaries,
     repository_coverage_measurements_with_fallback,
+    trigger_backfill,
 )
 from timeseries.models import Dataset, Interval, Measurement, MeasurementName
 from timeseries.tests.factories import DatasetFactory, MeasurementFactory
@@ -69,6 +82,72 @@ class RefreshMeasurementSummariesTest(TransactionTestCase):
             "CALL refresh_continuous_aggregate('timeseries_measurement_summary_30day', '2022-01-01T00:00:00', '2022-01-02T00:00:00')",
         ]
 
+    def test_plan_summary_refreshes(self):
+        plan = plan_summary_refreshes(
+            [
+                datetime(2022, 1, 1, 10, 0, 0),
+                datetime(2022, 1, 2, 1, 0, 0),
+                datetime(2022, 1, 1, 12, 0, 0, tzinfo=timezone.utc),
+                datetime(2022, 1, 5, 1, 0, 0),
+            ]
+        )
+        utc = timezone.utc
+        assert plan == {
+            Interval.INTERVAL_1_DAY: [
+                (datetime(2022, 1, 1, tzinfo=utc), datetime(2022, 1, 3, tzinfo=utc)),
+                (datetime(2022, 1, 5, tzinfo=utc), datetime(2022, 1, 6, tzinfo=utc)),
+            ],
+            Interval.INTERVAL_7_DAY: [
+                (datetime(2021, 12, 27, tzinfo=utc), datetime(2022, 1, 10, tzinfo=utc)),
+            ],
+            Interval.INTERVAL_30_DAY: [
+                (datetime(2021, 12, 8, tzinfo=utc), datetime(2022, 1, 7, tzinfo=utc)),
+            ],
+        }
+
+    @patch("timeseries.helpers.invalidate_measurements_cache")
+    @patch("timeseries.helpers.connections")
+    def test_refresh_touched_measurement_summaries(
+        self, connections, invalidate_measurements_cache
+    ):
+        refresh_touched_measurement_summaries(
+            [
+                (1, datetime(2022, 1, 1, 10, 0, 0)),
+                (2, datetime(2022, 1, 1, 12, 0, 0)),
+                (2, datetime(2022, 1, 5, 1, 0, 0)),
+            ]
+        )
+
+        cursor = connections["timeseries"].cursor.return_value.__enter__.return_value
+        assert sorted(call.args[1] for call in cursor.execute.call_args_list) == [
+            [
+                "timeseries_measurement_summary_1day",
+                "2022-01-01T00:00:00",
+                "2022-01-02T00:00:00",
+            ],
+            [
+                "timeseries_measurement_summary_1day",
+                "2022-01-05T00:00:00",
+                "2022-01-06T00:00:00",
+            ],
+            [
+                "timeseries_measurement_summary_30day",
+                "2021-12-08T00:00:00",
+                "2022-01-07T00:00:00",
+            ],
+            [
+                "timeseries_measurement_summary_7day",
+                "2021-12-27T00:00:00",
+                "2022-01-10T00:00:00",
+            ],
+        ]
+        invalidate_measurements_cache.assert_called_once_with({1, 2})
+
+    @patch("timeseries.helpers.connections")
+    def test_refresh_touched_measurement_summaries_nothing_touched(self, connections):
+        refresh_touched_measurement_summaries([])
+        connections["timeseries"].cursor.assert_not_called()
+
 
 @pytest.mark.skipif(
     not settings.TIMESERIES_ENABLED, reason="requires timeseries data storage"
@@ -382,6 +461,91 @@ class FillSparseMeasurementsTest(TransactionTestCase):
         assert fill_sparse_measurements([], Interval.INTERVAL_1_DAY, None, None) == []
 
 
+def test_fill_sparse_measurements_by_key():
+    start_date = datetime(2022, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
+    end_date = datetime(2022, 1, 4, 0, 0, 0, tzinfo=timezone.utc)
+    measurements = {
+        1: [
+            {"timestamp_bin": datetime(2021, 12, 30), "avg": 70, "min": 70, "max": 70},
+            {"timestamp_bin": datetime(2022, 1, 2), "avg": 80, "min": 80, "max": 80},
+        ],
+        2: [
+            {"timestamp_bin": datetime(2022, 1, 3), "avg": 90, "min": 90, "max": 90},
+            # not aligned to a time bin
+            {"timestamp_bin": datetime(2022, 1, 3, 1), "avg": 1, "min": 1, "max": 1},
+        ],
+        3: [],
+    }
+
+    filled = fill_sparse_measurements_by_key(
+        measurements, Interval.INTERVAL_1_DAY, start_date, end_date
+    )
+    assert [[entry["avg"] for entry in filled[key]] for key in (1, 2, 3)] == [
+        # oldest measurement is carried forward to the first bin
+        [70, 80, None, None],
+        [None, None, 90, None],
+        [],
+    ]
+    assert filled[1][0]["timestamp_bin"] == start_date
+    assert [entry["timestamp_bin"] for entry in filled[2]] == [
+        datetime(2022, 1, day, 0, 0, 0, tzinfo=timezone.utc) for day in range(1, 5)
+    ]
+    for key, series in measurements.items():
+        assert filled[key] == fill_sparse_measurements(
+            series, Interval.INTERVAL_1_DAY, start_date, end_date
+        )
+
+
+def test_fill_sparse_measurements_by_key_no_start_date():
+    end_date = datetime(2022, 1, 4, 0, 0, 0, tzinfo=timezone.utc)
+    filled = fill_sparse_measurements_by_key(
+        {
+            1: [{"timestamp_bin": datetime(2022, 1, 1), "avg": 1}],
+            2: [{"timestamp_bin": datetime(2022, 1, 3), "avg": 2}],
+        },
+        Interval.INTERVAL_1_DAY,
+        end_date=end_date,
+    )
+    # every series starts at its own oldest measurement
+    assert [entry["avg"] for entry in filled[1]] == [1, None, None, None]
+    assert [entry["avg"] for entry in filled[2]] == [2, None]
+
+
+def test_fill_sparse_measurements_by_key_many_series():
+    # 500 flags over 2 years of daily bins, with a measurement every 3 days
+    start_date = datetime(2022, 1, 3, 0, 0, 0, tzinfo=timezone.utc)
+    end_date = start_date + timedelta(days=730)
+    measurements = {
+        flag_id: [
+            {
+                "timestamp_bin": datetime(2022, 1, 3) + timedelta(days=day),
+                "avg": flag_id,
+                "min": flag_id,
+                "max": flag_id,
+            }
+            for day in range(0, 730, 3)
+        ]
+        for flag_id in range(500)
+    }
+
+    filled = fill_sparse_measurements_by_key(
+        measurements, Interval.INTERVAL_1_DAY, start_date, end_date
+    )
+
+    assert len(filled) == 500
+    assert all(len(series) == 731 for series in filled.values())
+    assert [entry["avg"] for entry in filled[7][:4]] == [7, None, None, 7]
+    # same result as filling each series on its own
+    for flag_id, series in measurements.items():
+        assert filled[flag_id] == fill_sparse_measurements(
+            series, Interval.INTERVAL_1_DAY, start_date, end_date
+        )
+
+    # placeholders aren't shared between series
+    filled[1][1]["avg"] = 1
+    assert filled[2][1]["avg"] is None
+
+
 @pytest.mark.skipif(
     not settings.TIMESERIES_ENABLED, reason="requires timeseries data storage"
 )
@@ -663,6 +827,52 @@ class RepositoryCoverageMeasurementsWithFallbackTest(TransactionTestCase):
             },
         ]
 
+    @patch("timeseries.models.Dataset.is_backfilled")
+    def test_unbackfilled_dataset_7_day_interval(self, is_backfilled):
+        is_backfilled.return_value = False
+
+        for commitid, timestamp, coverage in [
+            ("commit1", datetime(2021, 12, 29, 1, 0, 0), "60.00"),
+            ("commit2", datetime(2022, 1, 3, 1, 0, 0), "80.00"),
+            ("commit3", datetime(2022, 1, 5, 1, 0, 0), "90.00"),
+            ("commit4", datetime(2022, 1, 5, 2, 0, 0), "70.00"),
+        ]:
+            CommitFactory(
+                commitid=commitid,
+                repository_id=self.repo.pk,
+                branch="master",
+                timestamp=timestamp,
+                totals={"c": coverage},
+            )
+
+        DatasetFactory(
+            name=MeasurementName.COVERAGE.value,
+            repository_id=self.repo.pk,
+        )
+
+        res = repository_coverage_measurements_with_fallback(
+            self.repo,
+            Interval.INTERVAL_7_DAY,
+            start_date=datetime(2022, 1, 3, 0, 0, 0, tzinfo=timezone.utc),
+            end_date=datetime(2022, 1, 10, 0, 0, 0, tzinfo=timezone.utc),
+        )
+        assert list(res) == [
+            {
+                # older datapoint carried forward
+                "timestamp_bin": datetime(2021, 12, 27, 0, 0, 0, tzinfo=timezone.utc),
+                "avg": 60.0,
+                "min": 60.0,
+                "max": 60.0,
+            },
+            {
+                # aggregates over the daily rollups of 2 days
+                "timestamp_bin": datetime(2022, 1, 3, 0, 0, 0, tzinfo=timezone.utc),
+                "avg": 80.0,
+                "min": 70.0,
+                "max": 90.0,
+            },
+        ]
+
     @patch("timeseries.helpers.trigger_backfill")
     def test_no_dataset(self, trigger_backfill):
         CommitFactory(
@@ -1132,3 +1342,401 @@ class OwnerCoverageMeasurementsWithFallbackTest(TransactionTestCase):
                 "max": 80.0,
             },
         ]
+
+    @patch("timeseries.models.Dataset.is_backfilled")
+    def test_many_repos(self, is_backfilled):
+        is_backfilled.return_value = True
+
+        repos = Repository.objects.bulk_create(
+            [
+                RepositoryFactory.build(author=self.owner, name=f"repo-{i}")
+                for i in range(5000)
+            ]
+        )
+        Dataset.objects.bulk_create(
+            [
+                Dataset(name=MeasurementName.COVERAGE.value, repository_id=repo.pk)
+                for repo in repos
+            ]
+        )
+        for repo, branch, value in [
+            (repos[0], "master", 80.0),
+            (repos[-1], "master", 90.0),
+            (repos[-1], "other", 10.0),
+        ]:
+            MeasurementFactory(
+                name=MeasurementName.COVERAGE.value,
+                owner_id=self.owner.pk,
+                repo_id=repo.pk,
+                measurable_id=str(repo.pk),
+                timestamp=datetime(2022, 1, 1, 1, 0, 0),
+                value=value,
+                branch=branch,
+            )
+
+        with CaptureQueriesContext(connections["timeseries"]) as queries:
+            res = list(
+                owner_coverage_measurements_with_fallback(
+                    owner=self.owner,
+                    repo_ids=[repo.pk for repo in repos],
+                    interval=Interval.INTERVAL_1_DAY,
+                    start_date=datetime(2021, 12, 31, 0, 0, 0, tzinfo=timezone.utc),
+                    end_date=datetime(2022, 1, 3, 0, 0, 0, tzinfo=timezone.utc),
+                )
+            )
+        assert res == [
+            {
+                "timestamp_bin": datetime(2022, 1, 1, 0, 0, tzinfo=timezone.utc),
+                "avg": 85.0,
+                "min": 80.0,
+                "max": 90.0,
+            },
+        ]
+        # the datasets and the measurements, with the repos passed as arrays
+        assert len(queries) == 2
+        assert "unnest" in queries[1]["sql"]
+
+    @patch("timeseries.helpers.trigger_backfill")
+    def test_many_repos_fallback(self, trigger_backfill):
+        repos = Repository.objects.bulk_create(
+            [
+                RepositoryFactory.build(
+                    author=self.owner, name=f"repo-{i}", branch="master"
+                )
+                for i in range(5000)
+            ]
+        )
+        for repo, branch, coverage in [
+            (repos[0], "master", "80.00"),
+            (repos[-1], "master", "90.00"),
+            (repos[-1], "other", "10.00"),
+        ]:
+            CommitFactory(
+                repository_id=repo.pk,
+                branch=branch,
+                timestamp=datetime(2022, 1, 1, 1, 0, 0, tzinfo=timezone.utc),
+                totals={"c": coverage},
+            )
+
+        with CaptureQueriesContext(connections["default"]) as queries:
+            res = list(
+                owner_coverage_measurements_with_fallback(
+                    owner=self.owner,
+                    repo_ids=[repo.pk for repo in repos],
+                    interval=Interval.INTERVAL_1_DAY,
+                    start_date=datetime(2021, 12, 31, 0, 0, 0, tzinfo=timezone.utc),
+                    end_date=datetime(2022, 1, 3, 0, 0, 0, tzinfo=timezone.utc),
+                )
+            )
+        assert res == [
+            {
+                "timestamp_bin": datetime(2022, 1, 1, 0, 0, tzinfo=timezone.utc),
+                "avg": 85.0,
+                "min": 80.0,
+                "max": 90.0,
+            },
+        ]
+        # the default branches are joined instead of being loaded
+        assert len(queries) == 1
+        assert 'JOIN "repos"' in queries[0]["sql"]
+
+
+@pytest.mark.skipif(
+    not settings.TIMESERIES_ENABLED, reason="requires timeseries data storage"
+)
+class CachedCoverageMeasurementsTest(TransactionTestCase):
+    databases = {"default", "timeseries"}
+
+    @pytest.fixture(autouse=True)
+    def inject_mock_redis(self, mock_redis):
+        self.redis = mock_redis
+
+    def setUp(self):
+        self.repo = RepositoryFactory(branch="master")
+        DatasetFactory(
+            name=MeasurementName.COVERAGE.value,
+            repository_id=self.repo.pk,
+        )
+
+    def _measurement(self, timestamp, value):
+        MeasurementFactory(
+            name=MeasurementName.COVERAGE.value,
+            owner_id=self.repo.author_id,
+            repo_id=self.repo.pk,
+            measurable_id=str(self.repo.pk),
+            timestamp=timestamp,
+            value=value,
+            branch="master",
+        )
+
+    def _measurements(self, end_date):
+        return repository_coverage_measurements_with_fallback(
+            self.repo,
+            Interval.INTERVAL_1_DAY,
+            start_date=datetime(2021, 12, 31, 0, 0, 0, tzinfo=timezone.utc),
+            end_date=end_date,
+            cached=True,
+        )
+
+    @patch("timeseries.models.Dataset.is_backfilled")
+    def test_cached_until_invalidated(self, is_backfilled):
+        is_backfilled.return_value = True
+        self._measurement(datetime(2022, 1, 1, 1, 0, 0), 80.0)
+
+        end_date = datetime(2022, 1, 3, 0, 0, 0, tzinfo=timezone.utc)
+        expected = [
+            {
+                "timestamp_bin": datetime(2022, 1, 1, 0, 0, tzinfo=timezone.utc),
+                "avg": 80.0,
+                "min": 80.0,
+                "max": 80.0,
+            },
+        ]
+        assert self._measurements(end_date) == expected
+
+        self._measurement(datetime(2022, 1, 2, 1, 0, 0), 90.0)
+        assert self._measurements(end_date) == expected
+        # any end date within the same bin selects the same measurements
+        assert (
+            self._measurements(datetime(2022, 1, 3, 12, 0, 0, tzinfo=timezone.utc))
+            == expected
+        )
+
+        invalidate_measurements_cache([self.repo.pk])
+        assert self._measurements(end_date) == expected + [
+            {
+                "timestamp_bin": datetime(2022, 1, 2, 0, 0, tzinfo=timezone.utc),
+                "avg": 90.0,
+                "min": 90.0,
+                "max": 90.0,
+            },
+        ]
+
+    @patch("timeseries.models.Dataset.is_backfilled")
+    def test_cached_as_json(self, is_backfilled):
+        is_backfilled.return_value = True
+        self._measurement(datetime(2022, 1, 1, 1, 0, 0), 80.0)
+
+        end_date = datetime(2022, 1, 3, 0, 0, 0, tzinfo=timezone.utc)
+        measurements = self._measurements(end_date)
+        (key,) = self.redis.keys("timeseries_measurements/*")
+        cached = json.loads(self.redis.get(key))
+        assert cached[0]["timestamp_bin"] == {"$datetime": "2022-01-01T00:00:00+00:00"}
+
+        # the cached measurements have the same values and types
+        cached_measurements = self._measurements(end_date)
+        assert cached_measurements == measurements
+        assert [
+            {column: type(value) for column, value in measurement.items()}
+            for measurement in cached_measurements
+        ] == [
+            {column: type(value) for column, value in measurement.items()}
+            for measurement in measurements
+        ]
+
+    @patch("timeseries.models.Dataset.is_backfilled")
+    @patch("timeseries.helpers.connections")
+    def test_refresh_measurement_summaries_invalidates(
+        self, connections, is_backfilled
+    ):
+        is_backfilled.return_value = True
+        end_date = datetime(2022, 1, 3, 0, 0, 0, tzinfo=timezone.utc)
+        assert self._measurements(end_date) == []
+
+        self._measurement(datetime(2022, 1, 1, 1, 0, 0), 80.0)
+        refresh_measurement_summaries(
+            start_date=datetime(2022, 1, 1, 0, 0, 0),
+            end_date=datetime(2022, 1, 2, 0, 0, 0),
+        )
+        assert len(self._measurements(end_date)) == 1
+
+    @patch("timeseries.models.Dataset.is_backfilled")
+    def test_redis_unavailable(self, is_backfilled):
+        is_backfilled.return_value = True
+        self._measurement(datetime(2022, 1, 1, 1, 0, 0), 80.0)
+        with patch.object(self.redis, "mget", side_effect=RedisConnectionError()):
+            assert (
+                len(
+                    self._measurements(
+                        datetime(2022, 1, 3, 0, 0, 0, tzinfo=timezone.utc)
+                    )
+                )
+                == 1
+            )
+
+
+@pytest.mark.skipif(
+    not settings.TIMESERIES_ENABLED, reason="requires timeseries data storage"
+)
+class BackfillTest(TransactionTestCase):
+    databases = {"default", "timeseries"}
+
+    @pytest.fixture(autouse=True)
+    def inject_mock_redis(self, mock_redis):
+        self.redis = mock_redis
+
+    def setUp(self):
+        self.repo = RepositoryFactory(branch="master")
+        self.dataset = DatasetFactory(
+            name=MeasurementName.COVERAGE.value,
+            repository_id=self.repo.pk,
+        )
+
+    def _commit_with_measurement(self, timestamp, measured=True):
+        commit = CommitFactory(
+            repository=self.repo, timestamp=timestamp, totals={"c": "80.00"}
+        )
+        if measured:
+            MeasurementFactory(
+                name=MeasurementName.COVERAGE.value,
+                owner_id=self.repo.author_id,
+                repo_id=self.repo.pk,
+                measurable_id=str(self.repo.pk),
+                commit_sha=commit.commitid,
+                timestamp=timestamp,
+                value=80.0,
+            )
+
+    def test_backfill_chunks(self):
+        assert backfill_chunks(
+            datetime(2022, 1, 1), datetime(2022, 3, 1), timedelta(days=30)
+        ) == [
+            (datetime(2022, 1, 30), datetime(2022, 3, 1)),
+            (datetime(2022, 1, 1), datetime(2022, 1, 30)),
+        ]
+        assert backfill_chunks(datetime(2022, 1, 1), datetime(2022, 1, 1)) == []
+
+    @patch("services.task.TaskService.backfill_dataset_chunks")
+    def test_trigger_backfill(self, backfill_dataset_chunks):
+        CommitFactory(repository=self.repo, timestamp=datetime(2022, 1, 1, 1, 0, 0))
+        CommitFactory(repository=self.repo, timestamp=datetime(2022, 2, 14, 1, 0, 0))
+
+        trigger_backfill(self.dataset)
+        backfill_dataset_chunks.assert_called_once_with(
+            self.dataset,
+            [
+                (datetime(2022, 1, 16), datetime(2022, 2, 15)),
+                (datetime(2022, 1, 1), datetime(2022, 1, 16)),
+            ],
+        )
+
+    @patch("services.task.TaskService.backfill_dataset_chunks")
+    def test_trigger_backfill_resumes(self, backfill_dataset_chunks):
+        CommitFactory(repository=self.repo, timestamp=datetime(2022, 1, 1, 1, 0, 0))
+        CommitFactory(repository=self.repo, timestamp=datetime(2022, 2, 14, 1, 0, 0))
+        self.dataset.backfilled_since = datetime(2022, 1, 10)
+        self.dataset.save()
+
+        trigger_backfill(self.dataset)
+        backfill_dataset_chunks.assert_called_once_with(
+            self.dataset,
+            [(datetime(2022, 1, 1), datetime(2022, 1, 10))],
+        )
+
+    def test_datasets_backfilled_since(self):
+        self._commit_with_measurement(datetime(2022, 1, 1, 1, 0, 0), measured=False)
+        self._commit_with_measurement(datetime(2022, 1, 20, 1, 0, 0))
+        self._commit_with_measurement(datetime(2022, 2, 1, 1, 0, 0))
+
+        owner_id = self.repo.author_id
+        # the full history is only complete once the backfill finished
+        with self.assertNumQueries(0):
+            assert not datasets_backfilled_since([self.dataset], owner_id)
+        assert datasets_backfilled_since(
+            [self.dataset],
+            owner_id,
+            start_date=datetime(2022, 1, 15, tzinfo=timezone.utc),
+        )
+
+        self.dataset.refresh_from_db()
+        assert self.dataset.backfilled_since == datetime(2022, 1, 15)
+        assert self.dataset.backfilled == False
+
+        # later windows are known to be complete without counting again
+        with self.assertNumQueries(0):
+            assert datasets_backfilled_since(
+                [self.dataset],
+                owner_id,
+                start_date=datetime(2022, 1, 25, tzinfo=timezone.utc),
+            )
+        assert not datasets_backfilled_since(
+            [self.dataset],
+            owner_id,
+            start_date=datetime(2021, 12, 1, tzinfo=timezone.utc),
+        )
+        self.dataset.refresh_from_db()
+        assert self.dataset.backfilled_since == datetime(2022, 1, 15)
+
+    def test_datasets_backfilled_since_multiple_repos(self):
+        self._commit_with_measurement(datetime(2022, 1, 20, 1, 0, 0))
+        other_repo = RepositoryFactory(author=self.repo.author)
+        other_dataset = DatasetFactory(
+            name=MeasurementName.COVERAGE.value,
+            repository_id=other_repo.pk,
+            backfilled=False,
+        )
+        CommitFactory(
+            repository=other_repo,
+            timestamp=datetime(2022, 1, 20, 1, 0, 0),
+            totals={"c": "80.00"},
+        )
+
+        start_date = datetime(2022, 1, 15)
+        # one grouped count of commits and of measurements for all the datasets
+        with self.assertNumQueries(2, using="default"):
+            with self.assertNumQueries(2, using="timeseries"):
+                assert not datasets_backfilled_since(
+                    [self.dataset, other_dataset],
+                    self.repo.author_id,
+                    start_date=start_date,
+                )
+
+        # the complete dataset is persisted
+        self.dataset.refresh_from_db()
+        other_dataset.refresh_from_db()
+        assert self.dataset.backfilled_since == start_date
+        assert other_dataset.backfilled_since is None
+
+
+class DownsampleMeasurementsTest(TestCase):
+    def _measurements(self, values):
+        return [
+            {
+                "timestamp_bin": datetime(2022, 1, 1, tzinfo=timezone.utc)
+                + timedelta(days=index),
+                "avg": value,
+                "min": value,
+                "max": value,
+            }
+            for index, value in enumerate(values)
+        ]
+
+    def test_downsample_measurements(self):
+        values = [80.0 + (index % 3) for index in range(100)]
+        values[42] = 20.0
+        values[70] = 99.0
+        measurements = self._measurements(values)
+
+        downsampled = downsample_measurements(measurements, 10)
+        assert len(downsampled) == 10
+        assert downsampled[0] is measurements[0]
+        assert downsampled[-1] is measurements[-1]
+        # the drop and the peak of the series are kept
+        assert measurements[42] in downsampled
+        assert measurements[70] in downsampled
+        timestamps = [measurement["timestamp_bin"] for measurement in downsampled]
+        assert timestamps == sorted(timestamps)
+
+    def test_downsample_measurements_short_series(self):
+        measurements = self._measurements([80.0, None, 90.0])
+        # placeholders are dropped even when the series is short enough
+        assert downsample_measurements(measurements, 3) == [
+            measurements[0],
+            measurements[2],
+        ]
+        assert downsample_measurements(measurements, 2) == [
+            measurements[0],
+            measurements[2],
+        ]
+        with pytest.raises(ValueError):
+            downsample_measurements(measurements, 1)
@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from django.conf import settings
+from django.db import connections
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from timeseries.ingestion import MeasurementIngestor
+from timeseries.models import Measurement, MeasurementName
+from timeseries.tests.factories import MeasurementFactory
+
+
+@pytest.mark.skipif(
+    not settings.TIMESERIES_ENABLED, reason="requires timeseries data storage"
+)
+class MeasurementIngestorTest(TransactionTestCase):
+    databases = {"timeseries"}
+
+    def _add(self, ingestor, commit_sha, value, **kwargs):
+        ingestor.add(
+            name=MeasurementName.COVERAGE.value,
+            owner_id=1,
+            repo_id=2,
+            measurable_id="2",
+            timestamp=datetime(2022, 1, 1, 1, 0, 0, tzinfo=timezone.utc),
+            value=value,
+            commit_sha=commit_sha,
+            **kwargs,
+        )
+
+    def test_ingest(self):
+        MeasurementFactory(
+            name=MeasurementName.COVERAGE.value,
+            owner_id=1,
+            repo_id=2,
+            measurable_id="2",
+            timestamp=datetime(2022, 1, 1, 1, 0, 0),
+            value=10.0,
+            branch="main",
+            commit_sha="commit1",
+        )
+
+        with MeasurementIngestor(batch_size=3) as ingestor:
+            self._add(ingestor, "commit1", 80.0, branch="main")
+            self._add(ingestor, "commit2", 85.0, branch="feat\tbranch\\1")
+            self._add(ingestor, "commit3", 90.0)
+            # the first batch is written as soon as it's full
+            assert Measurement.objects.count() == 3
+            self._add(ingestor, "commit4", 50.0, branch="main")
+            # duplicates within a batch: the last one wins
+            self._add(ingestor, "commit4", 95.0, branch="main")
+
+        assert sorted(
+            Measurement.objects.values_list("commit_sha", "branch", "value")
+        ) == [
+            ("commit1", "main", 80.0),
+            ("commit2", "feat\tbranch\\1", 85.0),
+            ("commit3", None, 90.0),
+            ("commit4", "main", 95.0),
+        ]
+
+    def test_nothing_to_flush(self):
+        assert MeasurementIngestor().flush() == 0
+
+    @patch("timeseries.ingestion.refresh_touched_measurement_summaries")
+    def test_refresh_summaries(self, refresh_touched_measurement_summaries):
+        with MeasurementIngestor(refresh_summaries=True) as ingestor:
+            self._add(ingestor, "commit1", 80.0)
+
+        (touched,) = refresh_touched_measurement_summaries.call_args.args
+        assert list(touched) == [
+            (2, datetime(2022, 1, 1, 1, 0, 0, tzinfo=timezone.utc))
+        ]
+
+    def test_ingest_without_commit_sha(self):
+        for value in (80.0, 85.0):
+            with MeasurementIngestor() as ingestor:
+                self._add(ingestor, None, value)
+                self._add(ingestor, "commit1", value)
+
+        # measurements without a commit are replaced rather than duplicated
+        assert sorted(
+            Measurement.objects.values_list("commit_sha", "value"),
+            key=lambda row: row[0] or "",
+        ) == [(None, 85.0), ("commit1", 85.0)]
+
+    def test_ingest_batches(self):
+        count = 2000
+        start_date = datetime(2022, 1, 1, tzinfo=timezone.utc)
+
+        def ingest(value):
+            with CaptureQueriesContext(connections["timeseries"]) as queries:
+                with MeasurementIngestor(batch_size=500) as ingestor:
+                    for index in range(count):
+                        ingestor.add(
+                            name=MeasurementName.COVERAGE.value,
+                            owner_id=1,
+                            repo_id=2,
+                            measurable_id="2",
+                            timestamp=start_date + timedelta(hours=index),
+                            value=value,
+                            commit_sha=f"commit{index}",
+                        )
+            return [
+                query["sql"]
+                for query in queries
+                if "timeseries_measurement" in query["sql"]
+            ]
+
+        # one statement to stage each batch (which is COPY'd) and one to upsert it
+        assert len(ingest(80.0)) == 2 * (count // 500)
+        assert Measurement.objects.count() == count
+
+        # ingesting the same measurements again updates them
+        assert len(ingest(90.0)) == 2 * (count // 500)
+        assert Measurement.objects.count() == count
+        assert set(Measurement.objects.values_list("value", flat=True)) == {90.0}
@@ -1,26 +1,25 @@
 import asyncio
 import logging
 import re
-from datetime import timedelta
 from json import dumps
 
 from asgiref.sync import async_to_sync
 from cerberus import Validator
 from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
-from django.db.models import Q
 from django.utils import timezone
 from rest_framework.exceptions import NotFound, Throttled, ValidationError
-from shared.reports.enums import UploadType
 from shared.torngit.exceptions import TorngitClientError, TorngitObjectNotFoundError
 
 from codecov_auth.models import Owner
 from core.models import Commit, Repository
 from plan.constants import USER_PLAN_REPRESENTATIONS
 from reports.models import ReportSession
+from services.archive import ArchiveService
 from services.repo_providers import RepoProviderService
 from services.segment import SegmentService
 from services.task import TaskService
+from services.upload_counters import UploadCounterService
 from upload.tokenless.tokenless import TokenlessUploadHandler
 from utils.config import get_config
 from utils.encryption import encryptor
@@ -418,15 +417,9 @@ def check_commit_upload_constraints(commit: Commit):
             ).exists()
             if not did_commit_uploads_start_already:
                 limit = USER_PLAN_REPRESENTATIONS[owner.plan].monthly_uploads_limit
-                uploads_used = ReportSession.objects.filter(
-                    report__commit__repository__author_id=owner.ownerid,
-                    report__commit__repository__private=True,
-                    created_at__gte=timezone.now() - timedelta(days=30),
-                    # attempt at making the query more performant by telling the db to not
-                    # check old commits, which are unlikely to have recent uploads
-                    report__commit__timestamp__gte=timezone.now() - timedelta(days=60),
-                    upload_type="uploaded",
-                )[:limit].count()
+                uploads_used = UploadCounterService().monthly_uploads_used(
+                    owner.ownerid, limit
+                )
                 if uploads_used >= limit:
                     log.warning(
                         "User exceeded its limits for usage",
@@ -453,13 +446,11 @@ def validate_upload(upload_params, repository, redis):
         commit = Commit.objects.get(
             commitid=upload_params.get("commit"), repository=repository
         )
-        new_session_count = ReportSession.objects.filter(
-            ~Q(state="error"),
-            ~Q(upload_type=UploadType.CARRIEDFORWARD.db_name),
-            report__commit=commit,
-        ).count()
         session_count = (commit.totals.get("s") if commit.totals else 0) or 0
         current_upload_limit = get_config("setup", "max_sessions") or 150
+        new_session_count = UploadCounterService(redis).commit_uploads_count(
+            commit, limit=current_upload_limit
+        )
         if new_session_count > current_upload_limit:
             if session_count <= current_upload_limit:
                 log.info(
@@ -569,10 +560,27 @@ def parse_headers(headers, upload_params):
     return {"content_type": content_type, "reduced_redundancy": reduced_redundancy}
 
 
-def store_report_in_redis(request, commitid, reportid, redis):
-    encoding = request.META.get("HTTP_X_CONTENT_ENCODING") or request.META.get(
+def _get_report_encoding(request):
+    return request.META.get("HTTP_X_CONTENT_ENCODING") or request.META.get(
         "HTTP_CONTENT_ENCODING"
     )
+
+
+def store_report_in_archive(request, commitid, reportid, repository):
+    """
+    Streams the request body into the archive, so large reports are never
+    held in memory (or in Redis) as a whole. Gzipped reports are stored as-is
+    and tagged with a gzip Content-Encoding.
+    """
+    encoding = _get_report_encoding(request)
+    archive_service = ArchiveService(repository)
+    return archive_service.write_raw_upload(
+        commitid, reportid, request, gzipped=encoding == "gzip"
+    )
+
+
+def store_report_in_redis(request, commitid, reportid, redis):
+    encoding = _get_report_encoding(request)
     redis_key = (
         f"upload/{commitid[:7]}/{reportid}/{'gzip' if encoding == 'gzip' else 'plain'}"
     )
@@ -582,20 +590,39 @@ def store_report_in_redis(request, commitid, reportid, redis):
 
 
 def dispatch_upload_task(task_arguments, repository, redis):
+    dispatch_upload_tasks([task_arguments], repository, redis)
+
+
+def dispatch_upload_tasks(task_arguments_list, repository, redis):
+    """
+    Queues the arguments of uploads to the same commit and report, and sends a
+    single upload task to the worker to process all of them.
+    """
+    task_arguments = task_arguments_list[0]
     # Store task arguments in redis
     cache_uploads_eta = get_config(("setup", "cache", "uploads"), default=86400)
     repo_queue_key = f"uploads/{repository.repoid}/{task_arguments.get('commit')}"
     countdown = 4 if task_arguments.get("version") == "v4" else 0
 
-    redis.rpush(repo_queue_key, dumps(task_arguments))
-    redis.expire(
+    commitid = task_arguments.get("commit")
+    count = len(task_arguments_list)
+    # the upload counters are updated in the same round-trip
+    counters = UploadCounterService(redis)
+    pipeline = redis.pipeline()
+    counters.queue_upload(pipeline, repository, commitid, count)
+    pipeline.rpush(
+        repo_queue_key, *(dumps(arguments) for arguments in task_arguments_list)
+    )
+    pipeline.expire(
         repo_queue_key, cache_uploads_eta if cache_uploads_eta is not True else 86400
     )
-    redis.setex(
+    pipeline.setex(
         f"latest_upload/{repository.repoid}/{task_arguments.get('commit')}",
         3600,
         timezone.now().timestamp(),
     )
+    commit_count, *_ = pipeline.execute()
+    counters.upload_recorded(commit_count, repository, commitid, count)
 
     # Send task to worker
     TaskService().upload(
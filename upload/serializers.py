@@ -3,7 +3,13 @@ from rest_framework import serializers
 
 from codecov_auth.models import Owner
 from core.models import Commit, Repository
-from reports.models import CommitReport, ReportResults, ReportSession, RepositoryFlag
+from reports.models import (
+    CommitReport,
+    ReportResults,
+    ReportSession,
+    RepositoryFlag,
+    UploadFlagMembership,
+)
 from services.archive import ArchiveService
 
 
@@ -14,6 +20,48 @@ class FlagListField(serializers.ListField):
         return [item.flag_name if item is not None else None for item in data.all()]
 
 
+class UploadListSerializer(serializers.ListSerializer):
+    def create(self, validated_data):
+        """
+        Creates all the uploads, their flags and flag memberships with a
+        constant number of queries, regardless of the number of uploads.
+        """
+        flag_names_per_upload = []
+        uploads = []
+        for attrs in validated_data:
+            # dict.fromkeys dedupes the flags while keeping their order
+            flag_names_per_upload.append(list(dict.fromkeys(attrs.pop("flags", []))))
+            attrs.pop("version", None)
+            uploads.append(ReportSession(**attrs))
+        uploads = ReportSession.objects.bulk_create(uploads)
+
+        flag_names = {name for names in flag_names_per_upload for name in names}
+        if uploads and flag_names:
+            repoid = uploads[0].report.commit.repository_id
+            flags = {
+                flag.flag_name: flag
+                for flag in RepositoryFlag.objects.filter(
+                    repository_id=repoid, flag_name__in=flag_names
+                )
+            }
+            new_flags = RepositoryFlag.objects.bulk_create(
+                [
+                    RepositoryFlag(repository_id=repoid, flag_name=flag_name)
+                    for flag_name in flag_names
+                    if flag_name not in flags
+                ]
+            )
+            flags.update({flag.flag_name: flag for flag in new_flags})
+            UploadFlagMembership.objects.bulk_create(
+                [
+                    UploadFlagMembership(report_session=upload, flag=flags[flag_name])
+                    for upload, names in zip(uploads, flag_names_per_upload)
+                    for flag_name in names
+                ]
+            )
+        return uploads
+
+
 class UploadSerializer(serializers.ModelSerializer):
     flags = FlagListField(required=False)
     ci_url = serializers.CharField(source="build_url", required=False, allow_null=True)
@@ -39,6 +87,7 @@ class UploadSerializer(serializers.ModelSerializer):
             "version",
         )
         model = ReportSession
+        list_serializer_class = UploadListSerializer
 
     raw_upload_location = serializers.SerializerMethodField()
 
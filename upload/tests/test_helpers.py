@@ -7,8 +7,10 @@ from rest_framework.exceptions import Throttled, ValidationError
 from core.tests.factories import CommitFactory, OwnerFactory, RepositoryFactory
 from plan.constants import PlanName
 from reports.tests.factories import CommitReportFactory, UploadFactory
+from services.upload_counters import UploadCounterService
 from upload.helpers import (
     check_commit_upload_constraints,
+    dispatch_upload_task,
     try_to_get_best_possible_bot_token,
     validate_activated_repo,
     validate_upload,
@@ -92,7 +94,7 @@ def test_check_commit_constraints_settings_disabled(db, settings):
     check_commit_upload_constraints(third_commit)
 
 
-def test_check_commit_constraints_settings_enabled(db, settings):
+def test_check_commit_constraints_settings_enabled(db, settings, mock_redis):
     settings.UPLOAD_THROTTLING_ENABLED = True
     author = OwnerFactory.create(plan=PlanName.BASIC_PLAN_NAME.value)
     repository = RepositoryFactory.create(author=author, private=True)
@@ -108,11 +110,14 @@ def test_check_commit_constraints_settings_enabled(db, settings):
     check_commit_upload_constraints(second_commit)
     for i in range(300):
         UploadFactory.create(report__commit__repository=public_repository)
+    # uploads created outside of the upload endpoints are only seen once reconciled
+    UploadCounterService(mock_redis).reconcile_monthly_uploads(author.ownerid)
     # ensuring public repos counts don't count torwards the quota
     check_commit_upload_constraints(second_commit)
     for i in range(150):
         UploadFactory.create(report=first_report)
         UploadFactory.create(report=fourth_report)
+    UploadCounterService(mock_redis).reconcile_monthly_uploads(author.ownerid)
     # first and fourth commit already has uploads made, we won't block uploads to them
     check_commit_upload_constraints(first_commit)
     check_commit_upload_constraints(fourth_commit)
@@ -139,7 +144,10 @@ def test_check_commit_constraints_settings_enabled(db, settings):
 def test_validate_upload_too_many_uploads_for_commit(
     db, totals_column_count, rows_count, should_raise, mocker
 ):
-    redis = mocker.MagicMock(sismember=mocker.MagicMock(return_value=False))
+    redis = mocker.MagicMock(
+        sismember=mocker.MagicMock(return_value=False),
+        get=mocker.MagicMock(return_value=None),
+    )
     owner = OwnerFactory.create(plan="users-free")
     repo = RepositoryFactory.create(author=owner)
     commit = CommitFactory.create(totals={"s": totals_column_count}, repository=repo)
@@ -159,3 +167,20 @@ def test_deactivated_repo(db, mocker):
     assert exp.match(
         f"This repository has been deactivated. To resume uploading to it, please activate the repository in the codecov UI: {settings_url}"
     )
+
+
+def test_dispatch_upload_task_single_round_trip(db, mocker, mock_redis):
+    mocker.patch("services.task.TaskService.upload")
+    pipeline = mocker.spy(mock_redis, "pipeline")
+    repository = RepositoryFactory.create(private=False)
+    task_arguments = {"commit": "abc", "version": "v4", "report_code": None}
+
+    dispatch_upload_task(task_arguments, repository, mock_redis)
+
+    # one pipeline for the task arguments, one for the upload counters
+    assert pipeline.call_count == 2
+    assert mock_redis.lrange(f"uploads/{repository.repoid}/abc", 0, -1) == [
+        b'{"commit": "abc", "version": "v4", "report_code": null}'
+    ]
+    assert mock_redis.ttl(f"uploads/{repository.repoid}/abc") == 86400
+    assert mock_redis.get(f"latest_upload/{repository.repoid}/abc") is not None
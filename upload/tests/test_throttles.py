@@ -1,15 +1,21 @@
 from unittest.mock import MagicMock, Mock
 
+import pytest
 from django.test import override_settings
 from rest_framework.test import APITestCase
 
 from core.tests.factories import CommitFactory, OwnerFactory, RepositoryFactory
 from plan.constants import PlanName
 from reports.tests.factories import CommitReportFactory, UploadFactory
+from services.upload_counters import UploadCounterService
 from upload.throttles import UploadsPerCommitThrottle, UploadsPerWindowThrottle
 
 
 class ThrottlesUnitTests(APITestCase):
+    @pytest.fixture(autouse=True)
+    def inject_mock_redis(self, mock_redis):
+        self.redis = mock_redis
+
     def setUp(self):
         self.owner = OwnerFactory(
             plan=PlanName.BASIC_PLAN_NAME.value, max_upload_limit=150
@@ -91,12 +97,15 @@ class ThrottlesUnitTests(APITestCase):
 
         for i in range(300):
             UploadFactory.create(report__commit__repository=public_repository)
+        # uploads created outside of the upload endpoints are only seen once reconciled
+        UploadCounterService(self.redis).reconcile_monthly_uploads(author.ownerid)
         # ensuring public repos counts don't count towards the quota
         self.request_should_not_throttle(third_commit)
 
         for i in range(150):
             UploadFactory.create(report=second_report)
             UploadFactory.create(report=fourth_report)
+        UploadCounterService(self.redis).reconcile_monthly_uploads(author.ownerid)
         # second and fourth commit already has uploads made, we won't block uploads to them
         self.request_should_not_throttle(second_commit)
         self.request_should_not_throttle(fourth_commit)
@@ -127,3 +136,18 @@ class ThrottlesUnitTests(APITestCase):
                 self.uploads_per_commit_throttled(commit)
             else:
                 self.request_should_not_throttle(commit)
+
+    @override_settings(UPLOAD_THROTTLING_ENABLED=True)
+    def test_uploads_per_window_batch(self):
+        repository = RepositoryFactory.create(author=self.owner, private=True)
+        commit = CommitFactory.create(repository=repository)
+        report = CommitReportFactory.create(commit__repository=repository)
+        for i in range(248):
+            UploadFactory.create(report=report)
+        UploadCounterService(self.redis).reconcile_monthly_uploads(self.owner.ownerid)
+
+        # every upload of a batch counts towards the limit
+        throttle_class = UploadsPerWindowThrottle()
+        view = self.set_view_obj(commit)
+        assert throttle_class.allow_request(Mock(data=[{}, {}]), view)
+        assert not throttle_class.allow_request(Mock(data=[{}, {}, {}]), view)
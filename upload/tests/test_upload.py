@@ -1,7 +1,7 @@
 import time
 from datetime import datetime, timedelta
 from json import dumps, loads
-from unittest.mock import ANY, PropertyMock, call, patch
+from unittest.mock import ANY, MagicMock, PropertyMock, call, patch
 from urllib.parse import urlencode
 
 import pytest
@@ -10,6 +10,7 @@ from ddf import G
 from django.core.exceptions import MultipleObjectsReturned
 from django.test import TestCase, override_settings
 from django.utils import timezone
+from redis.exceptions import ConnectionError as RedisConnectionError
 from rest_framework import status
 from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.reverse import reverse
@@ -39,6 +40,7 @@ from upload.helpers import (
     validate_upload,
 )
 from upload.tokenless.tokenless import TokenlessUploadHandler
+from utils.config import get_config
 from utils.encryption import encryptor
 
 
@@ -51,6 +53,33 @@ def mock_get_config_global_upload_tokens(*args):
         return "bitbucketserveruploadtoken"
 
 
+def mock_get_config_minio(minio_config):
+    def side_effect(*args, **kwargs):
+        if args == ("services", "minio"):
+            return minio_config
+        return get_config(*args, **kwargs)
+
+    return side_effect
+
+
+class MockPipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.results = []
+
+    def __getattr__(self, name):
+        command = getattr(self.redis, name)
+
+        def queue(*args, **kwargs):
+            self.results.append(command(*args, **kwargs))
+            return self
+
+        return queue
+
+    def execute(self):
+        return self.results
+
+
 class MockRedis:
     def __init__(self, blacklisted=False, *args, **kwargs):
         self.blacklisted = blacklisted
@@ -70,11 +99,23 @@ class MockRedis:
         return self.blacklisted
 
     def get(self, key):
-        return 10
+        return None
+
+    def set(self, key, value, ex=None, nx=False):
+        return
+
+    def incr(self, key, amount=1):
+        return 1
+
+    def delete(self, key):
+        return
 
     def setex(self, redis_key, expire_time, report):
         return
 
+    def pipeline(self):
+        return MockPipeline(self)
+
 
 class UploadHandlerHelpersTest(TestCase):
     def test_parse_params_validates_valid_input(self):
@@ -321,7 +362,7 @@ class UploadHandlerHelpersTest(TestCase):
             with self.assertRaises(ValidationError):
                 determine_repo_for_upload(params)
 
-    @patch.object(requests, "get")
+    @patch.object(requests.Session, "get")
     def test_determine_repo_upload_tokenless(self, mock_get):
         org = G(Owner, username="codecov", service="github")
         repo = G(Repository, author=org)
@@ -872,7 +913,7 @@ class UploadHandlerHelpersTest(TestCase):
 
     @patch("services.task.TaskService.upload")
     def test_dispatch_upload_task(self, mock_task_service_upload):
-        repo = G(Repository)
+        repo = G(Repository, private=False)
         task_arguments = {
             "commit": "commit123",
             "version": "v4",
@@ -992,6 +1033,8 @@ class UploadHandlerRouteTest(APITestCase):
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert metrics.data["uploads.rejected"] == 1
 
+    @patch("upload.views.legacy.get_config")
+    @patch("upload.views.legacy.store_report_in_archive")
     @patch("shared.metrics.metrics.incr")
     @patch("upload.views.legacy.get_redis_connection")
     @patch("upload.views.legacy.uuid4")
@@ -1005,12 +1048,16 @@ class UploadHandlerRouteTest(APITestCase):
         mock_uuid4,
         mock_get_redis,
         mock_metrics,
+        mock_store_report_in_archive,
+        mock_get_config,
     ):
         class MockRepoProviderAdapter:
             async def get_commit(self, commit, token):
                 return {"message": "This is not a merge commit"}
 
         mock_get_redis.return_value = MockRedis()
+        mock_get_config.side_effect = mock_get_config_minio({"bucket": "archive"})
+        mock_store_report_in_archive.return_value = "v4/raw/2023-01-01/awawaw/b521e55aef79b101f48e2544837ca99a7fa3bf6b/dec1f00b-1883-40d0-afd6-6dcb876510be.txt"
         mock_repo_provider_service.return_value = MockRepoProviderAdapter()
         mock_uuid4.return_value = (
             "dec1f00b-1883-40d0-afd6-6dcb876510be"  # this will be the reportid
@@ -1054,8 +1101,8 @@ class UploadHandlerRouteTest(APITestCase):
             "build_url": None,
             "branch": None,
             "reportid": "dec1f00b-1883-40d0-afd6-6dcb876510be",
-            "redis_key": "upload/b521e55/dec1f00b-1883-40d0-afd6-6dcb876510be/plain",
-            "url": None,
+            "redis_key": None,
+            "url": "v4/raw/2023-01-01/awawaw/b521e55aef79b101f48e2544837ca99a7fa3bf6b/dec1f00b-1883-40d0-afd6-6dcb876510be.txt",
             "branch": None,
             "job": None,
         }
@@ -1070,6 +1117,8 @@ class UploadHandlerRouteTest(APITestCase):
             == "https://app.codecov.io/github/codecovtest/upload-test-repo/commit/b521e55aef79b101f48e2544837ca99a7fa3bf6b"
         )
 
+    @patch("upload.views.legacy.get_config")
+    @patch("upload.views.legacy.store_report_in_archive")
     @patch("shared.metrics.metrics.incr")
     @patch("upload.views.legacy.get_redis_connection")
     @patch("upload.views.legacy.uuid4")
@@ -1083,12 +1132,16 @@ class UploadHandlerRouteTest(APITestCase):
         mock_uuid4,
         mock_get_redis,
         mock_metrics,
+        mock_store_report_in_archive,
+        mock_get_config,
     ):
         class MockRepoProviderAdapter:
             async def get_commit(self, commit, token):
                 return {"message": "This is not a merge commit"}
 
         mock_get_redis.return_value = MockRedis()
+        mock_get_config.side_effect = mock_get_config_minio({"bucket": "archive"})
+        mock_store_report_in_archive.return_value = "v4/raw/2023-01-01/awawaw/b521e55aef79b101f48e2544837ca99a7fa3bf6b/dec1f00b-1883-40d0-afd6-6dcb876510be.txt"
         mock_repo_provider_service.return_value = MockRepoProviderAdapter()
         mock_uuid4.return_value = (
             "dec1f00b-1883-40d0-afd6-6dcb876510be"  # this will be the reportid
@@ -1132,8 +1185,8 @@ class UploadHandlerRouteTest(APITestCase):
             "build_url": None,
             "branch": None,
             "reportid": "dec1f00b-1883-40d0-afd6-6dcb876510be",
-            "redis_key": "upload/b521e55/dec1f00b-1883-40d0-afd6-6dcb876510be/plain",
-            "url": None,
+            "redis_key": None,
+            "url": "v4/raw/2023-01-01/awawaw/b521e55aef79b101f48e2544837ca99a7fa3bf6b/dec1f00b-1883-40d0-afd6-6dcb876510be.txt",
             "branch": None,
             "job": None,
         }
@@ -1148,6 +1201,48 @@ class UploadHandlerRouteTest(APITestCase):
             == "https://app.codecov.io/github/codecovtest/upload-test-repo/commit/b521e55aef79b101f48e2544837ca99a7fa3bf6b"
         )
 
+    @patch("upload.views.legacy.get_config")
+    @patch("upload.views.legacy.store_report_in_archive")
+    @patch("upload.views.legacy.get_redis_connection")
+    @patch("upload.views.legacy.uuid4")
+    @patch("upload.views.legacy.dispatch_upload_task")
+    @patch("services.repo_providers.RepoProviderService.get_adapter")
+    def test_successful_upload_v2_without_archive(
+        self,
+        mock_repo_provider_service,
+        mock_dispatch_upload,
+        mock_uuid4,
+        mock_get_redis,
+        mock_store_report_in_archive,
+        mock_get_config,
+    ):
+        class MockRepoProviderAdapter:
+            async def get_commit(self, commit, token):
+                return {"message": "This is not a merge commit"}
+
+        mock_get_redis.return_value = MockRedis()
+        mock_get_config.side_effect = mock_get_config_minio(None)
+        mock_repo_provider_service.return_value = MockRepoProviderAdapter()
+        mock_uuid4.return_value = "dec1f00b-1883-40d0-afd6-6dcb876510be"
+
+        query_params = {
+            "commit": "b521e55aef79b101f48e2544837ca99a7fa3bf6b",
+            "token": "a03e5d02-9495-4413-b0d8-05651bb2e842",
+        }
+
+        response = self._post(
+            kwargs={"version": "v2"}, query=query_params, data="coverage report"
+        )
+
+        assert response.status_code == 200
+        assert not mock_store_report_in_archive.called
+        task_arguments = mock_dispatch_upload.call_args[0][0]
+        assert (
+            task_arguments["redis_key"]
+            == "upload/b521e55/dec1f00b-1883-40d0-afd6-6dcb876510be/plain"
+        )
+        assert task_arguments["url"] is None
+
     @patch("shared.metrics.metrics.incr")
     @patch("upload.views.legacy.get_redis_connection")
     @patch("upload.views.legacy.uuid4")
@@ -1500,7 +1595,11 @@ class UploadHandlerRouteTest(APITestCase):
 
 
 class UploadHandlerTravisTokenlessTest(TestCase):
-    @patch.object(requests, "get")
+    @pytest.fixture(autouse=True)
+    def inject_mock_redis(self, mock_redis):
+        self.redis = mock_redis
+
+    @patch.object(requests.Session, "get")
     def test_travis_no_slug_match(self, mock_get):
         expected_response = {
             "id": 732059764,
@@ -1585,7 +1684,7 @@ class UploadHandlerTravisTokenlessTest(TestCase):
         with pytest.raises(NotFound) as e:
             TokenlessUploadHandler("something", params).verify_upload()
 
-    @patch.object(requests, "get")
+    @patch.object(requests.Session, "get")
     def test_travis_no_sha_match(self, mock_get):
         expected_response = {
             "id": 732059764,
@@ -1667,7 +1766,7 @@ class UploadHandlerTravisTokenlessTest(TestCase):
             line.strip() for line in expected_error.split("\n")
         ]
 
-    @patch.object(requests, "get")
+    @patch.object(requests.Session, "get")
     def test_travis_no_event_match(self, mock_get):
         expected_response = {
             "id": 732059764,
@@ -1749,7 +1848,7 @@ class UploadHandlerTravisTokenlessTest(TestCase):
             line.strip() for line in expected_error.split("\n")
         ]
 
-    @patch.object(requests, "get")
+    @patch.object(requests.Session, "get")
     def test_travis_failed_requests(self, mock_get):
         mock_get.side_effect = [
             requests.exceptions.ConnectionError("Not found"),
@@ -1788,7 +1887,7 @@ class UploadHandlerTravisTokenlessTest(TestCase):
             line.strip() for line in expected_error.split("\n")
         ]
 
-    @patch.object(requests, "get")
+    @patch.object(requests.Session, "get")
     def test_travis_failed_requests_connection_error(self, mock_get):
         mock_get.side_effect = [
             requests.exceptions.HTTPError("Not found"),
@@ -1827,7 +1926,7 @@ class UploadHandlerTravisTokenlessTest(TestCase):
             line.strip() for line in expected_error.split("\n")
         ]
 
-    @patch.object(requests, "get")
+    @patch.object(requests.Session, "get")
     def test_travis_failed_requests_connection_error(self, mock_get):
         mock_get.side_effect = [
             Exception("Not found"),
@@ -1866,7 +1965,7 @@ class UploadHandlerTravisTokenlessTest(TestCase):
             line.strip() for line in expected_error.split("\n")
         ]
 
-    @patch.object(requests, "get")
+    @patch.object(requests.Session, "get")
     def test_build_not_in_progress(self, mock_get):
         expected_response = {
             "id": 732059764,
@@ -1945,7 +2044,7 @@ class UploadHandlerTravisTokenlessTest(TestCase):
             line.strip() for line in expected_error.split("\n")
         ]
 
-    @patch.object(requests, "get")
+    @patch.object(requests.Session, "get")
     def test_travis_no_job(self, mock_get):
         mock_get.side_effect = [requests.exceptions.HTTPError("Not found"), None]
         params = {
@@ -1981,7 +2080,7 @@ class UploadHandlerTravisTokenlessTest(TestCase):
             line.strip() for line in expected_error.split("\n")
         ]
 
-    @patch.object(requests, "get")
+    @patch.object(requests.Session, "get")
     def test_success(self, mock_get):
         expected_response = {
             "id": 732059764,
@@ -2055,7 +2154,46 @@ class UploadHandlerTravisTokenlessTest(TestCase):
 
         assert res == "github"
 
-    @patch.object(requests, "get")
+    @patch.object(requests.Session, "get")
+    def test_travis_build_verified_once_per_build(self, mock_get):
+        def job(job_id):
+            return {
+                "id": job_id,
+                "state": "started",
+                "finished_at": None,
+                "build": {"id": 732059763, "event_type": "push"},
+                "repository": {"id": 25205338, "slug": "codecov/codecov-api"},
+                "commit": {
+                    "id": 226208830,
+                    "sha": "3be5c52bd748c508a7e96993c02cf3518c816e84",
+                },
+            }
+
+        job_response = MagicMock()
+        job_response.json.return_value = job(732059764)
+        jobs_response = MagicMock()
+        jobs_response.json.return_value = {
+            "jobs": [job(job_id) for job_id in (732059764, 732059765, 732059766)]
+        }
+        mock_get.side_effect = [job_response, jobs_response]
+
+        for job_id in (732059764, 732059765, 732059766):
+            params = {
+                "commit": "3be5c52bd748c508a7e96993c02cf3518c816e84",
+                "owner": "codecov",
+                "repo": "codecov-api",
+                "build": f"498.{job_id - 732059763}",
+                "job": job_id,
+            }
+            assert TokenlessUploadHandler("travis", params).verify_upload() == "github"
+
+        assert [get_call.args[0] for get_call in mock_get.call_args_list] == [
+            "https://api.travis-ci.com/job/732059764",
+            "https://api.travis-ci.com/build/732059763/jobs",
+        ]
+        assert self.redis.ttl("tokenless_build/travis/codecov/codecov-api/498") > 0
+
+    @patch.object(requests.Session, "get")
     def test_expired_build(self, mock_get):
         expected_response = {
             "id": 732059764,
@@ -2136,6 +2274,10 @@ class UploadHandlerTravisTokenlessTest(TestCase):
 
 
 class UploadHandlerAzureTokenlessTest(TestCase):
+    @pytest.fixture(autouse=True)
+    def inject_mock_redis(self, mock_redis):
+        self.redis = mock_redis
+
     def test_azure_no_job(self):
         params = {}
 
@@ -2169,7 +2311,7 @@ class UploadHandlerAzureTokenlessTest(TestCase):
             line.strip() for line in expected_error.split("\n")
         ]
 
-    @patch.object(requests, "get")
+    @patch.object(requests.Session, "get")
     def test_azure_http_error(self, mock_get):
         mock_get.side_effect = [requests.exceptions.HTTPError("Not found")]
 
@@ -2183,7 +2325,7 @@ class UploadHandlerAzureTokenlessTest(TestCase):
             line.strip() for line in expected_error.split("\n")
         ]
 
-    @patch.object(requests, "get")
+    @patch.object(requests.Session, "get")
     def test_azure_connection_error(self, mock_get):
         mock_get.side_effect = [requests.exceptions.ConnectionError("Not found")]
 
@@ -2197,7 +2339,7 @@ class UploadHandlerAzureTokenlessTest(TestCase):
             line.strip() for line in expected_error.split("\n")
         ]
 
-    @patch.object(requests, "get")
+    @patch.object(requests.Session, "get")
     def test_azure_no_errors(self, mock_get):
         expected_response = {
             "finishTime": "NOW",
@@ -2223,7 +2365,7 @@ class UploadHandlerAzureTokenlessTest(TestCase):
 
         assert res == "github"
 
-    @patch.object(requests, "get")
+    @patch.object(requests.Session, "get")
     def test_azure_wrong_build_number(self, mock_get):
         expected_response = {
             "finishTime": f"{datetime.utcnow()}",
@@ -2252,7 +2394,7 @@ class UploadHandlerAzureTokenlessTest(TestCase):
             line.strip() for line in expected_error.split("\n")
         ]
 
-    @patch.object(requests, "get")
+    @patch.object(requests.Session, "get")
     def test_azure_expired_build(self, mock_get):
         expected_response = {
             "finishTime": f"{datetime.utcnow() - timedelta(minutes=4)}",
@@ -2282,7 +2424,7 @@ class UploadHandlerAzureTokenlessTest(TestCase):
             line.strip() for line in expected_error.split("\n")
         ]
 
-    @patch.object(requests, "get")
+    @patch.object(requests.Session, "get")
     def test_azure_invalid_status(self, mock_get):
         expected_response = {
             "finishTime": f"{datetime.utcnow()}",
@@ -2312,7 +2454,7 @@ class UploadHandlerAzureTokenlessTest(TestCase):
             line.strip() for line in expected_error.split("\n")
         ]
 
-    @patch.object(requests, "get")
+    @patch.object(requests.Session, "get")
     def test_azure_wrong_commit(self, mock_get):
         expected_response = {
             "finishTime": "NOW",
@@ -2342,7 +2484,7 @@ class UploadHandlerAzureTokenlessTest(TestCase):
             line.strip() for line in expected_error.split("\n")
         ]
 
-    @patch.object(requests, "get")
+    @patch.object(requests.Session, "get")
     def test_azure_not_public(self, mock_get):
         expected_response = """<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Strict//EN" "http://www.w3.org/TR/xhtml1/DTD/xhtml1-strict.dtd">
                             <html lang="en-US">
@@ -2372,7 +2514,7 @@ class UploadHandlerAzureTokenlessTest(TestCase):
             line.strip() for line in expected_error.split("\n")
         ]
 
-    @patch.object(requests, "get")
+    @patch.object(requests.Session, "get")
     def test_azure_wrong_service_type(self, mock_get):
         expected_response = {
             "finishTime": "NOW",
@@ -2404,6 +2546,10 @@ class UploadHandlerAzureTokenlessTest(TestCase):
 
 
 class UploadHandlerAppveyorTokenlessTest(TestCase):
+    @pytest.fixture(autouse=True)
+    def inject_mock_redis(self, mock_redis):
+        self.redis = mock_redis
+
     def test_appveyor_no_job(self):
         params = {}
 
@@ -2415,7 +2561,7 @@ class UploadHandlerAppveyorTokenlessTest(TestCase):
             line.strip() for line in expected_error.split("\n")
         ]
 
-    @patch.object(requests, "get")
+    @patch.object(requests.Session, "get")
     def test_appveyor_http_error(self, mock_get):
         mock_get.side_effect = [requests.exceptions.HTTPError("Not found")]
 
@@ -2429,7 +2575,7 @@ class UploadHandlerAppveyorTokenlessTest(TestCase):
             line.strip() for line in expected_error.split("\n")
         ]
 
-    @patch.object(requests, "get")
+    @patch.object(requests.Session, "get")
     def test_appveyor_connection_error(self, mock_get):
         mock_get.side_effect = [requests.exceptions.ConnectionError("Not found")]
 
@@ -2447,7 +2593,7 @@ class UploadHandlerAppveyorTokenlessTest(TestCase):
             line.strip() for line in expected_error.split("\n")
         ]
 
-    @patch.object(requests, "get")
+    @patch.object(requests.Session, "get")
     def test_appveyor_finished_build(self, mock_get):
         expected_response = {
             "build": {"jobs": [{"jobId": "732059764"}]},
@@ -2478,7 +2624,7 @@ class UploadHandlerAppveyorTokenlessTest(TestCase):
             line.strip() for line in expected_error.split("\n")
         ]
 
-    @patch.object(requests, "get")
+    @patch.object(requests.Session, "get")
     def test_appveyor_no_errors(self, mock_get):
         expected_response = {
             "build": {"jobs": [{"jobId": "732059764"}]},
@@ -2505,7 +2651,7 @@ class UploadHandlerAppveyorTokenlessTest(TestCase):
 
         assert res == "github"
 
-    @patch.object(requests, "get")
+    @patch.object(requests.Session, "get")
     def test_appveyor_invalid_service(self, mock_get):
         expected_response = {
             "build": {"jobs": [{"jobId": "732059764"}]},
@@ -2537,6 +2683,10 @@ class UploadHandlerAppveyorTokenlessTest(TestCase):
 
 
 class UploadHandlerCircleciTokenlessTest(TestCase):
+    @pytest.fixture(autouse=True)
+    def inject_mock_redis(self, mock_redis):
+        self.redis = mock_redis
+
     def test_circleci_no_build(self):
         params = {}
 
@@ -2570,7 +2720,7 @@ class UploadHandlerCircleciTokenlessTest(TestCase):
             line.strip() for line in expected_error.split("\n")
         ]
 
-    @patch.object(requests, "get")
+    @patch.object(requests.Session, "get")
     def test_circleci_http_error(self, mock_get):
         mock_get.side_effect = [requests.exceptions.HTTPError("Not found")]
 
@@ -2584,7 +2734,7 @@ class UploadHandlerCircleciTokenlessTest(TestCase):
             line.strip() for line in expected_error.split("\n")
         ]
 
-    @patch.object(requests, "get")
+    @patch.object(requests.Session, "get")
     def test_circleci_connection_error(self, mock_get):
         mock_get.side_effect = [requests.exceptions.ConnectionError("Not found")]
 
@@ -2598,7 +2748,7 @@ class UploadHandlerCircleciTokenlessTest(TestCase):
             line.strip() for line in expected_error.split("\n")
         ]
 
-    @patch.object(requests, "get")
+    @patch.object(requests.Session, "get")
     def test_circleci_invalid_commit(self, mock_get):
         expected_response = {"vcs_revision": "739768fcac68144a3a6d82305b9c4106934d31a"}
         mock_get.return_value.status_code.return_value = 200
@@ -2618,7 +2768,7 @@ class UploadHandlerCircleciTokenlessTest(TestCase):
             line.strip() for line in expected_error.split("\n")
         ]
 
-    @patch.object(requests, "get")
+    @patch.object(requests.Session, "get")
     def test_circleci_invalid_stop_time(self, mock_get):
         expected_response = {"vcs_revision": "c739768fcac68144a3a6d82305b9c4106934d31a"}
         mock_get.return_value.status_code.return_value = 200
@@ -2638,7 +2788,7 @@ class UploadHandlerCircleciTokenlessTest(TestCase):
             line.strip() for line in expected_error.split("\n")
         ]
 
-    @patch.object(requests, "get")
+    @patch.object(requests.Session, "get")
     def test_circleci_invalid_stop_time(self, mock_get):
         expected_response = {
             "vcs_revision": "c739768fcac68144a3a6d82305b9c4106934d31a",
@@ -2656,8 +2806,60 @@ class UploadHandlerCircleciTokenlessTest(TestCase):
 
         assert TokenlessUploadHandler("circleci", params).verify_upload() == "github"
 
+    @patch.object(requests.Session, "get")
+    def test_circleci_build_verified_once_per_build(self, mock_get):
+        expected_response = {
+            "vcs_revision": "c739768fcac68144a3a6d82305b9c4106934d31a",
+            "vcs_type": "github",
+        }
+        mock_get.return_value.json.return_value = expected_response
+
+        for job in range(3):
+            params = {
+                "build": f"12.{job}",
+                "owner": "owner",
+                "repo": "repo",
+                "commit": "c739768fcac68144a3a6d82305b9c4106934d31a",
+            }
+            assert (
+                TokenlessUploadHandler("circleci", params).verify_upload() == "github"
+            )
+        mock_get.assert_called_once()
+        assert self.redis.ttl("tokenless_build/circleci/owner/repo/12") > 0
+
+        params = {
+            "build": "13.1",
+            "owner": "owner",
+            "repo": "repo",
+            "commit": "c739768fcac68144a3a6d82305b9c4106934d31a",
+        }
+        assert TokenlessUploadHandler("circleci", params).verify_upload() == "github"
+        assert mock_get.call_count == 2
+
+    @patch.object(requests.Session, "get")
+    def test_circleci_build_cache_unavailable(self, mock_get):
+        mock_get.return_value.json.return_value = {
+            "vcs_revision": "c739768fcac68144a3a6d82305b9c4106934d31a",
+            "vcs_type": "github",
+        }
+        params = {
+            "build": "12.34",
+            "owner": "owner",
+            "repo": "repo",
+            "commit": "c739768fcac68144a3a6d82305b9c4106934d31a",
+        }
+        with patch.object(self.redis, "get", side_effect=RedisConnectionError()):
+            assert (
+                TokenlessUploadHandler("circleci", params).verify_upload() == "github"
+            )
+        mock_get.assert_called_once()
+
 
 class UploadHandlerGithubActionsTokenlessTest(TestCase):
+    @pytest.fixture(autouse=True)
+    def inject_mock_redis(self, mock_redis):
+        self.redis = mock_redis
+
     @patch(
         "upload.tokenless.github_actions.TokenlessGithubActionsHandler.get_build",
         new_callable=PropertyMock,
@@ -0,0 +1,122 @@
+from json import loads
+
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.tests.factories import CommitFactory, RepositoryFactory
+from reports.models import CommitReport, ReportSession, RepositoryFlag
+from reports.tests.factories import UploadFactory
+from services.archive import ArchiveService, MinioEndpoints
+from upload.views.uploads import CanDoCoverageUploadsPermission
+
+
+def _setup_batch(mocker, **repository_kwargs):
+    mocker.patch.object(
+        CanDoCoverageUploadsPermission, "has_permission", return_value=True
+    )
+    repository = RepositoryFactory(
+        name="the_repo",
+        author__username="codecov",
+        author__service="github",
+        **repository_kwargs,
+    )
+    commit = CommitFactory(repository=repository)
+    commit_report = CommitReport.objects.create(commit=commit, code="code")
+    client = APIClient()
+    client.force_authenticate(user=repository.author)
+    url = reverse(
+        "new_upload.uploads_batch",
+        args=["github", "codecov::::the_repo", commit.commitid, commit_report.code],
+    )
+    return repository, commit, commit_report, client, url
+
+
+def test_uploads_batch_url(db, mocker):
+    repository, commit, commit_report, client, url = _setup_batch(mocker)
+    assert (
+        url
+        == f"/upload/github/codecov::::the_repo/commits/{commit.commitid}/reports/code/uploads/batch"
+    )
+
+
+def test_uploads_batch_post(db, mocker, mock_redis):
+    mocker.patch(
+        "services.archive.StorageService.create_presigned_put",
+        return_value="presigned put",
+    )
+    upload_task_mock = mocker.patch("upload.helpers.TaskService.upload")
+    metrics_mock = mocker.patch("upload.views.uploads_batch.metrics")
+    repository, commit, commit_report, client, url = _setup_batch(mocker)
+    RepositoryFlag.objects.create(repository=repository, flag_name="unit")
+
+    response = client.post(
+        url,
+        [
+            {"flags": ["unit", "py3.9"], "job_code": "1", "version": "0.1.0"},
+            {"flags": ["unit", "py3.10", "unit"], "job_code": "2", "version": "0.1.0"},
+            {"job_code": "3"},
+        ],
+        format="json",
+    )
+    assert response.status_code == 201
+    response_json = response.json()
+    assert len(response_json) == 3
+    assert [sorted(upload["flags"]) for upload in response_json] == [
+        ["py3.9", "unit"],
+        ["py3.10", "unit"],
+        [],
+    ]
+    assert all(upload["raw_upload_location"] for upload in response_json)
+    metrics_mock.incr.assert_any_call("upload.cli.0.1.0", 2)
+    metrics_mock.incr.assert_any_call("uploads.accepted", 3)
+
+    uploads = ReportSession.objects.filter(report_id=commit_report.id).order_by(
+        "job_code"
+    )
+    assert [upload.job_code for upload in uploads] == ["1", "2", "3"]
+    assert sorted(
+        RepositoryFlag.objects.filter(repository=repository).values_list(
+            "flag_name", flat=True
+        )
+    ) == ["py3.10", "py3.9", "unit"]
+
+    archive_service = ArchiveService(repository)
+    for upload in uploads:
+        assert upload.upload_extras == {"format_version": "v1"}
+        assert upload.storage_path == MinioEndpoints.raw_with_upload_id.get_path(
+            version="v4",
+            date=upload.created_at.strftime("%Y-%m-%d"),
+            repo_hash=archive_service.storage_hash,
+            commit_sha=commit.commitid,
+            reportid=commit_report.external_id,
+            uploadid=upload.external_id,
+        )
+
+    # a single task processes every upload of the batch
+    upload_task_mock.assert_called_once()
+    queued = mock_redis.lrange(f"uploads/{repository.repoid}/{commit.commitid}", 0, -1)
+    assert sorted(loads(arguments)["upload_id"] for arguments in queued) == sorted(
+        upload.id for upload in uploads
+    )
+
+
+def test_uploads_batch_over_commit_limit(db, mocker, mock_redis):
+    upload_task_mock = mocker.patch("upload.helpers.TaskService.upload")
+    repository, commit, commit_report, client, url = _setup_batch(
+        mocker, author__max_upload_limit=3
+    )
+    UploadFactory(report=commit_report)
+
+    response = client.post(
+        url, [{"job_code": "1"}, {"job_code": "2"}, {"job_code": "3"}], format="json"
+    )
+    assert response.status_code == 400
+    assert response.json() == ["Too many uploads to this commit."]
+    assert ReportSession.objects.filter(report_id=commit_report.id).count() == 1
+    upload_task_mock.assert_not_called()
+
+
+def test_uploads_batch_empty(db, mocker, mock_redis):
+    repository, commit, commit_report, client, url = _setup_batch(mocker)
+    response = client.post(url, [], format="json")
+    assert response.status_code == 400
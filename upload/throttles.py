@@ -1,31 +1,32 @@
 import logging
-from datetime import timedelta
 
 from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
-from django.db.models import Q
-from django.utils import timezone
 from rest_framework.throttling import BaseThrottle
-from shared.reports.enums import UploadType
 
 from plan.constants import USER_PLAN_REPRESENTATIONS
 from reports.models import ReportSession
+from services.upload_counters import UploadCounterService
 from upload.helpers import _determine_responsible_owner
 
 log = logging.getLogger(__name__)
 
 
+def _uploads_count(request) -> int:
+    # the batch endpoint creates every upload of the request body at once
+    data = request.data
+    return len(data) if isinstance(data, list) else 1
+
+
 class UploadsPerCommitThrottle(BaseThrottle):
     def allow_request(self, request, view):
         try:
             repository = view.get_repo()
             commit = view.get_commit(repository)
-            new_session_count = ReportSession.objects.filter(
-                ~Q(state="error"),
-                ~Q(upload_type=UploadType.CARRIEDFORWARD.db_name),
-                report__commit=commit,
-            ).count()
             max_upload_limit = repository.author.max_upload_limit or 150
+            new_session_count = UploadCounterService().commit_uploads_count(
+                commit, limit=max_upload_limit
+            )
             if new_session_count > max_upload_limit:
                 log.warning(
                     "Too many uploads to this commit",
@@ -59,17 +60,10 @@ class UploadsPerWindowThrottle(BaseThrottle):
                         limit = USER_PLAN_REPRESENTATIONS[
                             owner.plan
                         ].monthly_uploads_limit
-                        uploads_used = ReportSession.objects.filter(
-                            report__commit__repository__author_id=owner.ownerid,
-                            report__commit__repository__private=True,
-                            created_at__gte=timezone.now() - timedelta(days=30),
-                            # attempt at making the query more performant by telling the db to not
-                            # check old commits, which are unlikely to have recent uploads
-                            report__commit__timestamp__gte=timezone.now()
-                            - timedelta(days=60),
-                            upload_type="uploaded",
-                        )[:limit].count()
-                        if uploads_used >= limit:
+                        uploads_used = UploadCounterService().monthly_uploads_used(
+                            owner.ownerid, limit
+                        )
+                        if uploads_used + _uploads_count(request) > limit:
                             log.warning(
                                 "User exceeded its limits for usage",
                                 extra=dict(
@@ -11,9 +11,12 @@ log = logging.getLogger(__name__)
 
 
 class TokenlessAppveyorHandler(BaseTokenlessUploadHandler):
+
+    ci_type = "appveyor"
+
     def get_build(self):
         try:
-            build = requests.get(
+            build = self.http_session.get(
                 "https://ci.appveyor.com/api/projects/{}/{}/build/{}".format(
                     *self.job.split("/", 2)
                 ),
@@ -40,6 +43,9 @@ class TokenlessAppveyorHandler(BaseTokenlessUploadHandler):
 
         return build.json()
 
+    def get_build_id(self):
+        return self.job
+
     def verify(self):
         if not self.upload_params.get("job"):
             raise NotFound(
@@ -56,7 +62,7 @@ class TokenlessAppveyorHandler(BaseTokenlessUploadHandler):
 
         self.job = self.job.replace("+", "%20").replace(" ", "%20")
 
-        build = self.get_build()
+        build = self.get_cached_build()
 
         # validate build
         if not any(
@@ -12,9 +12,12 @@ log = logging.getLogger(__name__)
 
 
 class TokenlessAzureHandler(BaseTokenlessUploadHandler):
+
+    ci_type = "azure_pipelines"
+
     def get_build(self):
         try:
-            response = requests.get(
+            response = self.http_session.get(
                 f"{self.server_uri}{self.project}/_apis/build/builds/{self.job}?api-version=5.0",
                 headers={"Accept": "application/json", "User-Agent": "Codecov"},
             )
@@ -54,6 +57,9 @@ class TokenlessAzureHandler(BaseTokenlessUploadHandler):
             )
         return build
 
+    def get_build_id(self):
+        return f"{self.server_uri}{self.project}/{self.job}"
+
     def verify(self):
 
         if not self.upload_params.get("job"):
@@ -74,7 +80,7 @@ class TokenlessAzureHandler(BaseTokenlessUploadHandler):
             )
         self.server_uri = self.upload_params.get("server_uri")
 
-        build = self.get_build()
+        build = self.get_cached_build()
 
         # Build should have finished within the last 4 mins OR should have an 'inProgress' flag
         if build["status"] == "completed":
@@ -1,10 +1,45 @@
+import json
+import logging
+import threading
+from typing import Dict
+
+import requests
+from redis.exceptions import RedisError
 from rest_framework.exceptions import NotFound
 
+from services.redis_configuration import get_redis_connection
+
+log = logging.getLogger(__name__)
+
+# how long a build fetched from a CI provider is reused by the other uploads
+# of that build (e.g. every job of a matrix), kept short so the staleness
+# checks of `verify` still see a fresh build status
+BUILD_CACHE_TTL = 60
+
+# one HTTP session per CI provider and thread (sessions aren't thread-safe),
+# so connections to its API are kept alive and reused by every upload handled
+# by the thread
+_http_sessions = threading.local()
+
+
+def get_http_session(ci_type: str) -> requests.Session:
+    sessions: Dict[str, requests.Session] = _http_sessions.__dict__
+    if ci_type not in sessions:
+        sessions[ci_type] = requests.Session()
+    return sessions[ci_type]
+
 
 class BaseTokenlessUploadHandler(object):
+
+    ci_type = None
+
     def __init__(self, upload_params):
         self.upload_params = upload_params
 
+    @property
+    def http_session(self) -> requests.Session:
+        return get_http_session(self.ci_type)
+
     def check_repository_type(self, repository_type):
         if repository_type.lower() not in ("github", "gitlab", "bitbucket"):
             raise NotFound(
@@ -12,6 +47,43 @@ class BaseTokenlessUploadHandler(object):
             )
         return repository_type.lower()
 
+    def get_build_id(self):
+        """
+        Identifies the build fetched by `get_build` for the owner and repo of the upload.
+        """
+        return self.upload_params.get("build")
+
+    def get_cached_build(self):
+        """
+        Returns the build fetched by `get_build`, reusing the one fetched by a
+        previous upload of the same build if it is recent enough.
+        """
+        build_id = self.get_build_id()
+        if build_id is None:
+            return self.get_build()
+
+        key = "tokenless_build/{}/{}/{}/{}".format(
+            self.ci_type,
+            self.upload_params.get("owner"),
+            self.upload_params.get("repo"),
+            build_id,
+        )
+        redis = get_redis_connection()
+        try:
+            cached_build = redis.get(key)
+        except RedisError:
+            log.warning("Unable to read cached CI build", exc_info=True)
+            cached_build = None
+        if cached_build is not None:
+            return json.loads(cached_build)
+
+        build = self.get_build()
+        try:
+            redis.set(key, json.dumps(build), ex=BUILD_CACHE_TTL)
+        except (RedisError, TypeError):
+            log.warning("Unable to cache CI build", exc_info=True)
+        return build
+
     def get_build(self):
         raise NotImplementedError()
 
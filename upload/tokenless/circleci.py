@@ -13,12 +13,14 @@ log = logging.getLogger(__name__)
 
 class TokenlessCircleciHandler(BaseTokenlessUploadHandler):
 
+    ci_type = "circleci"
+
     circleci_token = settings.CIRCLECI_TOKEN
 
     def get_build(self):
         build_num = self.build.split(".")[0]
         try:
-            build = requests.get(
+            build = self.http_session.get(
                 f"https://circleci.com/api/v1/project/{self.owner}/{self.repo}/{build_num}?circle-token={self.circleci_token}",
                 headers={"Accept": "application/json", "User-Agent": "Codecov"},
             )
@@ -37,6 +39,9 @@ class TokenlessCircleciHandler(BaseTokenlessUploadHandler):
                 "Unable to locate build via CircleCI API. Please upload with the Codecov repository upload token to resolve issue."
             )
 
+    def get_build_id(self):
+        return self.build.split(".")[0]
+
     def verify(self):
         if not self.upload_params.get("build"):
             raise NotFound(
@@ -56,7 +61,7 @@ class TokenlessCircleciHandler(BaseTokenlessUploadHandler):
             )
         self.repo = self.upload_params.get("repo")
 
-        build = self.get_build()
+        build = self.get_cached_build()
 
         if build.get("vcs_revision", "") != self.upload_params.get("commit"):
             log.warning(
@@ -11,6 +11,9 @@ log = logging.getLogger(__name__)
 
 
 class TokenlessCirrusHandler(BaseTokenlessUploadHandler):
+
+    ci_type = "cirrus_ci"
+
     def get_build(self):
         query = f"""{{
             "query": "query ($buildId: ID!) {{
@@ -31,7 +34,7 @@ class TokenlessCirrusHandler(BaseTokenlessUploadHandler):
         }}"""
 
         try:
-            response = requests.post(
+            response = self.http_session.post(
                 "https://api.cirrus-ci.com/graphql",
                 data=query,
                 headers={"Content-Type": "application/json", "User-Agent": "Codecov"},
@@ -93,7 +96,7 @@ class TokenlessCirrusHandler(BaseTokenlessUploadHandler):
             )
         commit = self.upload_params.get("commit")
 
-        raw_build = self.get_build()
+        raw_build = self.get_cached_build()
         build = raw_build["data"]["build"]
 
         # Check repository
@@ -14,6 +14,8 @@ log = logging.getLogger(__name__)
 
 class TokenlessGithubActionsHandler(BaseTokenlessUploadHandler):
 
+    ci_type = "github_actions"
+
     actions_token = settings.GITHUB_ACTIONS_TOKEN
     client_id = settings.GITHUB_CLIENT_ID
     client_secret = settings.GITHUB_CLIENT_SECRET
@@ -73,7 +75,7 @@ class TokenlessGithubActionsHandler(BaseTokenlessUploadHandler):
             )
         repo = self.upload_params.get("repo")
 
-        build = self.get_build()
+        build = self.get_cached_build()
 
         if (
             build["public"] != True
@@ -11,15 +11,21 @@ from upload.tokenless.base import BaseTokenlessUploadHandler
 
 log = logging.getLogger(__name__)
 
+TRAVIS_HEADERS = {"Travis-API-Version": "3", "User-Agent": "Codecov"}
+
 
 class TokenlessTravisHandler(BaseTokenlessUploadHandler):
-    def get_build(self):
+
+    ci_type = "travis"
+
+    def get_job(self):
         travis_dot_com = False
+        self.api_url = "https://api.travis-ci.com"
 
         try:
-            build = requests.get(
-                "https://api.travis-ci.com/job/{}".format(self.upload_params["job"]),
-                headers={"Travis-API-Version": "3", "User-Agent": "Codecov"},
+            build = self.http_session.get(
+                "{}/job/{}".format(self.api_url, self.upload_params["job"]),
+                headers=TRAVIS_HEADERS,
             )
             travis_dot_com = (
                 build.json()["repository"]["slug"]
@@ -58,12 +64,11 @@ class TokenlessTravisHandler(BaseTokenlessUploadHandler):
                     owner=self.upload_params["owner"],
                 ),
             )
+            self.api_url = "https://api.travis-ci.org"
             try:
-                build = requests.get(
-                    "https://api.travis-ci.org/job/{}".format(
-                        self.upload_params["job"]
-                    ),
-                    headers={"Travis-API-Version": "3", "User-Agent": "Codecov"},
+                build = self.http_session.get(
+                    "{}/job/{}".format(self.api_url, self.upload_params["job"]),
+                    headers=TRAVIS_HEADERS,
                 )
             except (ConnectionError, HTTPError) as e:
                 log.warning(
@@ -89,9 +94,60 @@ class TokenlessTravisHandler(BaseTokenlessUploadHandler):
 
         return build.json()
 
+    def get_build_jobs(self, build_id):
+        try:
+            response = self.http_session.get(
+                "{}/build/{}/jobs".format(self.api_url, build_id),
+                headers=TRAVIS_HEADERS,
+            )
+            response.raise_for_status()
+            return {str(job["id"]): job for job in response.json()["jobs"]}
+        except Exception as e:
+            log.warning(
+                f"Unable to fetch the jobs of the build: {e}",
+                extra=dict(
+                    commit=self.upload_params["commit"],
+                    repo_name=self.upload_params["repo"],
+                    job=self.upload_params["job"],
+                    owner=self.upload_params["owner"],
+                ),
+            )
+            return {}
+
+    def get_build(self):
+        """
+        The jobs of the build of the upload's job, by id.  When the build is
+        known, all of its jobs are fetched so the uploads of its other jobs
+        can be verified with the cached build.
+        """
+        job = self.get_job()
+        jobs = {str(job["id"]): job}
+        if self.get_build_id() is not None:
+            jobs.update(self.get_build_jobs(job["build"]["id"]))
+        return {"jobs": jobs}
+
+    def get_build_id(self):
+        # the job number (e.g. "498.1") is prefixed by the number of its build
+        job_number = self.upload_params.get("build")
+        if not job_number:
+            return None
+        return str(job_number).split(".")[0]
+
+    def get_cached_job(self):
+        job = self.get_cached_build()["jobs"].get(str(self.upload_params["job"]))
+        if job is None or (
+            self.get_build_id() is not None
+            and job["finished_at"] is None
+            and job["state"] != "started"
+        ):
+            # the job wasn't part of the cached build, or hadn't started yet
+            # when it was cached
+            job = self.get_job()
+        return job
+
     def verify(self):
         # find repo in travis.com
-        job = self.get_build()
+        job = self.get_cached_job()
 
         slug = f"{self.upload_params['owner']}/{self.upload_params['repo']}"
 
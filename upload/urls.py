@@ -6,6 +6,7 @@ from upload.views.legacy import UploadDownloadHandler, UploadHandler
 from upload.views.reports import ReportResultsView, ReportViews
 from upload.views.upload_completion import UploadCompletionView
 from upload.views.uploads import UploadViews
+from upload.views.uploads_batch import UploadBatchViews
 
 urlpatterns = [
     # use regex to make trailing slash optional
@@ -20,6 +21,11 @@ urlpatterns = [
         UploadViews.as_view(),
         name="new_upload.uploads",
     ),
+    path(
+        "<str:service>/<str:repo>/commits/<str:commit_sha>/reports/<str:report_code>/uploads/batch",
+        UploadBatchViews.as_view(),
+        name="new_upload.uploads_batch",
+    ),
     path(
         "<str:service>/<str:repo>/commits/<str:commit_sha>/reports/<report_code>/results",
         ReportResultsView.as_view(),
@@ -37,6 +37,7 @@ from upload.helpers import (
     insert_commit,
     parse_headers,
     parse_params,
+    store_report_in_archive,
     store_report_in_redis,
     validate_upload,
 )
@@ -185,13 +186,13 @@ class UploadHandler(APIView):
         # --------- Handle the actual upload
 
         reportid = str(uuid4())
-        path = None  # populated later for v4 uploads when generating presigned PUT url
+        path = None  # populated later for v2 uploads stored in the archive and v4 uploads when generating presigned PUT url
         redis_key = None  # populated later for v2 uploads when storing report in Redis
 
         # Get the url where the commit details can be found on the Codecov site, we'll return this in the response
         destination_url = f"{settings.CODECOV_DASHBOARD_URL}/{owner.service}/{owner.username}/{repository.name}/commit/{commitid}"
 
-        # v2 - store request body in redis
+        # v2 - stream request body to the archive (or store it in redis if there is no archive)
         if version == "v2":
             log.info(
                 "Started V2 upload",
@@ -203,18 +204,30 @@ class UploadHandler(APIView):
                     upload_params=upload_params,
                 ),
             )
-            redis_key = store_report_in_redis(request, commitid, reportid, redis)
-
-            log.info(
-                "Stored coverage report in redis",
-                extra=dict(
-                    commit=commitid,
-                    upload_params=upload_params,
-                    reportid=reportid,
-                    redis_key=redis_key,
-                    repoid=repository.repoid,
-                ),
-            )
+            if get_config("services", "minio"):
+                path = store_report_in_archive(request, commitid, reportid, repository)
+                log.info(
+                    "Stored coverage report in archive",
+                    extra=dict(
+                        commit=commitid,
+                        upload_params=upload_params,
+                        reportid=reportid,
+                        path=path,
+                        repoid=repository.repoid,
+                    ),
+                )
+            else:
+                redis_key = store_report_in_redis(request, commitid, reportid, redis)
+                log.info(
+                    "Stored coverage report in redis",
+                    extra=dict(
+                        commit=commitid,
+                        upload_params=upload_params,
+                        reportid=reportid,
+                        redis_key=redis_key,
+                        repoid=repository.repoid,
+                    ),
+                )
 
             response.write(
                 dumps(
@@ -299,7 +312,7 @@ class UploadHandler(APIView):
             **queue_params,
             "build_url": build_url,
             "reportid": reportid,
-            "redis_key": redis_key,  # location of report for v2 uploads; this will be "None" for v4 uploads
+            "redis_key": redis_key,  # location of report for v2 uploads without archive; "None" otherwise
             "url": path
             if path  # If a path was generated for a v4 upload, pass that to the 'url' field, potentially overwriting it
             else upload_params.get("url"),
@@ -0,0 +1,122 @@
+import logging
+from collections import Counter
+from typing import List
+
+from django.db.models import prefetch_related_objects
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from shared.metrics import metrics
+
+from reports.models import ReportSession
+from services.archive import ArchiveService, MinioEndpoints
+from services.redis_configuration import get_redis_connection
+from services.upload_counters import UploadCounterService
+from upload.helpers import dispatch_upload_tasks, validate_activated_repo
+from upload.views.uploads import UploadViews
+
+log = logging.getLogger(__name__)
+
+
+class UploadBatchViews(UploadViews):
+    """
+    Creates every upload of a CI matrix in a single request: the uploads and
+    their flags are inserted in bulk, one presigned PUT is returned per upload
+    and the worker is notified once for the whole batch.
+    """
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(
+            data=request.data, many=True, allow_empty=False
+        )
+        serializer.is_valid(raise_exception=True)
+        uploads = self.perform_create(serializer)
+        serializer = self.get_serializer(uploads, many=True)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def perform_create(self, serializer) -> List[ReportSession]:
+        repository = self.get_repo()
+        validate_activated_repo(repository)
+        commit = self.get_commit(repository)
+        report = self.get_report(commit)
+        # avoid refetching them for every upload when serializing the response
+        commit.repository = repository
+        report.commit = commit
+
+        batch_size = len(serializer.validated_data)
+        max_upload_limit = repository.author.max_upload_limit or 150
+        existing_uploads = UploadCounterService().commit_uploads_count(
+            commit, limit=max_upload_limit - batch_size
+        )
+        if existing_uploads + batch_size > max_upload_limit:
+            log.warning(
+                "Too many uploads to this commit",
+                extra=dict(
+                    commit=commit.commitid,
+                    repoid=repository.repoid,
+                    batch_size=batch_size,
+                ),
+            )
+            metrics.incr("uploads.rejected", 1)
+            raise ValidationError("Too many uploads to this commit.")
+
+        log.info(
+            "Request to create new uploads batch",
+            extra=dict(
+                repo=repository.name,
+                commit=commit.commitid,
+                batch_size=batch_size,
+            ),
+        )
+        for version, count in Counter(
+            item["version"] for item in serializer.validated_data if "version" in item
+        ).items():
+            metrics.incr("upload.cli." + f"{version}", count)
+
+        archive_service = ArchiveService(repository)
+        uploads: List[ReportSession] = serializer.save(
+            report=report,
+            upload_extras={"format_version": "v1"},
+        )
+        date = timezone.now().strftime("%Y-%m-%d")
+        for upload in uploads:
+            upload.storage_path = MinioEndpoints.raw_with_upload_id.get_path(
+                version="v4",
+                date=date,
+                repo_hash=archive_service.storage_hash,
+                commit_sha=commit.commitid,
+                reportid=report.external_id,
+                uploadid=upload.external_id,
+            )
+        ReportSession.objects.bulk_update(uploads, ["storage_path"])
+
+        self.trigger_upload_tasks(repository, commit.commitid, uploads, report)
+        metrics.incr("uploads.accepted", batch_size)
+        self.activate_repo(repository)
+
+        prefetch_related_objects(uploads, "flags")
+        return uploads
+
+    def trigger_upload_tasks(self, repository, commit_sha, uploads, report):
+        log.info(
+            "Triggering upload task",
+            extra=dict(
+                repo=repository.name,
+                commit=commit_sha,
+                upload_ids=[upload.id for upload in uploads],
+                report_code=report.code,
+            ),
+        )
+        redis = get_redis_connection()
+        task_arguments_list = [
+            {
+                "commit": commit_sha,
+                "upload_id": upload.id,
+                "version": "v4",
+                "report_code": report.code,
+                "reportid": str(report.external_id),
+            }
+            for upload in uploads
+        ]
+        dispatch_upload_tasks(task_arguments_list, repository, redis)
@@ -0,0 +1,68 @@
+"""
+Counters of the expensive operations (database queries, hops to a thread with
+`sync_to_async` and storage reads) performed while some code runs, e.g. the
+resolver of a GraphQL field (see `graphql_api/profiler.py`):
+
+    counters = Counters()
+    with counting(counters):
+        ...
+
+Counting is scoped with a context variable so it follows the code into the
+threads of `sync_to_async` and into the tasks it starts.  Nothing is counted
+outside of a `counting` block.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, fields
+from typing import Optional
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+
+@dataclass
+class Counters:
+    db_queries: int = 0
+    thread_hops: int = 0
+    storage_reads: int = 0
+
+    def add(self, other: "Counters") -> None:
+        for field in fields(self):
+            setattr(
+                self, field.name, getattr(self, field.name) + getattr(other, field.name)
+            )
+
+
+_current_counters: ContextVar[Optional[Counters]] = ContextVar(
+    "current_counters", default=None
+)
+
+
+@contextmanager
+def counting(counters: Counters):
+    token = _current_counters.set(counters)
+    try:
+        yield counters
+    finally:
+        _current_counters.reset(token)
+
+
+def record(name: str) -> None:
+    counters = _current_counters.get()
+    if counters is not None:
+        setattr(counters, name, getattr(counters, name) + 1)
+
+
+def _count_query(execute, sql, params, many, context):
+    record("db_queries")
+    return execute(sql, params, many, context)
+
+
+def _install_query_counter(sender, connection, **kwargs):
+    if _count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_count_query)
+
+
+connection_created.connect(_install_query_counter)
+for connection in connections.all(initialized_only=True):
+    _install_query_counter(None, connection)
@@ -0,0 +1,36 @@
+from asgiref.sync import async_to_sync
+from django.test import TestCase
+
+from codecov.db import sync_to_async
+from core.models import Repository
+from utils.counters import Counters, counting, record
+
+
+class CountersTests(TestCase):
+    def test_counting(self):
+        counters = Counters()
+        with counting(counters):
+            Repository.objects.count()
+            record("storage_reads")
+            async_to_sync(sync_to_async(Repository.objects.count))()
+
+        # not counted
+        Repository.objects.count()
+        record("storage_reads")
+
+        assert counters == Counters(db_queries=2, thread_hops=1, storage_reads=1)
+
+    def test_nested_counting(self):
+        outer, inner = Counters(), Counters()
+        with counting(outer):
+            record("storage_reads")
+            with counting(inner):
+                record("storage_reads")
+            record("thread_hops")
+        assert outer == Counters(thread_hops=1, storage_reads=1)
+        assert inner == Counters(storage_reads=1)
+
+    def test_add(self):
+        counters = Counters(db_queries=1, thread_hops=2)
+        counters.add(Counters(db_queries=3, storage_reads=1))
+        assert counters == Counters(db_queries=4, thread_hops=2, storage_reads=1)